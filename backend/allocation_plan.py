@@ -0,0 +1,117 @@
+"""
+Allocation plans for the chip distribution calculators.
+
+Both calculators hand out chips from the smallest to the largest usable
+denomination, giving each a share of the remaining stack value. The shares
+are defined once, in ALLOCATION_WEIGHTS, for a set of anchor denominations.
+A chip set's actual denominations are mapped onto the nearest anchor (on a
+log scale), so sets with $10, $50, $250, $5000 or fractional chips get a
+sensible share instead of being ignored.
+
+Plans work in integer minor units (see chip_types.py) and are compiled once
+per (denominations, weights) and reused.
+"""
+
+import math
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+from chip_types import MINOR_UNITS
+
+# Share of the remaining stack value for each anchor denomination:
+# (anchor, weight, min_count, max_small_blind)
+#   weight           fraction of the remaining value (1.0 = everything left)
+#   min_count        minimum chips handed out (such steps skip the "enough value left" check)
+#   max_small_blind  only used when the small blind is at most this (None = always)
+ALLOCATION_WEIGHTS = (
+    (1, 0.02, 10, 2),       # $1: 2% of stack, at least 10 chips, only for small blind <= 2
+    (5, 0.10, 0, None),     # $5: 10% of remaining value
+    (25, 0.15, 0, None),    # $25: 15% of remaining value
+    (100, 0.25, 0, None),   # $100: 25% of remaining value
+    (500, 0.20, 0, None),   # $500: 20% of remaining value
+    (1000, 1.0, 0, None),   # $1000: all remaining value
+)
+
+# Mode 1 top-ups applied after the percentage steps, in order:
+# (anchor, min_remaining_multiple, allow_small)
+#   min_remaining_multiple  only top up while at least this many chips' worth of value is left
+#   allow_small             permit 1-4 chip allocations to avoid wasting value
+TOP_UP_STEPS = (
+    (100, 5, False),   # Spread significant leftovers into $100 workhorses...
+    (25, 4, False),    # ...then $25s
+    (100, 1, False),   # Any value still left goes to $100 first
+    (500, 1, True),    # $500 / $1000 only as a last resort
+    (1000, 1, True),
+)
+
+WeightTable = Tuple[Tuple[float, float, int, Optional[float]], ...]
+
+
+class AllocationPlan(NamedTuple):
+    """
+    Compiled allocation plan for one sorted set of usable denominations.
+
+    Denominations and values are in minor units. There is one step per
+    denomination, so step i belongs to column i of the usable denominations.
+    """
+
+    # (denom, weight, min_count, max_small_blind), smallest denomination first
+    steps: Tuple[Tuple[int, float, int, Optional[float]], ...]
+    # (column, denom, min_remaining_value, allow_small), in application order
+    top_ups: Tuple[Tuple[int, int, int, bool], ...]
+
+
+def _nearest_anchor(denom: int, anchors: Sequence[int]) -> int:
+    # Closest anchor on a log scale; ties go to the smaller anchor
+    return min(anchors, key=lambda anchor: (abs(math.log(denom / anchor)), anchor))
+
+
+@lru_cache(maxsize=256)
+def compile_allocation_plan(denominations: Tuple[int, ...],
+                            weights: WeightTable = ALLOCATION_WEIGHTS,
+                            top_ups: Tuple[Tuple[float, int, bool], ...] = TOP_UP_STEPS) -> AllocationPlan:
+    """
+    Build the allocation plan for a set of usable denominations.
+
+    Denominations sharing an anchor split its weight evenly (an "all remaining
+    value" anchor splits what is left between them). Top-ups go to the member
+    closest to their anchor and are skipped when no denomination maps to it.
+
+    Args:
+        denominations: Usable chip denominations in minor units (sorted ascending)
+        weights: Anchor weight table (see ALLOCATION_WEIGHTS)
+        top_ups: Mode 1 top-up table (see TOP_UP_STEPS)
+
+    Returns:
+        AllocationPlan with per-denomination steps and top-ups
+    """
+    # Anchors are in dollars; scaling both sides keeps the log distances the same
+    anchor_entries = {round(entry[0] * MINOR_UNITS): entry for entry in weights}
+    anchors = list(anchor_entries)
+
+    members = {}
+    for denom in sorted(denominations):
+        members.setdefault(_nearest_anchor(denom, anchors), []).append(denom)
+
+    steps = []
+    for anchor, denoms in members.items():
+        _, weight, min_count, max_small_blind = anchor_entries[anchor]
+        for index, denom in enumerate(denoms):
+            if weight >= 1:
+                share = 1.0 / (len(denoms) - index)
+            else:
+                share = weight / len(denoms)
+            steps.append((denom, share, min_count, max_small_blind))
+    steps.sort(key=lambda step: step[0])
+
+    compiled_top_ups = []
+    columns = {denom: column for column, denom in enumerate(sorted(denominations))}
+    for anchor, multiple, allow_small in top_ups:
+        anchor = round(anchor * MINOR_UNITS)
+        candidates = members.get(_nearest_anchor(anchor, anchors), [])
+        if not candidates:
+            continue
+        denom = min(candidates, key=lambda d: (abs(math.log(d / anchor)), d))
+        compiled_top_ups.append((columns[denom], denom, multiple * denom, allow_small))
+
+    return AllocationPlan(tuple(steps), tuple(compiled_top_ups))
@@ -3,69 +3,404 @@ Flask Backend for Poker Chip Calculator
 Converts the Python calculator into a REST API for web/mobile access
 """
 
-from flask import Flask, request, jsonify, send_from_directory, make_response
+from flask import Flask, Response, request, jsonify, send_from_directory, make_response, g, stream_with_context
 from flask_cors import CORS
 import os
 import sys
+import itertools
 import json
-import requests
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+import time
+from collections import deque
 
 # Import the calculator functions
 from pokerchipcounter import (
     calculate_chip_distribution,
     calculate_chip_distribution_custom,
-    load_chip_set
+    first_usable_column
+)
+from chip_inventory import INVENTORY_STORE, get_chip_inventory, validate_chip_set
+from result_cache import RESULT_CACHE
+from batch import run_batch, stream_batch
+from distribution_tables import DISTRIBUTION_TABLES
+from chipset_store import CHIPSET_STORE, ChipsetNotFound, ChipsetStoreFull
+from session_engine import SESSION_FIELDS, SESSIONS, CalculationSession
+from blind_schedule import BLIND_MULTIPLIER, build_blind_schedule
+from stage_timer import new_timer
+from response_format import (
+    JSON_MIMETYPE,
+    MSGPACK_MIMETYPES,
+    ChipJSONProvider,
+    FastJSONProvider,
+    compress_response,
+    encode_msgpack,
+    msgpack_available,
+    orjson,
+    parse_fields,
+    parse_schema,
+    shape_result,
+    should_compress
+)
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    DISTRIBUTION_TABLE_LOOKUPS,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    REGISTRY as METRICS
 )
 
-# Initialize Flask app
-app = Flask(__name__, static_folder='../frontend', static_url_path='')
+# Frontend files: the content-hashed build (build_frontend.py) when it exists, else the sources
+FRONTEND_SOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend')
+FRONTEND_DIST_DIR = os.environ.get('FRONTEND_DIST_DIR', os.path.join(FRONTEND_SOURCE_DIR, 'dist'))
+FRONTEND_BUILT = os.path.isfile(os.path.join(FRONTEND_DIST_DIR, 'asset-manifest.json'))
+FRONTEND_DIR = FRONTEND_DIST_DIR if FRONTEND_BUILT else FRONTEND_SOURCE_DIR
+
+# Hashed asset URLs never change content, so browsers may keep them for a year;
+# everything else (index.html, service-worker.js, manifest.json) is revalidated
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+# Original asset path -> hashed path (old URLs such as /assets/app-icon.png keep working)
+ASSET_PATHS = {}
+if FRONTEND_BUILT:
+    with open(os.path.join(FRONTEND_DIST_DIR, 'asset-manifest.json')) as f:
+        ASSET_PATHS = json.load(f)
+HASHED_ASSETS = {'/' + path for path in ASSET_PATHS.values()}
+
+# Initialize Flask app (files are served by serve_frontend / serve_static below)
+app = Flask(__name__, static_folder=None)
+app.json = FastJSONProvider(app) if orjson is not None else ChipJSONProvider(app)
 CORS(app)  # Enable CORS for frontend to call backend
 
-# Gumroad API Configuration
-GUMROAD_ACCESS_TOKEN = os.environ.get('GUMROAD_ACCESS_TOKEN', 'mUfWqJt86a5f-A10TRmaQb92FvQkOwk8Y-LCsw3PpxO')
-GUMROAD_PRODUCT_IDS = {
-    'entry': os.environ.get('GUMROAD_ENTRY_PRODUCT_ID', 'FCZgbXwUtCUZICnWigdugA=='),
-    'premium': os.environ.get('GUMROAD_PREMIUM_PRODUCT_ID', '7IdKPVIR9R6Fre-xhUzXJQ==')
+# Chip set inventory - parsed once and cached, reloaded only when the file's mtime changes
+CHIP_SET = get_chip_inventory()
+if INVENTORY_STORE.last_error:
+    print("[OK] Using default chip set")
+else:
+    print("[OK] Chip set loaded successfully")
+
+# Counters kept by other components, read when /api/metrics is scraped
+METRICS.callback('pokerchip_chip_inventory_reloads_total', 'Times the chip set file was re-read after changing.',
+                 'counter', lambda: {(): INVENTORY_STORE.reload_count})
+METRICS.callback('pokerchip_result_cache_events_total', 'Result cache lookups and evictions by event.', 'counter',
+                 lambda: {(event,): value for event, value in RESULT_CACHE.stats().items()
+                          if event in ('hits', 'misses', 'coalesced', 'evictions', 'expirations')},
+                 ('event',))
+METRICS.callback('pokerchip_saved_chipsets', 'Chip sets saved on the server.', 'gauge',
+                 lambda: {(): CHIPSET_STORE.stats()['chipsets']})
+METRICS.callback('pokerchip_sessions', 'Live incremental calculation sessions in this process.', 'gauge',
+                 lambda: {(): SESSIONS.stats()['size']})
+METRICS.callback('pokerchip_result_cache_entries', 'Entries currently in the result cache.', 'gauge',
+                 lambda: {(): RESULT_CACHE.stats()['size']})
+# License metrics appear once the billing component has been loaded
+METRICS.callback('pokerchip_license_cache_events_total', 'License verification cache lookups by event.', 'counter',
+                 lambda: {(event,): value for event, value in loaded_billing().LICENSE_CACHE.stats().items()
+                          if event in ('hits', 'misses', 'coalesced', 'evictions', 'expirations')}
+                 if loaded_billing() else {},
+                 ('event',))
+METRICS.callback('pokerchip_license_upstream_calls_saved_total',
+                 'Gumroad calls avoided by the license cache (cache hits plus coalesced lookups).', 'counter',
+                 lambda: {(): loaded_billing().license_calls_saved()} if loaded_billing() else {})
+
+# Map the precomputed Mode 1 table for the server's chip set, if one has been built
+if DISTRIBUTION_TABLES.get(CHIP_SET) is not None:
+    print("[OK] Distribution table mapped")
+
+
+# Required request fields and their types for each calculation mode
+CALCULATION_FIELDS = {
+    'auto': [('num_players', int), ('small_blind', float), ('big_blind', float),
+             ('duration_hours', float), ('minutes_per_level', int)],
+    'custom': [('num_players', int), ('small_blind', float), ('big_blind', float),
+               ('target_stack', float)]
 }
 
-# Google Play Billing Configuration
-PLAY_PACKAGE_NAME = 'com.onrender.poker_chip_calculator.twa'
-PLAY_CREDENTIALS_JSON = os.environ.get('GOOGLE_PLAY_CREDENTIALS', '')
-
-def get_play_service():
-    """Create Google Play Developer API service for purchase verification"""
-    if not PLAY_CREDENTIALS_JSON:
-        return None
-    creds_dict = json.loads(PLAY_CREDENTIALS_JSON)
-    credentials = service_account.Credentials.from_service_account_info(
-        creds_dict,
-        scopes=['https://www.googleapis.com/auth/androidpublisher']
-    )
-    return build('androidpublisher', 'v3', credentials=credentials)
+# Optional request fields, their types and defaults for each calculation mode
+OPTIONAL_CALCULATION_FIELDS = {
+    'auto': [],
+    'custom': [('solver', str, 'greedy'), ('time_budget_ms', float, 50.0)]
+}
+
+# Upper limit on the exact solver's per-request time budget
+SOLVER_MAX_BUDGET_MS = float(os.environ.get('SOLVER_MAX_BUDGET_MS', '250'))
+
+# Seconds to cache a result whose exact solver ran out of time (best effort, often
+# from a busy moment; -1 disables caching them). Other results use the cache's TTL.
+SOLVER_TIMEOUT_CACHE_TTL = float(os.environ.get('SOLVER_TIMEOUT_CACHE_TTL', '30'))
+
+# Optional /api/simulate settings and their types (see tournament_sim.simulate_tournament)
+SIMULATION_FIELDS = [('simulations', int), ('seed', int), ('time_budget_ms', float),
+                     ('hands_per_hour', float), ('table_size', int)]
+
+# Maximum cells (players x blinds x durations x level lengths) for /api/calculate/grid
+GRID_MAX_CELLS = int(os.environ.get('GRID_MAX_CELLS', '20000'))
 
-# Owner test keys - personal use only
-TEST_LICENSE_KEYS = {
-    'Pizzaman26!': 'premium'
+# Longest blind structure /api/blind-schedule will generate (same limit as Mode 1)
+BLIND_SCHEDULE_MAX_LEVELS = 100
+
+# Accepted spellings of the batch "mode" field
+SCENARIO_MODES = {'auto': 'auto', '1': 'auto', 'custom': 'custom', '2': 'custom'}
+
+# Maximum scenarios accepted by /api/calculate/batch
+BATCH_MAX_SCENARIOS = int(os.environ.get('BATCH_MAX_SCENARIOS', '1000'))
+
+# Maximum scenarios in one /api/calculate/stream sweep (results are streamed, not held)
+STREAM_MAX_SCENARIOS = int(os.environ.get('STREAM_MAX_SCENARIOS', '1000000'))
+
+# Axes of a streamed sweep for each mode, in iteration order (first = outermost)
+SWEEP_AXES = {
+    'auto': [('num_players', int), ('blinds', None), ('duration_hours', float), ('minutes_per_level', int)],
+    'custom': [('num_players', int), ('blinds', None), ('target_stack', float)]
 }
 
-# Load chip set once at startup
-try:
-    CHIP_SET = load_chip_set()
-    print("[OK] Chip set loaded successfully")
-except Exception as e:
-    print(f"[WARNING] Could not load chip set from file: {e}")
-    # Use default chip set
-    CHIP_SET = {
-        1: 300,
-        5: 200,
-        25: 200,
-        100: 200,
-        500: 50,
-        1000: 50
+
+def resolve_chip_set(data, default=None):
+    """
+    Get the chip inventory for a calculation request.
+
+    Uses the request's optional "chip_set" field (validated) or "chipset_id"
+    (a saved chip set) when present, otherwise the given default or the
+    server's file-based chip set.
+
+    Raises:
+        ValueError: If the chip set is invalid, both fields are given or the ID is unknown
+    """
+    chip_set = data.get('chip_set')
+    chipset_id = data.get('chipset_id')
+    if chipset_id is not None:
+        if chip_set is not None:
+            raise ValueError('Send either chip_set or chipset_id, not both')
+        try:
+            return CHIPSET_STORE.inventory(chipset_id)
+        except ChipsetNotFound:
+            raise ValueError(f'Chip set not found: {chipset_id}') from None
+    if chip_set is None:
+        return default if default is not None else get_chip_inventory()
+    return validate_chip_set(chip_set)
+
+
+def convert_field(field, field_type, value):
+    """
+    Convert a request field to its type.
+
+    Raises:
+        ValueError: If the value has the wrong type (e.g. null or a list) or cannot be converted
+                    (e.g. "abc" for a number), naming the field
+    """
+    try:
+        return field_type(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid {field}: {value!r}') from None
+
+
+def parse_calculation(data, mode, default_chip_set=None):
+    """
+    Validate and convert the fields of a calculation request.
+
+    Returns:
+        (params, chip_set) - keyword arguments for the mode's calculator and the inventory
+
+    Raises:
+        ValueError: If a required field is missing or invalid
+    """
+    params = {}
+    for field, field_type in CALCULATION_FIELDS[mode]:
+        if field not in data:
+            raise ValueError(f'Missing required field: {field}')
+        params[field] = convert_field(field, field_type, data[field])
+    for field, field_type, default in OPTIONAL_CALCULATION_FIELDS[mode]:
+        params[field] = convert_field(field, field_type, data[field]) if data.get(field) is not None else default
+    if 'time_budget_ms' in params:
+        params['time_budget_ms'] = min(params['time_budget_ms'], SOLVER_MAX_BUDGET_MS)
+    return params, resolve_chip_set(data, default_chip_set)
+
+
+def calculation_cache_key(mode, params, chip_set):
+    """Build the result cache key for normalized calculation inputs (the ChipInventory is hashable)."""
+    fields = [field for field, _ in CALCULATION_FIELDS[mode]] + \
+        [field for field, _, _ in OPTIONAL_CALCULATION_FIELDS[mode]]
+    return (mode,) + tuple(params[field] for field in fields) + (chip_set,)
+
+
+def result_cache_ttl(result):
+    """Result cache lifetime for a calculation result (short for timed-out exact solves)."""
+    return SOLVER_TIMEOUT_CACHE_TTL if result.get('solver_timed_out') else RESULT_CACHE.ttl
+
+
+def auto_result(params, chip_set, timer):
+    """
+    Get a Mode 1 result: from the precomputed table if possible, otherwise
+    calculated (repeated scenarios are served from the result cache).
+    """
+    result = DISTRIBUTION_TABLES.lookup(chip_set, params)
+    DISTRIBUTION_TABLE_LOOKUPS.inc(labels=('miss' if result is None else 'hit',))
+    timer.mark('table')
+    if result is None:
+        result = RESULT_CACHE.get_or_compute(
+            calculation_cache_key('auto', params, chip_set),
+            lambda: calculate_chip_distribution(**params, chip_set=chip_set, timer=timer)
+        )
+        timer.mark('cache')
+    return result
+
+
+def response_options():
+    """
+    Read the response shape options of a calculation request.
+
+    Returns:
+        {'fields': [...] or None, 'schema': 1 or 2} - see response_format.py
+
+    Raises:
+        ValueError: If the schema is not supported
+    """
+    return {
+        'fields': parse_fields(request.args.get('fields')),
+        'schema': parse_schema(request.args.get('schema'))
     }
-    print("[OK] Using default chip set")
+
+
+def encoded_response(body, status=200):
+    """Encode a response body as JSON, or as MessagePack when the client prefers it (Accept header)."""
+    if msgpack_available():
+        best = request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES, default=JSON_MIMETYPE)
+        if best in MSGPACK_MIMETYPES:
+            response = make_response(encode_msgpack(body), status)
+            response.mimetype = best
+            response.vary.add('Accept')
+            return response
+    return make_response(jsonify(body), status)
+
+
+def timed_response(result, timer, status=200):
+    """
+    Build a calculation response carrying the timer's stages.
+
+    Stages are always sent as a Server-Timing header; with ?timings=1 they
+    are also added to the body as "_timings" (on a copy, since results may
+    be shared through the cache). The body is shaped by ?fields= / ?schema=
+    and encoded as the client asked (see encoded_response).
+    """
+    timings = timer.as_dict() if timer.stages else None
+    if timings is not None and request.args.get('timings') in ('1', 'true'):
+        result = dict(result)
+        result['_timings'] = timings
+    response = encoded_response(shape_result(result, **response_options()), status)
+    if timings is not None:
+        response.headers['Server-Timing'] = timer.server_timing(timings)
+    return response
+
+
+def parse_axis(data, field, field_type):
+    """
+    Parse a grid axis given as a list of values or a {"start", "stop", "step"} range (stop inclusive).
+    """
+    if field not in data:
+        raise ValueError(f'Missing required field: {field}')
+    axis = data[field]
+    if isinstance(axis, dict):
+        start = field_type(axis['start'])
+        stop = field_type(axis['stop'])
+        step = field_type(axis.get('step', 1))
+        if step <= 0:
+            raise ValueError(f'{field} step must be positive')
+        count = int((stop - start) / step) + 1
+        if count > GRID_MAX_CELLS:
+            raise ValueError(f'{field} has too many values')
+        values = [field_type(start + i * step) for i in range(max(0, count))]
+    elif isinstance(axis, list):
+        values = [field_type(value) for value in axis]
+    else:
+        values = [field_type(axis)]
+    if not values:
+        raise ValueError(f'{field} must contain at least one value')
+    return values
+
+
+def parse_blinds(data):
+    """Parse a list of [small_blind, big_blind] pairs."""
+    blinds = data.get('blinds')
+    if not isinstance(blinds, list) or not blinds:
+        raise ValueError('blinds must be a non-empty list of [small_blind, big_blind] pairs')
+    return [(float(pair[0]), float(pair[1])) for pair in blinds]
+
+
+def sweep_items(mode, axes, data):
+    """
+    Lazily expand sweep axes into calculation request items (no list of scenarios is built).
+
+    Args:
+        mode: "auto" or "custom"
+        axes: Parsed axis values by field, in SWEEP_AXES order
+        data: Request body (scalar fields such as "solver" are copied into every item)
+    """
+    scalars = {field: data[field] for field, _, _ in OPTIONAL_CALCULATION_FIELDS[mode] if field in data}
+    fields = [field for field, _ in SWEEP_AXES[mode]]
+    for values in itertools.product(*(axes[field] for field in fields)):
+        item = dict(scalars)
+        for field, value in zip(fields, values):
+            if field == 'blinds':
+                item['small_blind'], item['big_blind'] = value
+            else:
+                item[field] = value
+        yield item
+
+
+def ordered_stream(prepared):
+    """
+    Merge already-resolved entries (parse errors, cache hits) with lazily computed ones, in input order.
+
+    Args:
+        prepared: Iterable of (meta, entry, scenario) - entry is None when the scenario must be computed
+
+    Yields:
+        (index, meta, entry)
+    """
+    waiting = deque()
+
+    def to_compute():
+        for index, (meta, entry, scenario) in enumerate(prepared):
+            waiting.append((index, meta, entry))
+            if entry is None:
+                yield scenario
+
+    computed = stream_batch(to_compute())
+    held = None
+    while True:
+        if not waiting:
+            # Pulling a result also pulls (and queues) the scenarios before it
+            held = next(computed, None)
+            if not waiting:
+                return
+        index, meta, entry = waiting.popleft()
+        if entry is None:
+            entry = held if held is not None else next(computed)
+            held = None
+        yield index, meta, entry
+
+
+def get_billing():
+    """
+    Import the billing component (Gumroad / Google Play verification) on first use.
+
+    Keeping requests and the Google API client out of the startup imports
+    makes cold starts reach the first calculation sooner.
+    """
+    import billing
+    return billing
+
+
+def loaded_billing():
+    """The billing module if a verification endpoint has loaded it already, else None."""
+    return sys.modules.get('billing')
+
+
+def scenario_mode(item):
+    """Get the calculation mode of a batch scenario ("auto" or "custom")."""
+    mode = item.get('mode')
+    if mode is None:
+        return 'custom' if 'target_stack' in item else 'auto'
+    if str(mode).lower() not in SCENARIO_MODES:
+        raise ValueError(f'Invalid mode: {mode}. Must be "auto" (1) or "custom" (2)')
+    return SCENARIO_MODES[str(mode).lower()]
 
 
 # ============================================================================
@@ -75,11 +410,7 @@ except Exception as e:
 @app.route('/')
 def serve_frontend():
     """Serve the main HTML page"""
-    response = make_response(send_from_directory(app.static_folder, 'index.html'))
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    return response
+    return send_from_directory(FRONTEND_DIR, 'index.html')
 
 
 @app.route('/.well-known/assetlinks.json')
@@ -116,27 +447,151 @@ def serve_assetlinks():
     return response
 
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Count every request and record its latency, labelled by route pattern."""
+    started = g.pop('request_started', None)
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    HTTP_REQUESTS.inc(labels=(route, request.method, str(response.status_code)))
+    if started is not None:
+        HTTP_LATENCY.observe(time.perf_counter() - started, (route, request.method))
+    return response
+
+
+@app.after_request
+def set_static_cache_headers(response):
+    """Long-lived caching for content-hashed assets, revalidation (ETag) for everything else."""
+    if request.endpoint in ('serve_static', 'serve_frontend') and response.status_code in (200, 304):
+        if request.path in HASHED_ASSETS:
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+    return response
+
+
+@app.after_request
+def compress_api_response(response):
+    """gzip larger API responses for clients that accept it."""
+    if request.path.startswith('/api/'):
+        if should_compress(response, request.accept_encodings['gzip'] > 0):
+            compress_response(response)
+    return response
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Metrics in the Prometheus text format"""
+    response = make_response(METRICS.render())
+    response.headers['Content-Type'] = METRICS_CONTENT_TYPE
+    return response
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint - verify API is running"""
     return jsonify({
         'status': 'healthy',
         'message': 'Poker Chip Calculator API is running',
-        'version': '2.1'
+        'version': '2.1',
+        'result_cache': RESULT_CACHE.stats(),
+        'chipsets': CHIPSET_STORE.stats(),
+        # Not loaded until the first license or purchase check
+        'license_cache': loaded_billing().license_cache_stats() if loaded_billing() else None
     })
 
 
 @app.route('/api/chip-set', methods=['GET'])
 def get_chip_set():
     """Get available chip set inventory"""
-    total_value = sum(denom * count for denom, count in CHIP_SET.items())
+    chip_set = get_chip_inventory()
     return jsonify({
-        'chip_set': CHIP_SET,
-        'total_value': total_value,
-        'total_chips': sum(CHIP_SET.values())
+        'chip_set': chip_set,
+        'total_value': chip_set.value,
+        'total_chips': sum(chip_set.values())
     })
 
 
+@app.route('/api/chipsets', methods=['GET', 'POST'])
+def chipsets():
+    """
+    List an owner's saved chip sets, or save a new one
+
+    GET  /api/chipsets?owner=<owner id>
+    POST /api/chipsets
+    {
+        "owner": "3f2b9c1e-...",                  (client-generated ID, 8-128 characters)
+        "name": "Home game",
+        "chip_set": {"1": 300, "5": 200, ...}
+    }
+
+    A saved set's "id" can be sent as "chipset_id" instead of "chip_set" to
+    any calculation endpoint. Its Mode 1 table is precomputed in the background.
+    """
+    try:
+        if request.method == 'GET':
+            return jsonify({'chipsets': CHIPSET_STORE.list(request.args.get('owner'))})
+
+        data = request.json
+        record = CHIPSET_STORE.create(data.get('owner'), data.get('name'), data.get('chip_set'))
+        return jsonify(record), 201
+
+    except ChipsetStoreFull as e:
+        return jsonify({
+            'error': str(e)
+        }), 429
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/api/chipsets/<chipset_id>', methods=['GET', 'PUT', 'DELETE'])
+def chipset(chipset_id):
+    """
+    Get, update or delete a saved chip set
+
+    GET    /api/chipsets/<id>
+    PUT    /api/chipsets/<id>   {"owner": "...", "name": "...", "chip_set": {...}}   (name, chip_set optional)
+    DELETE /api/chipsets/<id>?owner=<owner id>
+
+    Changes must come from the set's owner. Responses never include the owner
+    ID, since it is what authorizes changes.
+    """
+    try:
+        if request.method == 'GET':
+            return jsonify(CHIPSET_STORE.get(chipset_id))
+
+        if request.method == 'DELETE':
+            CHIPSET_STORE.delete(chipset_id, request.args.get('owner'))
+            return jsonify({'deleted': chipset_id})
+
+        data = request.json
+        return jsonify(CHIPSET_STORE.update(chipset_id, data.get('owner'),
+                                            name=data.get('name'), chip_set=data.get('chip_set')))
+
+    except ChipsetNotFound:
+        return jsonify({
+            'error': f'Chip set not found: {chipset_id}'
+        }), 404
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
 @app.route('/api/calculate', methods=['POST'])
 def calculate_auto():
     """
@@ -148,42 +603,122 @@ def calculate_auto():
         "small_blind": 25,
         "big_blind": 50,
         "duration_hours": 5,
-        "minutes_per_level": 15
+        "minutes_per_level": 15,
+        "chip_set": {"1": 300, "5": 200, ...}   (optional)
+        "chipset_id": "..."                     (optional, a saved chip set instead of chip_set)
     }
     """
     try:
         data = request.json
 
-        # Validate required fields
-        required_fields = ['num_players', 'small_blind', 'big_blind',
-                          'duration_hours', 'minutes_per_level']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'error': f'Missing required field: {field}'
-                }), 400
+        timer = new_timer()
 
-        # Extract parameters
-        num_players = int(data['num_players'])
-        small_blind = float(data['small_blind'])
-        big_blind = float(data['big_blind'])
-        duration_hours = float(data['duration_hours'])
-        minutes_per_level = int(data['minutes_per_level'])
-
-        # Call calculator
-        result = calculate_chip_distribution(
-            num_players=num_players,
-            small_blind=small_blind,
-            big_blind=big_blind,
-            duration_hours=duration_hours,
-            minutes_per_level=minutes_per_level
-        )
+        # Validate required fields and extract parameters
+        params, chip_set = parse_calculation(data, 'auto')
+        timer.mark('parse')
+
+        # Precomputed table first, then the calculator
+        result = auto_result(params, chip_set, timer)
 
         # Check if result has error
         if 'error' in result:
-            return jsonify(result), 400
+            return timed_response(result, timer, 400)
 
-        return jsonify(result)
+        return timed_response(result, timer)
+
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/api/sessions', methods=['POST'])
+def create_session():
+    """
+    Start an incremental Mode 1 session (for sliders that change one input at a time)
+
+    Expected JSON body: the same as /api/calculate.
+
+    Returns {"session_id", "version": 1, "result": {...}}. Send later changes
+    to PATCH /api/sessions/<session_id>.
+    """
+    try:
+        data = request.json
+        options = response_options()
+        params, chip_set = parse_calculation(data, 'auto')
+        session = CalculationSession(params, chip_set)
+        SESSIONS.put(session.id, session)
+        return encoded_response({
+            'session_id': session.id,
+            'version': session.version,
+            'result': shape_result(session.result, **options)
+        }, 201)
+
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/api/sessions/<session_id>', methods=['PATCH', 'DELETE'])
+def update_session(session_id):
+    """
+    Change inputs of a session and get back only what changed
+
+    Expected JSON body (any subset of the Mode 1 fields):
+    {
+        "num_players": 11,
+        "chip_set": {...} or "chipset_id": "...",   (optional)
+        "base": {...}                              (optional, see below)
+    }
+
+    Returns {"session_id", "version", "changed": {field: value}, "removed": [field],
+    "recomputed": [stage]}. Only the stages affected by the change are rerun
+    (see session_engine.py). A session lives in one server process and
+    expires when idle; if "base" holds the full previous /api/calculate body,
+    a missing session is rebuilt from it instead of returning 404.
+    DELETE ends the session.
+    """
+    try:
+        if request.method == 'DELETE':
+            if not SESSIONS.discard(session_id):
+                return jsonify({'error': f'Session not found: {session_id}'}), 404
+            return jsonify({'deleted': session_id})
+
+        data = request.json
+        options = response_options()
+        session = SESSIONS.get(session_id)
+        if session is None:
+            if not isinstance(data.get('base'), dict) or len(session_id) > 64:
+                return jsonify({
+                    'error': f'Session not found: {session_id}'
+                }), 404
+            params, chip_set = parse_calculation(data['base'], 'auto')
+            session = CalculationSession(params, chip_set, session_id=session_id)
+
+        field_types = dict(CALCULATION_FIELDS['auto'])
+        changes = {field: convert_field(field, field_types[field], data[field]) for field in SESSION_FIELDS
+                   if data.get(field) is not None}
+        chip_set = resolve_chip_set(data, session.chip_set)
+        delta = session.update(changes, chip_set)
+        # Storing again keeps an active session from expiring
+        SESSIONS.put(session.id, session)
+
+        return encoded_response({
+            'session_id': session.id,
+            'version': delta['version'],
+            'changed': shape_result(delta['changed'], **options),
+            'removed': delta['removed'],
+            'recomputed': delta['recomputed']
+        })
 
     except ValueError as e:
         return jsonify({
@@ -205,39 +740,122 @@ def calculate_custom():
         "num_players": 10,
         "small_blind": 25,
         "big_blind": 50,
-        "target_stack": 8500
+        "target_stack": 8500,
+        "chip_set": {"1": 300, "5": 200, ...},   (optional)
+        "chipset_id": "...",                     (optional, a saved chip set instead of chip_set)
+        "solver": "greedy" or "exact",           (optional, default "greedy")
+        "time_budget_ms": 50                     (optional, exact solver time limit)
     }
     """
     try:
         data = request.json
 
-        # Validate required fields
-        required_fields = ['num_players', 'small_blind', 'big_blind', 'target_stack']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'error': f'Missing required field: {field}'
-                }), 400
+        timer = new_timer()
 
-        # Extract parameters
-        num_players = int(data['num_players'])
-        small_blind = float(data['small_blind'])
-        big_blind = float(data['big_blind'])
-        target_stack = float(data['target_stack'])
-
-        # Call calculator
-        result = calculate_chip_distribution_custom(
-            num_players=num_players,
-            small_blind=small_blind,
-            big_blind=big_blind,
-            target_stack=target_stack
+        # Validate required fields and extract parameters
+        params, chip_set = parse_calculation(data, 'custom')
+        timer.mark('parse')
+
+        # Call calculator (repeated scenarios are served from the result cache)
+        result = RESULT_CACHE.get_or_compute(
+            calculation_cache_key('custom', params, chip_set),
+            lambda: calculate_chip_distribution_custom(**params, chip_set=chip_set, timer=timer),
+            ttl=result_cache_ttl
         )
+        timer.mark('cache')
 
         # Check if result has error
         if 'error' in result:
-            return jsonify(result), 400
+            return timed_response(result, timer, 400)
+
+        return timed_response(result, timer)
+
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/api/calculate/batch', methods=['POST'])
+def calculate_batch():
+    """
+    Evaluate many Mode 1 / Mode 2 scenarios in one request on a process pool
+
+    Expected JSON body:
+    {
+        "scenarios": [
+            {"mode": "auto", "num_players": 9, "small_blind": 25, "big_blind": 50,
+             "duration_hours": 4, "minutes_per_level": 20},
+            {"mode": "custom", "num_players": 10, "small_blind": 25, "big_blind": 50,
+             "target_stack": 8500, "chip_set": {"25": 300, ...}}
+        ],
+        "chip_set": {"1": 300, "5": 200, ...}   (optional default for every scenario)
+    }
 
-        return jsonify(result)
+    Any "chip_set" may be replaced by "chipset_id" (a saved chip set).
+
+    "mode" may be "auto"/1 or "custom"/2; if omitted it is inferred from
+    whether "target_stack" is present. Results are returned in input order,
+    each as {"index": i, "result": {...}} or {"index": i, "error": "..."}.
+    ?fields= and ?schema= apply to each result.
+    """
+    try:
+        data = request.json
+        options = response_options()
+        scenarios = data.get('scenarios')
+        if not isinstance(scenarios, list) or not scenarios:
+            return jsonify({
+                'error': 'scenarios must be a non-empty list'
+            }), 400
+        if len(scenarios) > BATCH_MAX_SCENARIOS:
+            return jsonify({
+                'error': f'Too many scenarios! Maximum is {BATCH_MAX_SCENARIOS} per request'
+            }), 400
+
+        default_chip_set = resolve_chip_set(data)
+
+        # Parse every scenario, serving repeats from the result cache
+        entries = [None] * len(scenarios)
+        pending = []
+        pending_keys = []
+        pending_indexes = []
+        for index, item in enumerate(scenarios):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError('Each scenario must be an object')
+                mode = scenario_mode(item)
+                params, chip_set = parse_calculation(item, mode, default_chip_set)
+            except ValueError as e:
+                entries[index] = {'error': str(e)}
+                continue
+
+            cache_key = calculation_cache_key(mode, params, chip_set)
+            cached = RESULT_CACHE.get(cache_key)
+            if cached is not None:
+                entries[index] = {'error': cached['error']} if 'error' in cached else {'result': cached}
+                continue
+
+            pending.append((mode, dict(params, chip_set=chip_set)))
+            pending_keys.append(cache_key)
+            pending_indexes.append(index)
+
+        # Fan the remaining scenarios out over the worker pool
+        for index, cache_key, entry in zip(pending_indexes, pending_keys, run_batch(pending)):
+            if 'result' in entry:
+                RESULT_CACHE.put(cache_key, entry['result'], ttl=result_cache_ttl)
+            entries[index] = entry
+
+        return encoded_response({
+            'count': len(entries),
+            'errors': sum(1 for entry in entries if 'error' in entry),
+            'results': [dict(entry, index=index, result=shape_result(entry['result'], **options))
+                        if 'result' in entry else dict(entry, index=index)
+                        for index, entry in enumerate(entries)]
+        })
 
     except ValueError as e:
         return jsonify({
@@ -249,6 +867,292 @@ def calculate_custom():
         }), 500
 
 
+@app.route('/api/calculate/grid', methods=['POST'])
+def calculate_grid():
+    """
+    Mode 1 scenario grid - evaluate every combination of the given axes at once
+
+    Expected JSON body (each axis is a list or a {"start", "stop", "step"} range):
+    {
+        "num_players": {"start": 6, "stop": 60},
+        "blinds": [[25, 50]],
+        "duration_hours": [4],
+        "minutes_per_level": {"start": 15, "stop": 30, "step": 5},
+        "chip_set": {"1": 300, "5": 200, ...}   (optional)
+    }
+
+    Arrays in the response are flattened in (players, blinds, durations,
+    level lengths) order; "shape" gives the size of each axis.
+    """
+    try:
+        data = request.json
+
+        num_players = parse_axis(data, 'num_players', int)
+        blinds = parse_blinds(data)
+        duration_hours = parse_axis(data, 'duration_hours', float)
+        minutes_per_level = parse_axis(data, 'minutes_per_level', int)
+
+        cells = len(num_players) * len(blinds) * len(duration_hours) * len(minutes_per_level)
+        if cells > GRID_MAX_CELLS:
+            return jsonify({
+                'error': f'Grid too large! {cells} scenarios requested, maximum is {GRID_MAX_CELLS}'
+            }), 400
+
+        chip_set = resolve_chip_set(data)
+        # NumPy is only imported once a grid is requested (keeps it out of cold starts)
+        from grid_engine import sweep_grid
+        grid = sweep_grid(num_players, blinds, duration_hours, minutes_per_level, chip_set)
+
+        return jsonify({
+            'shape': grid['shape'],
+            'axes': {
+                'num_players': num_players,
+                'blinds': blinds,
+                'duration_hours': duration_hours,
+                'minutes_per_level': minutes_per_level
+            },
+            'denominations': grid['denominations'],
+            'counts': grid['counts'].tolist(),
+            'stack_value': grid['stack_value'].tolist(),
+            'big_blinds': grid['big_blinds'].tolist(),
+            'total_levels': grid['total_levels'].tolist(),
+            'stack_was_adjusted': grid['stack_was_adjusted'].tolist(),
+            'errors': grid['errors']
+        })
+
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        return jsonify({
+            'error': f'Invalid grid request: {str(e)}'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/api/calculate/stream', methods=['POST'])
+def calculate_stream():
+    """
+    Stream a scenario sweep as NDJSON - one line per scenario, sent as soon as it is calculated
+
+    Expected JSON body (axes are lists or {"start", "stop", "step"} ranges, as for /api/calculate/grid):
+    {
+        "mode": "auto",                                  ("custom" sweeps "target_stack" instead of
+        "num_players": {"start": 4, "stop": 100},         "duration_hours" / "minutes_per_level")
+        "blinds": [[25, 50], [50, 100]],
+        "duration_hours": [3, 4, 5],
+        "minutes_per_level": {"start": 10, "stop": 40, "step": 5},
+        "chip_set": {"1": 300, "5": 200, ...}   (optional)
+    }
+
+    or {"scenarios": [...]} with the same items as /api/calculate/batch.
+
+    Each line is {"index": i, "scenario": {...}, "result": {...}} or {..., "error": "..."},
+    in sweep order (players outermost); the last line is {"done": true, "count": n, "errors": k}.
+    ?fields= and ?schema= apply to each result.
+    Scenarios are expanded and calculated lazily with a bounded number in
+    flight, so memory use and time to the first line don't grow with the sweep.
+    """
+    try:
+        data = request.json
+        options = response_options()
+        default_chip_set = resolve_chip_set(data)
+
+        if 'scenarios' in data:
+            items = data['scenarios']
+            if not isinstance(items, list) or not items:
+                raise ValueError('scenarios must be a non-empty list')
+            count = len(items)
+            fixed_mode = None
+        else:
+            fixed_mode = scenario_mode(data)
+            axes = {field: parse_blinds(data) if field == 'blinds' else parse_axis(data, field, field_type)
+                    for field, field_type in SWEEP_AXES[fixed_mode]}
+            count = 1
+            for values in axes.values():
+                count *= len(values)
+            items = sweep_items(fixed_mode, axes, data)
+
+        if count > STREAM_MAX_SCENARIOS:
+            return jsonify({
+                'error': f'Sweep too large! {count} scenarios requested, maximum is {STREAM_MAX_SCENARIOS}'
+            }), 400
+
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        return jsonify({
+            'error': f'Invalid stream request: {str(e)}'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+    def prepare():
+        # Parse lazily; repeats come from the result cache (streams don't fill it).
+        # The headers are already sent, so any error must become that scenario's line.
+        for item in items:
+            scenario = {key: value for key, value in item.items() if key != 'chip_set'} \
+                if isinstance(item, dict) else item
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError('Each scenario must be an object')
+                mode = fixed_mode or scenario_mode(item)
+                params, chip_set = parse_calculation(item, mode, default_chip_set)
+                cache_key = calculation_cache_key(mode, params, chip_set)
+            except (ValueError, TypeError, KeyError, IndexError) as e:
+                yield scenario, {'error': str(e)}, None
+                continue
+            except Exception as e:
+                yield scenario, {'error': f'Unexpected error: {str(e)}'}, None
+                continue
+            cached = RESULT_CACHE.get(cache_key)
+            if cached is not None:
+                yield scenario, ({'error': cached['error']} if 'error' in cached else {'result': cached}), None
+            else:
+                yield scenario, None, (mode, dict(params, chip_set=chip_set))
+
+    def generate():
+        errors = 0
+        for index, scenario, entry in ordered_stream(prepare()):
+            errors += 'error' in entry
+            if 'result' in entry:
+                entry = {'result': shape_result(entry['result'], **options)}
+            yield app.json.dumps(dict(entry, index=index, scenario=scenario)) + '\n'
+        yield app.json.dumps({'done': True, 'count': count, 'errors': errors}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/simulate', methods=['POST'])
+def simulate():
+    """
+    Simulate a Mode 1 tournament many times to estimate when it will finish
+
+    Expected JSON body (the Mode 1 fields plus optional simulation settings):
+    {
+        "num_players": 12,
+        "small_blind": 25,
+        "big_blind": 50,
+        "duration_hours": 5,
+        "minutes_per_level": 15,
+        "chip_set": {"1": 300, "5": 200, ...},   (optional, or "chipset_id")
+        "simulations": 2000,                     (optional)
+        "seed": 42,                              (optional, for reproducible results)
+        "time_budget_ms": 1000,                  (optional)
+        "hands_per_hour": 30,                    (optional, per table)
+        "table_size": 9                          (optional)
+    }
+
+    Returns the Mode 1 starting stack and the p10/p50/p90 finish time and
+    level over the simulated tournaments (see tournament_sim.py).
+    """
+    try:
+        data = request.json
+
+        timer = new_timer()
+
+        params, chip_set = parse_calculation(data, 'auto')
+        settings = {}
+        for field, field_type in SIMULATION_FIELDS:
+            if data.get(field) is not None:
+                settings[field] = convert_field(field, field_type, data[field])
+        timer.mark('parse')
+
+        result = auto_result(params, chip_set, timer)
+        if 'error' in result:
+            return timed_response(result, timer, 400)
+
+        # NumPy is only loaded once a simulation is requested
+        from tournament_sim import simulate_tournament
+        denominations = result['available_chips'].denominations
+        simulation = simulate_tournament(
+            params['num_players'], result['stack_value'], params['small_blind'], params['big_blind'],
+            params['duration_hours'], params['minutes_per_level'],
+            denominations[first_usable_column(denominations, params['small_blind']):], **settings
+        )
+        timer.mark('simulate')
+
+        return timed_response(dict(simulation, stack_value=result['stack_value'],
+                                   target_level=result['target_level']), timer)
+
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/api/blind-schedule', methods=['POST'])
+def blind_schedule():
+    """
+    Full blind structure - every level's blinds, rounded to payable amounts
+
+    Expected JSON body (give either num_levels or duration_hours + minutes_per_level):
+    {
+        "small_blind": 25,
+        "big_blind": 50,
+        "num_levels": 16,
+        "duration_hours": 4,                     (optional)
+        "minutes_per_level": 15,                 (optional)
+        "multiplier": 1.5,                       (optional)
+        "stack_value": 10000,                    (optional - adds depth in big blinds)
+        "chip_set": {"1": 300, "5": 200, ...}   (optional)
+    }
+    """
+    try:
+        data = request.json
+
+        for field in ('small_blind', 'big_blind'):
+            if field not in data:
+                raise ValueError(f'Missing required field: {field}')
+        small_blind = float(data['small_blind'])
+        big_blind = float(data['big_blind'])
+        if small_blind <= 0 or big_blind <= 0 or small_blind > big_blind:
+            raise ValueError('Blinds must be positive and the small blind cannot exceed the big blind')
+
+        if 'num_levels' in data:
+            num_levels = int(data['num_levels'])
+        elif 'duration_hours' in data and 'minutes_per_level' in data:
+            minutes_per_level = int(data['minutes_per_level'])
+            if minutes_per_level <= 0:
+                raise ValueError('Blind levels must be at least 1 minute long')
+            num_levels = int(float(data['duration_hours']) * 60 / minutes_per_level)
+        else:
+            raise ValueError('Missing required field: num_levels (or duration_hours and minutes_per_level)')
+        if not 1 <= num_levels <= BLIND_SCHEDULE_MAX_LEVELS:
+            raise ValueError(f'Number of levels must be between 1 and {BLIND_SCHEDULE_MAX_LEVELS}')
+
+        multiplier = float(data.get('multiplier', BLIND_MULTIPLIER))
+        if not 1 < multiplier <= 3:
+            raise ValueError('Multiplier must be greater than 1 and at most 3')
+        stack_value = float(data['stack_value']) if data.get('stack_value') is not None else None
+
+        # Same usable denominations as Mode 1
+        chip_set = resolve_chip_set(data)
+        denominations = [d for d in sorted(chip_set) if small_blind <= 2 or d >= small_blind]
+        if not denominations:
+            raise ValueError('No usable chip denominations found for the given blinds')
+
+        return jsonify({
+            'multiplier': multiplier,
+            'num_levels': num_levels,
+            'levels': build_blind_schedule(small_blind, big_blind, num_levels, denominations,
+                                           stack_value, multiplier)
+        })
+
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
 @app.route('/api/verify-license', methods=['POST'])
 def verify_license():
     """
@@ -259,8 +1163,13 @@ def verify_license():
         "license_key": "XXXX-XXXX-XXXX-XXXX",
         "product_id": "entry" or "premium"
     }
+
+    "product_id" may also be a list (e.g. ["entry", "premium"]): the tiers
+    are checked concurrently and the response has one result per tier:
+    {"success": true, "product_tier": <best valid tier or null>, "results": {"entry": {...}, ...}}
     """
     try:
+        billing = get_billing()
         data = request.json
         license_key = data.get('license_key')
         product_tier = data.get('product_id')  # "entry" or "premium"
@@ -271,80 +1180,23 @@ def verify_license():
                 'error': 'Missing license_key'
             }), 400
 
-        if not product_tier or product_tier not in GUMROAD_PRODUCT_IDS:
+        product_tiers = product_tier if isinstance(product_tier, list) else [product_tier]
+        if not product_tiers or any(not isinstance(tier, str) or tier not in billing.GUMROAD_PRODUCT_IDS
+                                    for tier in product_tiers):
             return jsonify({
                 'success': False,
                 'error': 'Invalid product_id. Must be "entry" or "premium"'
             }), 400
 
-        # Owner test keys
-        if license_key in TEST_LICENSE_KEYS:
-            test_tier = TEST_LICENSE_KEYS[license_key]
-            if test_tier == product_tier or (test_tier == 'premium' and product_tier == 'entry'):
-                return jsonify({
-                    'success': True,
-                    'valid': True,
-                    'product_tier': product_tier,
-                    'purchase_email': 'tester@test.com',
-                    'purchase_date': '2026-01-14',
-                    'product_name': f'Test {product_tier.title()} License'
-                })
-
-        # Get the actual Gumroad product ID
-        gumroad_product_id = GUMROAD_PRODUCT_IDS[product_tier]
-
-        # Call Gumroad License Verification API
-        # Documentation: https://gumroad.com/api#license-key-verification
-        api_url = "https://api.gumroad.com/v2/licenses/verify"
-
-        payload = {
-            'product_id': gumroad_product_id,
-            'license_key': license_key,
-            'increment_uses_count': 'false'  # Don't count this as a "use"
-        }
+        if not isinstance(product_tier, list):
+            return jsonify(billing.check_license(license_key, product_tier))
 
-        headers = {
-            'Authorization': f'Bearer {GUMROAD_ACCESS_TOKEN}'
-        }
+        # Several tiers: check them at the same time
+        return jsonify(billing.check_license_tiers(license_key, product_tiers))
 
-        response = requests.post(api_url, data=payload, headers=headers, timeout=10)
-        gumroad_data = response.json()
-
-        # Check if the license is valid
-        if gumroad_data.get('success') and gumroad_data.get('purchase'):
-            purchase_info = gumroad_data['purchase']
-
-            return jsonify({
-                'success': True,
-                'valid': True,
-                'product_tier': product_tier,
-                'purchase_email': purchase_info.get('email'),
-                'purchase_date': purchase_info.get('created_at'),
-                'product_name': purchase_info.get('product_name')
-            })
-        else:
-            # License is invalid
-            return jsonify({
-                'success': True,
-                'valid': False,
-                'error': gumroad_data.get('message', 'Invalid license key')
-            })
-
-    except requests.exceptions.Timeout:
-        return jsonify({
-            'success': False,
-            'error': 'Gumroad API request timed out. Please try again.'
-        }), 504
-    except requests.exceptions.RequestException as e:
-        return jsonify({
-            'success': False,
-            'error': f'Network error: {str(e)}'
-        }), 500
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': f'Unexpected error: {str(e)}'
-        }), 500
+        body, status = get_billing().license_error(e)
+        return jsonify(body), status
 
 
 @app.route('/api/verify-play-purchase', methods=['POST'])
@@ -369,41 +1221,8 @@ def verify_play_purchase():
                 'error': 'Missing purchase_token or product_id'
             }), 400
 
-        service = get_play_service()
-        if not service:
-            return jsonify({
-                'success': False,
-                'error': 'Google Play verification not configured'
-            }), 500
-
-        result = service.purchases().products().get(
-            packageName=PLAY_PACKAGE_NAME,
-            productId=product_id,
-            token=purchase_token
-        ).execute()
-
-        # purchaseState: 0 = purchased, 1 = canceled, 2 = pending
-        if result.get('purchaseState') == 0:
-            # Acknowledge the purchase if not already acknowledged
-            if result.get('acknowledgementState') == 0:
-                service.purchases().products().acknowledge(
-                    packageName=PLAY_PACKAGE_NAME,
-                    productId=product_id,
-                    token=purchase_token
-                ).execute()
-
-            tier = 'premium' if product_id == 'premium_tier' else 'entry'
-            return jsonify({
-                'success': True,
-                'valid': True,
-                'product_tier': tier
-            })
-        else:
-            return jsonify({
-                'success': True,
-                'valid': False,
-                'error': 'Purchase not valid'
-            })
+        body, status = get_billing().verify_play_purchase(purchase_token, product_id)
+        return jsonify(body), status
 
     except Exception as e:
         return jsonify({
@@ -421,14 +1240,11 @@ def serve_static(path):
     if path.startswith("api/"):
         return jsonify({"error": "API endpoint not found"}), 404
     
-    # Serve static files
-    file_path = os.path.join(app.static_folder, path)
+    # Serve static files (an unhashed name gets the current hashed file)
+    path = ASSET_PATHS.get(path, path)
+    file_path = os.path.join(FRONTEND_DIR, path)
     if os.path.exists(file_path) and os.path.isfile(file_path):
-        response = make_response(send_from_directory(app.static_folder, path))
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-        return response
+        return send_from_directory(FRONTEND_DIR, path)
     
     # File not found
     return jsonify({"error": "File not found"}), 404
@@ -471,10 +1287,19 @@ if __name__ == '__main__':
     print("\n[API] Endpoints:")
     print("   GET  /api/health          - Health check")
     print("   GET  /api/chip-set        - Get chip inventory")
+    print("   GET  /api/metrics         - Prometheus metrics")
+    print("   *    /api/chipsets        - Saved chip sets")
     print("   POST /api/calculate       - Mode 1 (auto-calculate)")
+    print("   POST /api/sessions        - Incremental Mode 1 (slider) session")
     print("   POST /api/calculate-custom - Mode 2 (custom stack)")
+    print("   POST /api/calculate/batch - Many scenarios at once")
+    print("   POST /api/calculate/grid  - Mode 1 scenario grid")
+    print("   POST /api/calculate/stream - Scenario sweep as NDJSON")
+    print("   POST /api/simulate        - Finish time estimate (Monte Carlo)")
+    print("   POST /api/blind-schedule  - Full blind structure")
     print("   POST /api/verify-license  - Verify Gumroad license")
-    print("\n[INFO] Press CTRL+C to stop the server")
+    print("\n[INFO] Development server - for production use 'python serve.py' (multiple workers)")
+    print("[INFO] Press CTRL+C to stop the server")
     print("="*60 + "\n")
 
     # Run the Flask development server
@@ -0,0 +1,235 @@
+"""
+Batch evaluation of calculator scenarios on a process pool.
+
+Each scenario is a (mode, params) pair where params are keyword arguments
+for calculate_chip_distribution (mode "auto") or
+calculate_chip_distribution_custom (mode "custom"), including a plain-dict
+chip_set. Results come back in input order.
+
+run_batch evaluates a whole list at once; stream_batch consumes an iterable
+lazily and yields results as they finish, with a bounded number of chunks
+in flight.
+
+Pool workers are forked from the process that first needs them (under
+serve.py, a server worker). On start they restore default signal handling,
+close file descriptors registered with close_in_workers (the listening
+socket) and exit on their own if that process dies. Metric counters they
+increment (engine calculations, shortage repairs) are sent back with each
+task's results and added to the parent's counters.
+"""
+
+import itertools
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from metrics import REGISTRY, CounterDeltas
+from pokerchipcounter import calculate_chip_distribution, calculate_chip_distribution_custom
+
+CALCULATORS = {
+    'auto': calculate_chip_distribution,
+    'custom': calculate_chip_distribution_custom
+}
+
+# Worker processes for batch requests (defaults to one per CPU)
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', '0')) or os.cpu_count() or 1
+
+# Batches this small are evaluated in-process; the pool round trip would cost more
+BATCH_INLINE_MAX = int(os.environ.get('BATCH_INLINE_MAX', '8'))
+
+# Scenarios per pool task when streaming, and tasks in flight per worker
+STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', '16'))
+STREAM_WINDOW_PER_WORKER = 2
+
+# Seconds between pool worker checks that the process that started them is alive
+PARENT_CHECK_INTERVAL = 1.0
+
+Scenario = Tuple[str, Dict[str, Any]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_worker_close_fds: Set[int] = set()
+# Counter increments not yet sent to the parent (set in pool workers only)
+_worker_counts: Optional[CounterDeltas] = None
+
+
+def evaluate_scenario(scenario: Scenario) -> Dict[str, Any]:
+    """
+    Evaluate one scenario, turning calculator errors into an error entry.
+
+    Args:
+        scenario: (mode, params) tuple
+
+    Returns:
+        {'result': {...}} on success or {'error': "..."} on failure
+    """
+    mode, params = scenario
+    try:
+        result = CALCULATORS[mode](**params)
+    except ValueError as e:
+        return {'error': str(e)}
+    except Exception as e:
+        return {'error': f'Unexpected error: {str(e)}'}
+    if 'error' in result:
+        return {'error': result['error']}
+    return {'result': result}
+
+
+def evaluate_chunk(scenarios: Sequence[Scenario]) -> List[Dict[str, Any]]:
+    """Evaluate a few scenarios in one pool task (see evaluate_scenario)."""
+    return [evaluate_scenario(scenario) for scenario in scenarios]
+
+
+def _evaluate_chunk_in_worker(scenarios: Sequence[Scenario]) -> Tuple[List[Dict[str, Any]], dict]:
+    # Pool task: the entries plus the counter increments they caused
+    entries = evaluate_chunk(scenarios)
+    return entries, _worker_counts.take()
+
+
+def _collect(task_result: Tuple[List[Dict[str, Any]], dict]) -> List[Dict[str, Any]]:
+    entries, counts = task_result
+    REGISTRY.add_counts(counts)
+    return entries
+
+
+def close_in_workers(fd: int) -> None:
+    """Have pool workers close an inherited file descriptor (e.g. a server's listening socket) when they start."""
+    _worker_close_fds.add(fd)
+
+
+def _watch_parent(parent_pid: int) -> None:
+    # Fork-started workers share the task queue's pipes with the parent, so
+    # they never see it close; poll instead and exit once the parent is gone
+    while True:
+        time.sleep(PARENT_CHECK_INTERVAL)
+        if os.getppid() != parent_pid:
+            os._exit(1)
+
+
+def _init_worker(parent_pid: int, close_fds: Tuple[int, ...]) -> None:
+    global _worker_counts
+    # Forked workers inherit the parent's handlers (a server worker ignores
+    # SIGINT/SIGHUP and handles SIGTERM itself); let signals stop them again
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(signum, signal.SIG_DFL)
+    for fd in close_fds:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+    threading.Thread(target=_watch_parent, args=(parent_pid,), name='parent-watch', daemon=True).start()
+    _worker_counts = CounterDeltas(REGISTRY)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS, initializer=_init_worker,
+                                        initargs=(os.getpid(), tuple(sorted(_worker_close_fds))))
+        return _pool
+
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """The shared worker pool for other parallel jobs, or None when running in-process (BATCH_WORKERS <= 1)."""
+    return _get_pool() if BATCH_WORKERS > 1 else None
+
+
+def _reset_pool(wait: bool = False) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=True)
+            _pool = None
+
+
+def shutdown_pool(wait: bool = False) -> None:
+    """
+    Stop the worker processes (they are restarted on the next batch).
+
+    Args:
+        wait: Wait for the workers to exit (needed before os._exit, which would skip their shutdown)
+    """
+    _reset_pool(wait)
+
+
+def run_batch(scenarios: Sequence[Scenario]) -> List[Dict[str, Any]]:
+    """
+    Evaluate scenarios across the worker pool.
+
+    Args:
+        scenarios: (mode, params) tuples
+
+    Returns:
+        One {'result': ...} / {'error': ...} entry per scenario, in input order
+    """
+    if len(scenarios) <= BATCH_INLINE_MAX or BATCH_WORKERS <= 1:
+        return [evaluate_scenario(scenario) for scenario in scenarios]
+
+    chunksize = max(1, len(scenarios) // (BATCH_WORKERS * 4))
+    chunks = [scenarios[start:start + chunksize] for start in range(0, len(scenarios), chunksize)]
+    try:
+        results = list(_get_pool().map(_evaluate_chunk_in_worker, chunks))
+    except BrokenProcessPool:
+        # A worker died (e.g. killed by the OS) - start a fresh pool next time
+        # and finish this batch in-process
+        _reset_pool()
+        return [evaluate_scenario(scenario) for scenario in scenarios]
+    return [entry for result in results for entry in _collect(result)]
+
+
+def stream_batch(scenarios: Iterable[Scenario], chunk_size: int = STREAM_CHUNK_SIZE,
+                 window: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Evaluate scenarios lazily, yielding each entry as soon as it (and every earlier one) is done.
+
+    Scenarios are taken from the iterable only as results are consumed: at
+    most `window` chunks are in flight, so memory stays flat however many
+    scenarios there are, and a slow consumer slows down evaluation instead
+    of letting results pile up.
+
+    Args:
+        scenarios: (mode, params) tuples, e.g. a generator
+        chunk_size: Scenarios per pool task
+        window: Chunks in flight (default: STREAM_WINDOW_PER_WORKER per worker)
+
+    Yields:
+        One {'result': ...} / {'error': ...} entry per scenario, in input order
+    """
+    scenarios = iter(scenarios)
+    if BATCH_WORKERS <= 1:
+        for scenario in scenarios:
+            yield evaluate_scenario(scenario)
+        return
+
+    window = window or BATCH_WORKERS * STREAM_WINDOW_PER_WORKER
+    chunks = iter(lambda: list(itertools.islice(scenarios, chunk_size)), [])
+    in_flight = deque()
+    try:
+        pool = _get_pool()
+        for chunk in itertools.islice(chunks, window):
+            in_flight.append((chunk, pool.submit(_evaluate_chunk_in_worker, chunk)))
+        while in_flight:
+            chunk, future = in_flight.popleft()
+            try:
+                entries = _collect(future.result())
+            except BrokenProcessPool:
+                # A worker died - finish this chunk in-process and carry on with a fresh pool
+                _reset_pool()
+                pool = _get_pool()
+                entries = evaluate_chunk(chunk)
+                in_flight = deque((pending, pool.submit(_evaluate_chunk_in_worker, pending))
+                                  for pending, _ in in_flight)
+            # Refill before yielding, so the pool keeps working while the consumer writes
+            for next_chunk in itertools.islice(chunks, 1):
+                in_flight.append((next_chunk, pool.submit(_evaluate_chunk_in_worker, next_chunk)))
+            yield from entries
+    finally:
+        # Consumer went away (e.g. client disconnected): drop queued work
+        for _, future in in_flight:
+            future.cancel()
@@ -0,0 +1,17 @@
+"""
+Engine benchmark suite for the Poker Chip Calculator.
+
+Times the calculation engine over a fixed scenario corpus, tracks memory with
+tracemalloc, and compares the numbers with a stored JSON baseline.
+
+Run from the backend directory:
+    python -m benchmarks                    # run and print a report
+    python -m benchmarks --save-baseline    # record the current numbers
+    python -m benchmarks --check            # fail (exit 1) on regressions
+    python -m benchmarks.startup            # cold start: time to first calculation
+"""
+
+from benchmarks.corpus import build_corpus
+from benchmarks.runner import compare_to_baseline, run_benchmarks
+
+__all__ = ['build_corpus', 'compare_to_baseline', 'run_benchmarks']
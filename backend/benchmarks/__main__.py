@@ -0,0 +1,74 @@
+"""
+Command line entry point: python -m benchmarks [options]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from benchmarks.runner import FUNCTIONS, compare_to_baseline, run_benchmarks
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def print_report(report):
+    print(f"Python {report['python']} on {report['platform']} (seed {report['seed']}, "
+          f"{report['repeat']} calls per case)")
+    print(f"{'function':36} {'cases':>6} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10} {'max us':>10} "
+          f"{'peak KiB':>10} {'kept KiB':>10}")
+    for name, stats in report['functions'].items():
+        print(f"{name:36} {stats['cases']:6d} {stats['p50_us']:10.2f} {stats['p90_us']:10.2f} "
+              f"{stats['p99_us']:10.2f} {stats['max_us']:10.2f} {stats['peak_kib']:10.1f} "
+              f"{stats['retained_kib']:10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the chip calculation engine')
+    parser.add_argument('--repeat', type=int, default=20, help='Calls per case when timing (default: 20)')
+    parser.add_argument('--seed', type=int, default=2024, help='Corpus seed (default: 2024)')
+    parser.add_argument('--function', action='append', choices=list(FUNCTIONS), dest='functions',
+                        help='Only run this function (repeatable)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Write this run to the baseline file')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if any metric regressed past its threshold')
+    parser.add_argument('--time-threshold', type=float, default=0.25,
+                        help='Allowed relative slowdown before --check fails (default: 0.25)')
+    parser.add_argument('--memory-threshold', type=float, default=0.10,
+                        help='Allowed relative peak-memory growth before --check fails (default: 0.10)')
+    parser.add_argument('--json', dest='json_out', help='Also write the report to this file')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(repeat=args.repeat, seed=args.seed, functions=args.functions)
+    print_report(report)
+
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[OK] Baseline saved to {args.baseline}")
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"\n[WARNING] No baseline at {args.baseline} - run with --save-baseline first")
+            return 1
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('seed') != report['seed']:
+            print(f"\n[WARNING] Baseline was recorded with seed {baseline.get('seed')}, not {report['seed']}")
+        regressions = compare_to_baseline(report, baseline, args.time_threshold, args.memory_threshold)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for message in regressions:
+                print(f"  - {message}")
+            return 1
+        print("\n[OK] No regressions against the baseline")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
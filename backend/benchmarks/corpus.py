@@ -0,0 +1,117 @@
+"""
+Scenario corpus for the engine benchmarks.
+
+Every case is a (function name, args, kwargs) triple. The corpus is built
+from a fixed seed so runs are comparable, and mixes:
+  - representative scenarios (typical home games, default inventory)
+  - every validator boundary (just inside and just outside each limit)
+  - adversarial inputs (huge counts, many denominations, worst-case repairs)
+"""
+
+import random
+from typing import Any, Dict, List, Tuple
+
+from chip_inventory import DEFAULT_CHIP_SET
+from chip_types import ChipInventory
+
+Case = Tuple[str, tuple, Dict[str, Any]]
+
+# Inventories from a small home set up to adversarially large ones
+SMALL_INVENTORY = {1: 100, 5: 100, 25: 50, 100: 50}
+LARGE_INVENTORY = {0.25: 2000, 1: 5000, 5: 5000, 25: 4000, 100: 4000, 500: 2000, 1000: 2000, 5000: 500}
+HUGE_COUNT_INVENTORY = {1: 10 ** 9, 5: 10 ** 9, 25: 10 ** 9, 100: 10 ** 9, 500: 10 ** 9, 1000: 10 ** 9}
+MANY_DENOMINATION_INVENTORY = {denom: 5000 for denom in
+                               (0.05, 0.1, 0.25, 0.5, 1, 2, 2.5, 5, 10, 20, 25, 50, 100, 200, 250,
+                                500, 1000, 2000, 2500, 5000, 10000, 25000, 50000, 100000)}
+
+# Converted once, like the API does when it loads or validates a chip set
+INVENTORIES = {name: ChipInventory.from_mapping(inventory) for name, inventory in (
+    ('default', DEFAULT_CHIP_SET),
+    ('small', SMALL_INVENTORY),
+    ('large', LARGE_INVENTORY),
+    ('huge_counts', HUGE_COUNT_INVENTORY),
+    ('many_denominations', MANY_DENOMINATION_INVENTORY),
+)}
+
+BLINDS = [(0.25, 0.5), (1, 2), (5, 10), (25, 50), (100, 200), (500, 1000)]
+
+# (num_players, small_blind, big_blind, duration_hours, minutes_per_level) on and around every limit
+AUTO_BOUNDARIES = [
+    (1, 1, 2, 4.0, 20), (100, 1, 2, 4.0, 20), (0, 1, 2, 4.0, 20), (101, 1, 2, 4.0, 20),
+    (8, 2, 2, 4.0, 20), (8, 3, 2, 4.0, 20), (8, 0, 2, 4.0, 20), (8, 1, 0, 4.0, 20),
+    (8, 1, 2, 24.0, 20), (8, 1, 2, 24.01, 20), (8, 1, 2, 0.0, 20),
+    (8, 1, 2, 4.0, 240), (8, 1, 2, 4.0, 241), (8, 1, 2, 4.0, 0),
+    (8, 1, 2, 1.0, 20), (8, 1, 2, 0.75, 20),       # 3 levels / 2 levels
+    (8, 1, 2, 20.0, 12), (8, 1, 2, 20.0, 11),      # 100 levels / 109 levels
+    (80, 25, 50, 4.0, 20), (80, 100, 200, 4.0, 20),  # around the 50 BB inventory limit
+    (8, 5000, 10000, 4.0, 20),                     # no usable denominations
+]
+
+
+def _auto_cases(rng: random.Random) -> List[Case]:
+    cases = []
+    for inventory in INVENTORIES.values():
+        for _ in range(60):
+            small_blind, big_blind = rng.choice(BLINDS)
+            args = (rng.randint(1, 100), float(small_blind), float(big_blind),
+                    rng.choice([2.0, 3.0, 4.0, 6.0, 8.0]), rng.choice([10, 15, 20, 30]))
+            cases.append(('calculate_chip_distribution', args, {'chip_set': inventory}))
+        for args in AUTO_BOUNDARIES:
+            cases.append(('calculate_chip_distribution', args, {'chip_set': inventory}))
+    return cases
+
+
+def _custom_cases(rng: random.Random) -> List[Case]:
+    cases = []
+    for inventory in INVENTORIES.values():
+        total_value = sum(denom * count for denom, count in inventory.items())
+        for _ in range(40):
+            num_players = rng.randint(1, 100)
+            small_blind, big_blind = rng.choice(BLINDS)
+            max_stack = total_value / num_players
+            target = rng.choice([big_blind * 100, max_stack * 0.5, max_stack * 1.19, max_stack * 1.21])
+            kwargs = {'chip_set': inventory, 'solver': rng.choice(['greedy', 'greedy', 'exact'])}
+            cases.append(('calculate_chip_distribution_custom',
+                          (num_players, float(small_blind), float(big_blind), float(target)), kwargs))
+    return cases
+
+
+def _rounding_cases(rng: random.Random) -> List[Case]:
+    cases = []
+    for count in list(range(0, 60)) + [rng.randint(60, 10 ** 6) for _ in range(40)]:
+        stack_size = rng.choice([1, 5, 10, 20])
+        cases.append(('round_to_stack', (count, stack_size), {}))
+        max_count = rng.choice([0, 3, 4, 5, count // 2, count, 10 ** 9])
+        cases.append(('round_to_stack_with_limit', (count, stack_size, max_count),
+                      {'allow_small': rng.random() < 0.3}))
+    return cases
+
+
+def _repair_cases(rng: random.Random) -> List[Case]:
+    # Every denomination over its limit - the worst case for the repair pass
+    cases = []
+    for size in (6, 100, 2000):
+        denoms = sorted(rng.sample(range(1, 10 ** 6), size))
+        inventory = [rng.randint(0, 10 ** 9) for _ in denoms]
+        num_players = rng.randint(2, 100)
+        distribution = [count // num_players + rng.randint(1, 50) for count in inventory]
+        # repair_shortages edits the distribution, so each call gets a fresh copy
+        cases.append(('repair_shortages', (distribution, denoms, inventory, num_players), {}))
+    return cases
+
+
+def build_corpus(seed: int = 2024) -> Dict[str, List[Case]]:
+    """
+    Build the benchmark corpus.
+
+    Args:
+        seed: Random seed (the same seed always gives the same corpus)
+
+    Returns:
+        Dictionary of function name -> list of cases
+    """
+    rng = random.Random(seed)
+    corpus: Dict[str, List[Case]] = {}
+    for case in _auto_cases(rng) + _custom_cases(rng) + _rounding_cases(rng) + _repair_cases(rng):
+        corpus.setdefault(case[0], []).append(case)
+    return corpus
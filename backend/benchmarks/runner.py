@@ -0,0 +1,182 @@
+"""
+Benchmark runner: latency percentiles, tracemalloc memory stats and
+baseline comparison.
+"""
+
+import gc
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import pokerchipcounter
+from benchmarks.corpus import Case, build_corpus
+
+# Functions the suite measures, by name
+FUNCTIONS: Dict[str, Callable] = {
+    'calculate_chip_distribution': pokerchipcounter.calculate_chip_distribution,
+    'calculate_chip_distribution_custom': pokerchipcounter.calculate_chip_distribution_custom,
+    'round_to_stack': pokerchipcounter.round_to_stack,
+    'round_to_stack_with_limit': pokerchipcounter.round_to_stack_with_limit,
+    'repair_shortages': pokerchipcounter.repair_shortages,
+}
+
+# Functions that edit their first argument get a fresh copy for every call
+_MUTATES_FIRST_ARG = {'repair_shortages'}
+
+# Metrics checked by the regression gate, and whether they are timings
+GATED_METRICS = (('p50_us', True), ('p90_us', True), ('peak_kib', False))
+
+# Differences smaller than these are measurement noise, never regressions
+TIME_NOISE_US = 0.5
+MEMORY_NOISE_KIB = 4.0
+
+
+def _call(name: str, case: Case) -> None:
+    func = FUNCTIONS[name]
+    _, args, kwargs = case
+    try:
+        func(*args, **kwargs)
+    except ValueError:
+        # Validator boundary cases are expected to raise; their cost counts too
+        pass
+
+
+def _fresh_args(name: str, case: Case) -> Case:
+    if name not in _MUTATES_FIRST_ARG:
+        return case
+    _, args, kwargs = case
+    return name, (list(args[0]),) + tuple(args[1:]), kwargs
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def time_function(name: str, cases: List[Case], repeat: int) -> Dict[str, float]:
+    """
+    Time every case of one function.
+
+    Each case runs `repeat` times and its mean is one sample, so the
+    percentiles describe how cost varies across the corpus (worst-case
+    blowups show up in p99 / max).
+    """
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for case in cases:
+            calls = [_fresh_args(name, case) for _ in range(repeat)]
+            start = time.perf_counter()
+            for call in calls:
+                _call(name, call)
+            samples.append((time.perf_counter() - start) / repeat * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    samples.sort()
+    return {
+        'calls': len(cases) * repeat,
+        'mean_us': sum(samples) / len(samples),
+        'p50_us': percentile(samples, 0.50),
+        'p90_us': percentile(samples, 0.90),
+        'p99_us': percentile(samples, 0.99),
+        'max_us': samples[-1],
+    }
+
+
+def measure_memory(name: str, cases: List[Case]) -> Dict[str, float]:
+    """
+    Run every case once under tracemalloc.
+
+    Returns peak traced memory above the starting point and memory still
+    held afterwards (caches, leaks), both in KiB.
+    """
+    calls = [_fresh_args(name, case) for case in cases]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for call in calls:
+            _call(name, call)
+        end_current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'peak_kib': (peak - start_current) / 1024,
+        'retained_kib': (end_current - start_current) / 1024,
+    }
+
+
+def run_benchmarks(repeat: int = 20, seed: int = 2024, functions: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Run the benchmark suite.
+
+    Args:
+        repeat: Calls per case when timing
+        seed: Corpus seed
+        functions: Names of the functions to run (default: all)
+
+    Returns:
+        Report dictionary (JSON-serializable)
+    """
+    corpus = build_corpus(seed)
+    results = {}
+    for name in functions or list(FUNCTIONS):
+        if name not in FUNCTIONS:
+            raise ValueError(f"Unknown benchmark function '{name}'. Choose from: {', '.join(FUNCTIONS)}")
+        cases = corpus.get(name, [])
+        # Warm up caches (compiled plans, blind schedules) so timings are steady-state
+        for case in cases:
+            _call(name, _fresh_args(name, case))
+        stats = time_function(name, cases, repeat)
+        stats.update(measure_memory(name, cases))
+        stats['cases'] = len(cases)
+        results[name] = stats
+
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeat': repeat,
+        'functions': results
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        time_threshold: float = 0.25, memory_threshold: float = 0.10) -> List[str]:
+    """
+    Find metrics that regressed past their threshold.
+
+    Args:
+        report: Output of run_benchmarks()
+        baseline: A previously saved report
+        time_threshold: Allowed relative slowdown (0.25 = 25%)
+        memory_threshold: Allowed relative growth of peak memory
+
+    Returns:
+        One message per regression (empty if none)
+    """
+    regressions = []
+    for name, stats in report['functions'].items():
+        base = baseline.get('functions', {}).get(name)
+        if base is None:
+            continue
+        for metric, is_time in GATED_METRICS:
+            old, new = base.get(metric), stats.get(metric)
+            if old is None or new is None:
+                continue
+            threshold = time_threshold if is_time else memory_threshold
+            noise = TIME_NOISE_US if is_time else MEMORY_NOISE_KIB
+            if new > old * (1 + threshold) and new - old > noise:
+                change = (new / old - 1) * 100 if old > 0 else float('inf')
+                regressions.append(f"{name} {metric}: {old:.2f} -> {new:.2f} (+{change:.0f}%, "
+                                   f"limit +{threshold * 100:.0f}%)")
+    return regressions
@@ -0,0 +1,177 @@
+"""
+Cold start benchmark: time from a fresh interpreter to the first calculation.
+
+Every run starts a new `python -X importtime` process that imports the API
+and answers one /api/calculate request through the Flask test client. The
+report shows the time to first calculation (median and worst of the runs),
+the slowest modules imported by app.py, and checks that the components kept
+out of startup (billing, NumPy) were not imported.
+
+Run from the backend directory:
+    python -m benchmarks.startup                  # 5 runs, report only
+    python -m benchmarks.startup --check          # exit 1 over budget or if a deferred module loads
+    python -m benchmarks.startup --budget-ms 300 --top 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold start budget: process start to first /api/calculate response, in milliseconds
+STARTUP_BUDGET_MS = float(os.environ.get('STARTUP_BUDGET_MS', '500'))
+
+# Modules that only specific endpoints need; none may load before the first calculation
+DEFERRED_MODULES = ('billing', 'requests', 'googleapiclient', 'google.oauth2', 'grid_engine', 'tournament_sim', 'numpy')
+
+# Runs in the child: import the app, answer one calculation, report what was loaded
+_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().post('/api/calculate', json={
+    'num_players': 12, 'small_blind': 25, 'big_blind': 50, 'duration_hours': 5, 'minutes_per_level': 15})
+done = time.perf_counter()
+print(json.dumps({
+    'status': response.status_code,
+    'import_ms': (imported - started) * 1000,
+    'first_calculation_ms': (done - imported) * 1000,
+    'loaded': [name for name in %r if name in sys.modules],
+}), flush=True)
+""" % (DEFERRED_MODULES,)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        (module, depth, self_us, cumulative_us) per imported module, in import order
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # One leading space, then two per nesting level
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        modules.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return modules
+
+
+def run_once() -> Dict[str, Any]:
+    """Start a fresh interpreter and time it up to the first calculation."""
+    env = dict(os.environ, STAGE_TIMING='0')
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', _CHILD], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    stdout, stderr = process.communicate()
+    # The wall time includes interpreter start and exit; the child's own numbers do not
+    wall_ms = (time.perf_counter() - started) * 1000
+    if process.returncode != 0:
+        raise RuntimeError(f'Startup run failed:\n{stderr[-2000:]}')
+    result = json.loads(stdout.strip().splitlines()[-1])
+    result['wall_ms'] = wall_ms
+    result['modules'] = parse_importtime(stderr)
+    return result
+
+
+def app_imports(modules: List[Tuple[str, int, int, int]]) -> List[Tuple[str, int]]:
+    """Modules imported directly by app.py with their cumulative time, slowest first."""
+    direct = []
+    inside_app = []
+    # -X importtime lists a module after everything it imported, so collect
+    # depth-1 modules until the "app" line closes the group
+    for name, depth, _, cumulative_us in modules:
+        if depth == 0:
+            if name == 'app':
+                direct = inside_app
+            inside_app = []
+        elif depth == 1:
+            inside_app.append((name, cumulative_us))
+    return sorted(direct, key=lambda item: -item[1])
+
+
+def run_startup_benchmark(runs: int = 5) -> Dict[str, Any]:
+    """
+    Measure cold start over several fresh interpreters.
+
+    Returns:
+        Report with per-run numbers, median/max time to first calculation, the
+        modules app.py imports (from the median run) and any deferred modules that loaded
+    """
+    results = [run_once() for _ in range(runs)]
+    totals = sorted(result['import_ms'] + result['first_calculation_ms'] for result in results)
+    median_run = sorted(results, key=lambda result: result['wall_ms'])[len(results) // 2]
+    return {
+        'python': sys.version.split()[0],
+        'runs': runs,
+        'median_ms': statistics.median(totals),
+        'max_ms': totals[-1],
+        'median_wall_ms': statistics.median(result['wall_ms'] for result in results),
+        'median_import_ms': statistics.median(result['import_ms'] for result in results),
+        'median_first_calculation_ms': statistics.median(result['first_calculation_ms'] for result in results),
+        'statuses': sorted({result['status'] for result in results}),
+        'deferred_loaded': sorted({name for result in results for name in result['loaded']}),
+        'app_imports': [{'module': name, 'cumulative_ms': us / 1000}
+                        for name, us in app_imports(median_run['modules'])],
+    }
+
+
+def print_report(report: Dict[str, Any], budget_ms: float, top: int) -> None:
+    print(f"Python {report['python']}, {report['runs']} cold starts")
+    print(f"  time to first calculation: median {report['median_ms']:.1f} ms, "
+          f"max {report['max_ms']:.1f} ms (budget {budget_ms:.0f} ms)")
+    print(f"    import app:              median {report['median_import_ms']:.1f} ms")
+    print(f"    first /api/calculate:    median {report['median_first_calculation_ms']:.1f} ms")
+    print(f"  process start to exit:     median {report['median_wall_ms']:.1f} ms")
+    print(f"\nSlowest imports of app.py (cumulative, -X importtime):")
+    for item in report['app_imports'][:top]:
+        print(f"  {item['cumulative_ms']:8.1f} ms  {item['module']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup',
+                                     description='Measure cold start time to the first calculation')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to start (default: 5)')
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help=f'Median time-to-first-calculation budget (default: {STARTUP_BUDGET_MS:.0f})')
+    parser.add_argument('--top', type=int, default=15, help='Imports to list (default: 15)')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit 1 if over budget or a deferred module was imported')
+    parser.add_argument('--json', dest='json_out', help='Also write the report to this file')
+    args = parser.parse_args(argv)
+
+    report = run_startup_benchmark(args.runs)
+    print_report(report, args.budget_ms, args.top)
+
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    problems = []
+    if report['statuses'] != [200]:
+        problems.append(f"first calculation answered with status {report['statuses']}")
+    if report['median_ms'] > args.budget_ms:
+        problems.append(f"median {report['median_ms']:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    if report['deferred_loaded']:
+        problems.append(f"imported at startup: {', '.join(report['deferred_loaded'])}")
+
+    if problems:
+        print("\nSTARTUP PROBLEMS:")
+        for message in problems:
+            print(f"  - {message}")
+        return 1 if args.check else 0
+    print("\n[OK] Cold start within budget, deferred modules not loaded")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
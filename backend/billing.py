@@ -0,0 +1,231 @@
+"""
+License and purchase verification (Gumroad license keys, Google Play purchases).
+
+Only the /api/verify-license and /api/verify-play-purchase endpoints need
+this module, so app.py imports it on first use: cold starts that only serve
+calculations never pay for requests, google-auth or the API client.
+"""
+
+import hashlib
+import os
+
+import requests
+
+from http_client import OUTBOUND
+from metrics import track_outbound
+from play_client import PLAY_CLIENT
+from result_cache import ResultCache
+
+# Gumroad API Configuration
+GUMROAD_ACCESS_TOKEN = os.environ.get('GUMROAD_ACCESS_TOKEN', 'mUfWqJt86a5f-A10TRmaQb92FvQkOwk8Y-LCsw3PpxO')
+# Point at a local stub (see gumroad_stub.py) for development
+GUMROAD_API_BASE = os.environ.get('GUMROAD_API_BASE', 'https://api.gumroad.com').rstrip('/')
+GUMROAD_PRODUCT_IDS = {
+    'entry': os.environ.get('GUMROAD_ENTRY_PRODUCT_ID', 'FCZgbXwUtCUZICnWigdugA=='),
+    'premium': os.environ.get('GUMROAD_PREMIUM_PRODUCT_ID', '7IdKPVIR9R6Fre-xhUzXJQ==')
+}
+
+# License verification cache: valid licenses are remembered for LICENSE_CACHE_TTL
+# seconds, rejected ones for the shorter LICENSE_NEGATIVE_CACHE_TTL (so a key
+# that was just bought starts working quickly). Network errors are never cached.
+LICENSE_CACHE_TTL = float(os.environ.get('LICENSE_CACHE_TTL', '21600'))
+LICENSE_NEGATIVE_CACHE_TTL = float(os.environ.get('LICENSE_NEGATIVE_CACHE_TTL', '60'))
+LICENSE_CACHE = ResultCache(
+    max_size=int(os.environ.get('LICENSE_CACHE_SIZE', '4096')),
+    ttl=LICENSE_CACHE_TTL
+)
+
+# Google Play Billing Configuration (credentials: GOOGLE_PLAY_CREDENTIALS, see play_client.py)
+PLAY_PACKAGE_NAME = 'com.onrender.poker_chip_calculator.twa'
+
+# Owner test keys - personal use only
+TEST_LICENSE_KEYS = {
+    'Pizzaman26!': 'premium'
+}
+
+
+def license_cache_key(license_key, product_tier):
+    """Cache key for a license check (the key itself is hashed, not stored)."""
+    return (hashlib.sha256(str(license_key).encode('utf-8')).hexdigest(), product_tier)
+
+
+def license_calls_saved():
+    """Gumroad calls avoided so far: cache hits plus lookups that waited on another request's call."""
+    stats = LICENSE_CACHE.stats()
+    return stats['hits'] + stats['coalesced']
+
+
+def license_cache_stats():
+    """License cache statistics for /api/health."""
+    return dict(LICENSE_CACHE.stats(), upstream_calls_saved=license_calls_saved())
+
+
+def license_cache_ttl(result):
+    """How long to remember a verification result."""
+    return LICENSE_CACHE_TTL if result.get('valid') else LICENSE_NEGATIVE_CACHE_TTL
+
+
+def verify_gumroad_license(license_key, product_tier):
+    """
+    Ask Gumroad whether a license key is valid for a product tier.
+
+    Returns:
+        The /api/verify-license response body
+
+    Raises:
+        requests.exceptions.RequestException: If Gumroad could not be reached
+    """
+    # Get the actual Gumroad product ID
+    gumroad_product_id = GUMROAD_PRODUCT_IDS[product_tier]
+
+    # Call Gumroad License Verification API
+    # Documentation: https://gumroad.com/api#license-key-verification
+    api_url = f"{GUMROAD_API_BASE}/v2/licenses/verify"
+
+    payload = {
+        'product_id': gumroad_product_id,
+        'license_key': license_key,
+        'increment_uses_count': 'false'  # Don't count this as a "use"
+    }
+
+    headers = {
+        'Authorization': f'Bearer {GUMROAD_ACCESS_TOKEN}'
+    }
+
+    with track_outbound('gumroad'):
+        # Pooled keep-alive session with per-host timeouts and retries (http_client.py)
+        response = OUTBOUND.post(api_url, data=payload, headers=headers)
+        if response.status_code >= 500:
+            # Gumroad is having trouble (even after retries): report an error, don't cache a rejection
+            response.raise_for_status()
+        gumroad_data = response.json()
+
+    # Check if the license is valid
+    if gumroad_data.get('success') and gumroad_data.get('purchase'):
+        purchase_info = gumroad_data['purchase']
+
+        return {
+            'success': True,
+            'valid': True,
+            'product_tier': product_tier,
+            'purchase_email': purchase_info.get('email'),
+            'purchase_date': purchase_info.get('created_at'),
+            'product_name': purchase_info.get('product_name')
+        }
+    else:
+        # License is invalid
+        return {
+            'success': True,
+            'valid': False,
+            'error': gumroad_data.get('message', 'Invalid license key')
+        }
+
+
+def check_license(license_key, product_tier):
+    """
+    Check a license key for one product tier (owner test keys, then the cache / Gumroad).
+
+    Raises:
+        requests.exceptions.RequestException: If Gumroad could not be reached
+    """
+    # Owner test keys
+    if license_key in TEST_LICENSE_KEYS:
+        test_tier = TEST_LICENSE_KEYS[license_key]
+        if test_tier == product_tier or (test_tier == 'premium' and product_tier == 'entry'):
+            return {
+                'success': True,
+                'valid': True,
+                'product_tier': product_tier,
+                'purchase_email': 'tester@test.com',
+                'purchase_date': '2026-01-14',
+                'product_name': f'Test {product_tier.title()} License'
+            }
+
+    # Repeated checks of the same key are answered from the cache, and
+    # concurrent checks share one Gumroad call
+    return LICENSE_CACHE.get_or_compute(
+        license_cache_key(license_key, product_tier),
+        lambda: verify_gumroad_license(license_key, product_tier),
+        ttl=license_cache_ttl
+    )
+
+
+def check_license_tiers(license_key, product_tiers):
+    """
+    Check a license key for several product tiers at the same time.
+
+    Returns:
+        {"success": true, "product_tier": <best valid tier or None>, "results": {tier: result}}
+    """
+    outcomes = OUTBOUND.run_concurrently({
+        tier: (lambda tier=tier: check_license(license_key, tier)) for tier in dict.fromkeys(product_tiers)
+    })
+    results = {}
+    for tier, outcome in outcomes.items():
+        results[tier] = license_error(outcome)[0] if isinstance(outcome, Exception) else outcome
+    # GUMROAD_PRODUCT_IDS lists tiers from lowest to highest
+    valid_tiers = [tier for tier in GUMROAD_PRODUCT_IDS if results.get(tier, {}).get('valid')]
+    return {
+        'success': True,
+        'product_tier': valid_tiers[-1] if valid_tiers else None,
+        'results': results
+    }
+
+
+def license_error(error):
+    """Response body and status code for a failed Gumroad call."""
+    if isinstance(error, requests.exceptions.Timeout):
+        return {'success': False, 'error': 'Gumroad API request timed out. Please try again.'}, 504
+    if isinstance(error, requests.exceptions.RequestException):
+        return {'success': False, 'error': f'Network error: {str(error)}'}, 500
+    return {'success': False, 'error': f'Unexpected error: {str(error)}'}, 500
+
+
+def verify_play_purchase(purchase_token, product_id):
+    """
+    Verify (and acknowledge) a Google Play in-app purchase.
+
+    Returns:
+        (body, status) for /api/verify-play-purchase
+
+    Raises:
+        Exception: If the Play Developer API call failed
+    """
+    # Shared client: built once, token refreshed only when it expires
+    service = PLAY_CLIENT.get()
+    if not service:
+        return {
+            'success': False,
+            'error': 'Google Play verification not configured'
+        }, 500
+
+    with track_outbound('google_play'):
+        result = service.purchases().products().get(
+            packageName=PLAY_PACKAGE_NAME,
+            productId=product_id,
+            token=purchase_token
+        ).execute()
+
+    # purchaseState: 0 = purchased, 1 = canceled, 2 = pending
+    if result.get('purchaseState') == 0:
+        # Acknowledge the purchase if not already acknowledged
+        if result.get('acknowledgementState') == 0:
+            with track_outbound('google_play'):
+                service.purchases().products().acknowledge(
+                    packageName=PLAY_PACKAGE_NAME,
+                    productId=product_id,
+                    token=purchase_token
+                ).execute()
+
+        tier = 'premium' if product_id == 'premium_tier' else 'entry'
+        return {
+            'success': True,
+            'valid': True,
+            'product_tier': tier
+        }, 200
+    else:
+        return {
+            'success': True,
+            'valid': False,
+            'error': 'Purchase not valid'
+        }, 200
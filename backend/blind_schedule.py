@@ -0,0 +1,115 @@
+"""
+Blind schedule generator.
+
+Blinds grow geometrically: the big blind at level k is
+big_blind * multiplier ** (k - 1). Level 1 is always the requested blinds;
+later levels are rounded to amounts the usable chip denominations can
+actually make, working in integer minor units (see chip_types.py) so the
+rounded blinds are exact cents. Every level keeps the starting
+small:big blind ratio exactly: the big blind is rounded to a multiple of
+the ratio's smallest whole-unit pair (50/100 for 1:2 blinds in 25s) and the
+small blind is derived from it. Schedules are memoized per
+(small_blind, big_blind, multiplier, levels, denominations), so Mode 1 and the
+/api/blind-schedule endpoint share the same cache.
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from chip_types import MINOR_UNITS
+
+# Blinds multiply by this much every level
+BLIND_MULTIPLIER = 1.5
+
+
+def big_blind_at_level(big_blind: float, level: int, multiplier: float = BLIND_MULTIPLIER) -> float:
+    """Get the exact (unrounded) big blind at a level (level 1 = starting blinds)."""
+    return big_blind * multiplier ** (level - 1)
+
+
+def blind_unit(denominations: Sequence[float]) -> int:
+    """
+    Get the smallest blind increment the denominations can make, in minor units.
+
+    Every amount that can be paid in these chips is a multiple of the
+    greatest common divisor of the denominations.
+    """
+    unit = 0
+    for denom in denominations:
+        unit = math.gcd(unit, round(denom * MINOR_UNITS))
+    return unit
+
+
+def round_blind(amount: float, unit: int) -> int:
+    """
+    Round a blind to the nearest payable amount (never below one unit).
+
+    Args:
+        amount: Exact blind in minor units
+        unit: Blind increment in minor units (0 rounds to whole minor units)
+
+    Returns:
+        Rounded blind in minor units
+    """
+    if unit <= 0:
+        return round(amount)
+    return max(1, round(amount / unit)) * unit
+
+
+@lru_cache(maxsize=1024)
+def level_blinds(small_blind: float, big_blind: float, multiplier: float, levels: int,
+                 denominations: Tuple[float, ...]) -> Tuple[Tuple[float, float], ...]:
+    """
+    Compute the rounded (small_blind, big_blind) for every level.
+
+    Args:
+        small_blind: Starting small blind
+        big_blind: Starting big blind
+        multiplier: Growth factor per level
+        levels: Number of levels
+        denominations: Usable chip denominations (rounding follows their common unit)
+
+    Returns:
+        Tuple of (small_blind, big_blind) pairs, level 1 first (the requested blinds)
+    """
+    unit = blind_unit(denominations) or 1
+    # Reduce the starting blinds to their smallest ratio (e.g. 50/100 -> 1:2);
+    # each level is a whole multiple of that ratio in blind units
+    sb_units, bb_units = round(small_blind * MINOR_UNITS), round(big_blind * MINOR_UNITS)
+    divisor = math.gcd(sb_units, bb_units) or 1
+    sb_step, bb_step = sb_units // divisor * unit, bb_units // divisor * unit
+    blinds = [(small_blind, big_blind)] if levels >= 1 else []
+    for level in range(2, levels + 1):
+        exact_bb = big_blind_at_level(big_blind, level, multiplier) * MINOR_UNITS
+        steps = round_blind(exact_bb, bb_step) // bb_step
+        blinds.append((steps * sb_step / MINOR_UNITS, steps * bb_step / MINOR_UNITS))
+    return tuple(blinds)
+
+
+def build_blind_schedule(small_blind: float, big_blind: float, levels: int, denominations: Sequence[float],
+                         stack_value: Optional[float] = None,
+                         multiplier: float = BLIND_MULTIPLIER) -> List[Dict[str, Any]]:
+    """
+    Build the full blind schedule.
+
+    Args:
+        small_blind: Starting small blind
+        big_blind: Starting big blind
+        levels: Number of levels
+        denominations: Usable chip denominations
+        stack_value: Starting stack per player; adds each level's depth in big blinds
+        multiplier: Growth factor per level
+
+    Returns:
+        List of {'level', 'small_blind', 'big_blind'[, 'stack_big_blinds']} dictionaries
+    """
+    blinds = level_blinds(float(small_blind), float(big_blind), float(multiplier), int(levels),
+                          tuple(sorted(float(d) for d in denominations)))
+    schedule = []
+    for level, (level_sb, level_bb) in enumerate(blinds, start=1):
+        entry = {'level': level, 'small_blind': level_sb, 'big_blind': level_bb}
+        if stack_value is not None:
+            entry['stack_big_blinds'] = round(stack_value / level_bb, 1)
+        schedule.append(entry)
+    return schedule
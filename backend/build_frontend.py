@@ -0,0 +1,192 @@
+"""
+Frontend build: content-hashed assets and a generated service worker.
+
+Copies frontend/ to frontend/dist/ with every static asset (images, CSS,
+JS) renamed to include a hash of its contents (styles.css ->
+styles.1a2b3c4d5e.css) and every reference to it rewritten. A changed file
+gets a new URL, so the server can tell browsers to cache hashed files
+forever (see app.py) while index.html is revalidated on each visit.
+
+Pages (*.html), manifest.json and service-worker.js keep their names. The
+service worker's CACHE_NAME and precache list are generated from the build,
+so they no longer need to be edited by hand.
+
+Usage (from the backend directory, before starting the server):
+    python build_frontend.py [--src ../frontend] [--out ../frontend/dist]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from typing import Dict, List, Set
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend')
+DIST_DIRNAME = 'dist'
+
+# Written to the build output: original path -> hashed path
+ASSET_MANIFEST = 'asset-manifest.json'
+
+# Files renamed by content hash; text ones have their own references rewritten first
+HASHED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.woff', '.woff2', '.css', '.js'}
+TEXT_EXTENSIONS = {'.html', '.css', '.js', '.json'}
+
+# Served at a fixed URL (browsers look for it there), never hashed
+SERVICE_WORKER = 'service-worker.js'
+
+# Entry points whose references make up the service worker's precache list
+PRECACHE_ENTRIES = ('index.html', 'manifest.json')
+
+# Hex digits of the content hash kept in file names
+HASH_LENGTH = 10
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(path: str, data: bytes) -> str:
+    """assets/chip.png -> assets/chip.<hash>.png"""
+    stem, ext = os.path.splitext(path)
+    return f'{stem}.{content_hash(data)}{ext}'
+
+
+def list_files(src: str, exclude: str) -> List[str]:
+    """Every file under src as a /-separated relative path, skipping the exclude directory."""
+    paths = []
+    for root, dirs, files in os.walk(src):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != exclude and not d.startswith('.'))
+        for name in sorted(files):
+            if not name.startswith('.'):
+                paths.append(os.path.relpath(os.path.join(root, name), src).replace(os.sep, '/'))
+    return paths
+
+
+def reference_pattern(paths: List[str]) -> re.Pattern:
+    """
+    Match absolute references to any of the paths inside quotes or url(...),
+    with an optional cache-busting query (/styles.css?v=2.4).
+    """
+    alternation = '|'.join(re.escape(path) for path in sorted(paths, key=len, reverse=True))
+    return re.compile(r'(?<=["\'(])/(' + alternation + r')(?:\?[^"\')\s]*)?(?=["\')])')
+
+
+def rewrite_references(text: str, pattern: re.Pattern, renamed: Dict[str, str], found: Set[str]) -> str:
+    """Point references at the hashed files, collecting the originals referenced."""
+    def replace(match):
+        path = match.group(1)
+        if path not in renamed:
+            return match.group(0)
+        found.add(path)
+        return '/' + renamed[path]
+    return pattern.sub(replace, text)
+
+
+def generate_service_worker(source: str, cache_name: str, precache: List[str]) -> str:
+    """Replace the hand-written CACHE_NAME and urlsToCache in the service worker source."""
+    urls = ',\n'.join(f"  '{url}'" for url in precache)
+    source, names = re.subn(r"const CACHE_NAME = '[^']*';", f"const CACHE_NAME = '{cache_name}';", source)
+    source, lists = re.subn(r'const urlsToCache = \[[^\]]*\];', f'const urlsToCache = [\n{urls}\n];', source)
+    if names != 1 or lists != 1:
+        raise ValueError(f'{SERVICE_WORKER} must define CACHE_NAME and urlsToCache once each')
+    return source
+
+
+def build_frontend(src: str = FRONTEND_DIR, out: str = None) -> Dict[str, str]:
+    """
+    Build the hashed copy of the frontend.
+
+    Args:
+        src: Frontend source directory
+        out: Output directory (default: <src>/dist); replaced as a whole
+
+    Returns:
+        Original path -> hashed path for every renamed file
+    """
+    src = os.path.abspath(src)
+    out = os.path.abspath(out or os.path.join(src, DIST_DIRNAME))
+    files = list_files(src, exclude=out)
+
+    def read(path):
+        with open(os.path.join(src, path), 'rb') as f:
+            return f.read()
+
+    hashable = [path for path in files
+                if os.path.splitext(path)[1] in HASHED_EXTENSIONS and path != SERVICE_WORKER]
+    pattern = reference_pattern(hashable)
+
+    # Binary assets first, then stylesheets (which reference images), then scripts
+    order = {'.css': 1, '.js': 2}
+    renamed: Dict[str, str] = {}
+    references: Dict[str, Set[str]] = {}
+    output: Dict[str, bytes] = {}
+    for path in sorted(hashable, key=lambda p: order.get(os.path.splitext(p)[1], 0)):
+        data = read(path)
+        if os.path.splitext(path)[1] in TEXT_EXTENSIONS:
+            found = references.setdefault(path, set())
+            data = rewrite_references(data.decode('utf-8'), pattern, renamed, found).encode('utf-8')
+        renamed[path] = hashed_name(path, data)
+        output[renamed[path]] = data
+
+    # Pages and other files keep their names; text ones get their references rewritten
+    for path in files:
+        if path in renamed or path == SERVICE_WORKER:
+            continue
+        data = read(path)
+        if os.path.splitext(path)[1] in TEXT_EXTENSIONS:
+            found = references.setdefault(path, set())
+            data = rewrite_references(data.decode('utf-8'), pattern, renamed, found).encode('utf-8')
+        output[path] = data
+
+    # Precache the entry points and everything they reach (stylesheets pull in their images)
+    reachable: Set[str] = set()
+    pending = list(PRECACHE_ENTRIES)
+    while pending:
+        path = pending.pop()
+        for referenced in references.get(path, ()):
+            if referenced not in reachable:
+                reachable.add(referenced)
+                pending.append(referenced)
+    precache = ['/', '/index.html', '/manifest.json'] + sorted('/' + renamed[path] for path in reachable)
+
+    # The cache name changes whenever any output file does
+    digest = hashlib.sha256()
+    for name in sorted(output):
+        digest.update(name.encode('utf-8') + b'\0' + output[name])
+    build_id = digest.hexdigest()[:HASH_LENGTH]
+    if SERVICE_WORKER in files:
+        worker = generate_service_worker(read(SERVICE_WORKER).decode('utf-8'), f'poker-calc-{build_id}', precache)
+        output[SERVICE_WORKER] = worker.encode('utf-8')
+    output[ASSET_MANIFEST] = json.dumps(renamed, indent=2, sort_keys=True).encode('utf-8')
+
+    # Write next to the old build, then swap it in
+    staging = out + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    for name, data in output.items():
+        path = os.path.join(staging, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+    shutil.rmtree(out, ignore_errors=True)
+    os.replace(staging, out)
+    return renamed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Build the content-hashed frontend')
+    parser.add_argument('--src', default=FRONTEND_DIR, help='Frontend source directory')
+    parser.add_argument('--out', help='Output directory (default: <src>/dist)')
+    args = parser.parse_args(argv)
+
+    renamed = build_frontend(args.src, args.out)
+    out = os.path.abspath(args.out or os.path.join(args.src, DIST_DIRNAME))
+    print(f"[OK] Frontend built in {out}")
+    print(f"   {len(renamed)} hashed assets, service worker and {ASSET_MANIFEST} generated")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Chip inventory loading for the Poker Chip Calculator.
+
+Parses the "poker chip set counts.txt" file and keeps a cached copy of the
+parsed inventory (an immutable ChipInventory, see chip_types.py) in memory. The cache is refreshed only when the file's
+modification time changes, so calculations never touch the disk or block
+on stdin in server mode.
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from typing import Any, Iterable, Mapping, Optional, Tuple
+
+from chip_types import ChipInventory, to_minor_units
+
+# Default location of the chip set file (next to this module), overridable
+# with the CHIP_SET_FILE environment variable
+CHIP_SET_FILE = os.environ.get(
+    'CHIP_SET_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'poker chip set counts.txt')
+)
+
+# Fallback inventory used when no valid chip set file is available
+DEFAULT_CHIP_SET = ChipInventory.from_mapping({1: 300, 5: 200, 25: 200, 100: 200, 500: 50, 1000: 50})
+
+# Minimum seconds between mtime checks of the chip set file
+INVENTORY_CHECK_INTERVAL = float(os.environ.get('CHIP_SET_CHECK_INTERVAL', '1.0'))
+
+
+def _check_chip_entry(count: int, denom: float, where: str) -> None:
+    """Raise ValueError if a single (count, denomination) entry is out of range."""
+    if count <= 0:
+        raise ValueError(f"{where}: Chip count must be positive (got {count})")
+    if count > 100000:
+        raise ValueError(f"{where}: Chip count too large (got {count}, max 100,000)")
+    if math.isnan(denom) or math.isinf(denom):
+        raise ValueError(f"{where}: Invalid denomination value")
+    if denom <= 0:
+        raise ValueError(f"{where}: Denomination must be positive (got {denom})")
+    if denom > 1000000:
+        raise ValueError(f"{where}: Denomination too large (got {denom}, max 1,000,000)")
+    try:
+        to_minor_units(denom)
+    except ValueError:
+        raise ValueError(f"{where}: Denomination must be a whole number of cents (got {denom})")
+
+
+def _check_denomination_count(chip_set: Mapping[float, int]) -> None:
+    if len(chip_set) < 2:
+        raise ValueError(f"Chip set has only {len(chip_set)} denomination(s). "
+                         f"You need at least 2 different denominations for a good tournament")
+
+
+def _parse_denomination(denom_str: str) -> float:
+    # Handle denomination with or without $ sign
+    denom_str = denom_str.strip()
+    if denom_str.startswith("$"):
+        denom_str = denom_str[1:]
+    return float(denom_str)
+
+
+def parse_chip_set_lines(lines: Iterable[str]) -> ChipInventory:
+    """
+    Parse chip set file contents ("<count> $<denomination>" per line).
+
+    Args:
+        lines: Lines of the chip set file
+
+    Returns:
+        ChipInventory mapping chip denominations to quantities
+
+    Raises:
+        ValueError: If a line is invalid or fewer than 2 denominations are found
+    """
+    chip_set = {}
+    line_num = 0
+    for line in lines:
+        line_num += 1
+        line = line.strip()
+
+        # Skip empty lines and comments
+        if not line or line.startswith("#"):
+            continue
+
+        parts = line.split()
+        if len(parts) >= 2:
+            count = int(parts[0])
+            denom = _parse_denomination(parts[1])
+            _check_chip_entry(count, denom, f"Line {line_num}")
+            chip_set[denom] = count
+
+    _check_denomination_count(chip_set)
+    return ChipInventory.from_mapping(chip_set)
+
+
+def validate_chip_set(chip_set: Any) -> ChipInventory:
+    """
+    Validate a chip set supplied by a caller (e.g. the "chip_set" field of an API request).
+
+    Denominations with a count of 0 (e.g. an empty row in a chip set editor)
+    are left out; at least 2 denominations must remain.
+
+    Args:
+        chip_set: Mapping of denominations (numbers or strings like "25" / "$25") to counts
+
+    Returns:
+        ChipInventory mapping the denominations to integer quantities
+
+    Raises:
+        ValueError: If the chip set is malformed or out of range
+    """
+    if not isinstance(chip_set, Mapping):
+        raise ValueError("chip_set must be an object mapping denominations to chip counts")
+
+    validated = {}
+    empty = set()
+    for denom_key, count_value in chip_set.items():
+        try:
+            denom = _parse_denomination(denom_key) if isinstance(denom_key, str) else float(denom_key)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid chip denomination: {denom_key!r}")
+        if isinstance(count_value, bool) or not isinstance(count_value, (int, float, str)):
+            raise ValueError(f"Invalid chip count for ${denom_key}: {count_value!r}")
+        try:
+            count = int(count_value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid chip count for ${denom_key}: {count_value!r}")
+        if count != float(count_value):
+            raise ValueError(f"Chip count for ${denom_key} must be a whole number")
+        if denom in validated or denom in empty:
+            raise ValueError(f"Duplicate chip denomination: ${denom_key}")
+        if count == 0:
+            # Not in the set; the denomination itself must still be valid
+            _check_chip_entry(1, denom, f"Denomination ${denom_key}")
+            empty.add(denom)
+            continue
+        _check_chip_entry(count, denom, f"Denomination ${denom_key}")
+        validated[denom] = count
+
+    _check_denomination_count(validated)
+    return ChipInventory.from_mapping(validated)
+
+
+def chip_set_fingerprint(chip_set: Mapping[float, int]) -> str:
+    """
+    Get a stable fingerprint of a chip inventory, for use in cache keys.
+
+    Args:
+        chip_set: Mapping of chip denominations to quantities
+
+    Returns:
+        Short hex digest that is identical for equal inventories
+    """
+    canonical = ";".join(f"{float(denom)!r}x{int(count)}" for denom, count in sorted(chip_set.items()))
+    return hashlib.sha1(canonical.encode("ascii")).hexdigest()[:16]
+
+
+def read_chip_set_file(path: str = CHIP_SET_FILE) -> ChipInventory:
+    """
+    Read and parse a chip set file without any prompting.
+
+    Args:
+        path: Path to the chip set file
+
+    Returns:
+        ChipInventory mapping chip denominations to quantities
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file contents are invalid
+    """
+    with open(path, "r") as f:
+        return parse_chip_set_lines(f)
+
+
+class InventoryStore:
+    """
+    Cached, hot-reloadable chip inventory.
+
+    The parsed inventory is held as an immutable (mtime, ChipInventory) snapshot that
+    is swapped in atomically, so readers never see a half-loaded chip set.
+    The file is re-read only when its mtime changes; if it becomes missing or
+    invalid, the last good inventory (or DEFAULT_CHIP_SET) keeps being served.
+    """
+
+    def __init__(self, path: str = CHIP_SET_FILE, default: Optional[Mapping[float, int]] = None,
+                 check_interval: float = INVENTORY_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.reload_count = 0
+        self.last_error: Optional[str] = None
+        self._default = ChipInventory.from_mapping(default or DEFAULT_CHIP_SET)
+        self._snapshot: Optional[Tuple[Optional[float], ChipInventory]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, force: bool = False) -> ChipInventory:
+        """
+        Get the current inventory, reloading it if the file changed.
+
+        Args:
+            force: Check the file now instead of waiting for the check interval
+
+        Returns:
+            Immutable ChipInventory mapping chip denominations to quantities
+        """
+        snapshot = self._snapshot
+        if not force and snapshot is not None and time.monotonic() < self._next_check:
+            return snapshot[1]
+        return self._refresh(force)
+
+    def replace(self, chip_set: Mapping[float, int]) -> None:
+        """Swap in an inventory that was loaded elsewhere (e.g. entered interactively)."""
+        with self._lock:
+            self._snapshot = (self._file_mtime(), ChipInventory.from_mapping(chip_set))
+            self._next_check = time.monotonic() + self.check_interval
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _refresh(self, force: bool = False) -> ChipInventory:
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            snapshot = self._snapshot
+            now = time.monotonic()
+            if not force and snapshot is not None and now < self._next_check:
+                return snapshot[1]
+            self._next_check = now + self.check_interval
+
+            mtime = self._file_mtime()
+            if snapshot is not None and mtime == snapshot[0]:
+                return snapshot[1]
+
+            chips = snapshot[1] if snapshot is not None else self._default
+            if mtime is None:
+                self.last_error = f"No chip set file found ({self.path})"
+            else:
+                try:
+                    chips = read_chip_set_file(self.path)
+                    self.last_error = None
+                    self.reload_count += 1
+                except (OSError, ValueError) as e:
+                    self.last_error = f"Could not load chip set from {self.path}: {e}"
+
+            if self.last_error:
+                print(f"[WARNING] {self.last_error} - using {'previous' if snapshot else 'default'} chip set")
+
+            self._snapshot = (mtime, chips)
+            return chips
+
+
+# Process-wide inventory shared by the calculator and the API
+INVENTORY_STORE = InventoryStore()
+
+
+def get_chip_inventory() -> ChipInventory:
+    """Get the current process-wide chip inventory."""
+    return INVENTORY_STORE.get()
@@ -0,0 +1,197 @@
+"""
+Immutable chip inventory and distribution types.
+
+Denominations are stored as integer minor units (cents), so stack values are
+exact: forty 0.25 chips are worth exactly 1000 cents, with no float drift
+over many allocation steps. Each type keeps its denominations and counts in
+two parallel int64 columns, sorted by denomination, inside __slots__ objects.
+They are:
+- hashable, so they can be used directly as cache keys
+- cheap to pickle to worker processes (two byte strings)
+- safe to share between threads and cached results
+
+Both also act as read-only mappings from the denomination value to the chip
+count ({25: 15, 0.25: 40}). Whole-dollar values are ints and fractional ones
+are floats, so existing dict-based code and the JSON encoders keep working.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+# Integer units per dollar; every denomination must be a whole number of these
+MINOR_UNITS = 100
+
+Denomination = Union[int, float]
+
+
+def to_minor_units(value: float) -> int:
+    """
+    Convert a denomination or amount to integer minor units.
+
+    Raises:
+        ValueError: If the value is not a whole number of cents
+    """
+    units = round(value * MINOR_UNITS)
+    if abs(value * MINOR_UNITS - units) > 1e-6:
+        raise ValueError(f"{value} is not a whole number of cents")
+    return units
+
+
+def from_minor_units(units: int) -> Denomination:
+    """Convert minor units back to a value: an int for whole dollars, otherwise a float."""
+    if units % MINOR_UNITS == 0:
+        return units // MINOR_UNITS
+    return units / MINOR_UNITS
+
+
+def _column(values: Iterable[int]) -> memoryview:
+    # Read-only int64 view over an immutable bytes buffer
+    return memoryview(array('q', values).tobytes()).cast('q')
+
+
+class _DenominationColumns(Mapping):
+    """Shared storage and mapping behaviour of ChipInventory and Distribution."""
+
+    __slots__ = ('units', 'counts')
+
+    def __init__(self, units: Iterable[int], counts: Iterable[int]):
+        """
+        Args:
+            units: Denominations in minor units, strictly ascending
+            counts: Chip count for each denomination
+        """
+        self._set_columns(_column(units), _column(counts))
+        if len(self.units) != len(self.counts):
+            raise ValueError("Denominations and counts must have the same length")
+
+    def _set_columns(self, units: memoryview, counts: memoryview) -> None:
+        object.__setattr__(self, 'units', units)
+        object.__setattr__(self, 'counts', counts)
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[Denomination, int]):
+        """
+        Build from a {denomination: count} mapping (returned as is if it already has this type).
+
+        Raises:
+            ValueError: If a denomination is not a whole number of cents or appears twice
+        """
+        if type(mapping) is cls:
+            return mapping
+        columns = {}
+        for denom, count in mapping.items():
+            units = to_minor_units(denom)
+            if units in columns:
+                raise ValueError(f"Duplicate chip denomination: {denom}")
+            columns[units] = int(count)
+        ordered = sorted(columns)
+        return cls(ordered, [columns[units] for units in ordered])
+
+    @classmethod
+    def from_columns(cls, units: Iterable[int], counts: Iterable[int]):
+        """Build from ascending minor-unit denominations and their counts, dropping zero counts."""
+        pairs = [(denom, count) for denom, count in zip(units, counts) if count]
+        return cls([denom for denom, _ in pairs], [count for _, count in pairs])
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        # Pickles as the two raw column buffers
+        return _unpickle, (type(self), self.units.obj, self.counts.obj)
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def __iter__(self) -> Iterator[Denomination]:
+        return map(from_minor_units, self.units)
+
+    def __getitem__(self, denom: Denomination) -> int:
+        try:
+            return self.count_of(to_minor_units(denom))
+        except (TypeError, ValueError):
+            raise KeyError(denom) from None
+
+    def count_of(self, units: int) -> int:
+        """
+        Get the chip count of a denomination given in minor units.
+
+        Raises:
+            KeyError: If the denomination is not present
+        """
+        index = bisect_left(self.units, units)
+        if index == len(self.units) or self.units[index] != units:
+            raise KeyError(from_minor_units(units))
+        return self.counts[index]
+
+    def keys(self) -> List[Denomination]:
+        return list(self)
+
+    def values(self) -> List[int]:
+        return self.counts.tolist()
+
+    def items(self) -> List[Tuple[Denomination, int]]:
+        return list(zip(self, self.counts))
+
+    def to_dict(self) -> Dict[Denomination, int]:
+        """Plain {denomination: count} dictionary, in ascending denomination order."""
+        return dict(zip(self, self.counts))
+
+    @property
+    def total_units(self) -> int:
+        """Total value of all chips, in minor units."""
+        return sum(denom * count for denom, count in zip(self.units, self.counts))
+
+    @property
+    def value(self) -> Denomination:
+        """Total value of all chips."""
+        return from_minor_units(self.total_units)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, _DenominationColumns):
+            return self.units == other.units and self.counts == other.counts
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self) -> int:
+        # bytes objects cache their own hash
+        return hash((self.units.obj, self.counts.obj))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _unpickle(cls, units: bytes, counts: bytes):
+    columns = cls.__new__(cls)
+    columns._set_columns(memoryview(units).cast('q'), memoryview(counts).cast('q'))
+    return columns
+
+
+class ChipInventory(_DenominationColumns):
+    """
+    A chip set: how many chips of each denomination are available.
+
+    Inventories are long-lived (one per chip set file or request), so the
+    denomination values and the total value are computed once, up front.
+    """
+
+    __slots__ = ('denominations', '_total_units')
+
+    def _set_columns(self, units: memoryview, counts: memoryview) -> None:
+        super()._set_columns(units, counts)
+        object.__setattr__(self, 'denominations', tuple(map(from_minor_units, units)))
+        object.__setattr__(self, '_total_units', sum(denom * count for denom, count in zip(units, counts)))
+
+    @property
+    def total_units(self) -> int:
+        return self._total_units
+
+    def __iter__(self) -> Iterator[Denomination]:
+        return iter(self.denominations)
+
+
+class Distribution(_DenominationColumns):
+    """Chips handed to each player, per denomination (only denominations actually used)."""
+
+    __slots__ = ()
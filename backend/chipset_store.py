@@ -0,0 +1,401 @@
+"""
+Server-side chip set storage.
+
+Users' chip sets are kept in an embedded SQLite database, one row per set,
+indexed by owner (an opaque client ID) and by inventory fingerprint.
+Calculation requests can then send "chipset_id" instead of the whole
+inventory.
+
+Saving a set schedules a background job that precomputes its Mode 1
+distribution table (see distribution_tables.py). The table is built only
+once per distinct inventory, so later calculations against the set are
+answered by table lookup. Owners are unauthenticated, so precomputing is
+capped: at most CHIPSET_PRECOMPUTE_QUEUE_MAX jobs wait per process, and sets
+saved once CHIPSET_TABLE_MAX distinct inventories are stored are calculated
+without a table. Since anyone can make up new owner IDs, the per-owner limit
+alone does not bound the database: no new sets are accepted once it holds
+CHIPSET_MAX_TOTAL. After a set is changed or deleted, tables that no saved set
+(nor the server's chip set file) uses any more are deleted.
+
+Records never include the owner ID: it is the only credential for changing
+or deleting a set, and anyone with a set's ID can read it.
+
+The database path is set with CHIPSET_DB. SQLite runs in WAL mode, so
+readers in every server worker proceed while one of them writes.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from chip_inventory import INVENTORY_STORE, chip_set_fingerprint, validate_chip_set
+from chip_types import ChipInventory
+from distribution_tables import DISTRIBUTION_TABLES
+from metrics import REGISTRY
+
+# SQLite database file (created on first use)
+CHIPSET_DB = os.environ.get(
+    'CHIPSET_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chipsets.db')
+)
+
+# Precompute distribution tables for saved chip sets in the background (0 disables)
+CHIPSET_PRECOMPUTE = os.environ.get('CHIPSET_PRECOMPUTE', '1') != '0'
+
+# Maximum chip sets per owner
+CHIPSET_MAX_PER_OWNER = int(os.environ.get('CHIPSET_MAX_PER_OWNER', '50'))
+
+# Maximum chip sets stored in total (owners are unauthenticated, so this is what bounds the database)
+CHIPSET_MAX_TOTAL = int(os.environ.get('CHIPSET_MAX_TOTAL', '100000'))
+
+# Precompute jobs waiting per process; saves beyond this are not precomputed
+CHIPSET_PRECOMPUTE_QUEUE_MAX = int(os.environ.get('CHIPSET_PRECOMPUTE_QUEUE_MAX', '8'))
+
+# Distinct saved inventories that get a precomputed table
+CHIPSET_TABLE_MAX = int(os.environ.get('CHIPSET_TABLE_MAX', '200'))
+
+CHIPSET_NAME_MAX_LENGTH = 100
+
+# Owner IDs are opaque client-generated strings (e.g. a UUID kept by the app)
+_OWNER_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,128}$')
+
+# Parsed inventories by fingerprint; content-addressed, so entries never go stale
+_INVENTORY_CACHE_SIZE = 1024
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS chipsets (
+           id TEXT PRIMARY KEY,
+           owner TEXT NOT NULL,
+           name TEXT NOT NULL,
+           fingerprint TEXT NOT NULL,
+           chips TEXT NOT NULL,
+           created_at REAL NOT NULL,
+           updated_at REAL NOT NULL
+       )''',
+    'CREATE INDEX IF NOT EXISTS chipsets_owner ON chipsets (owner, updated_at)',
+    'CREATE INDEX IF NOT EXISTS chipsets_fingerprint ON chipsets (fingerprint)',
+)
+
+CHIPSET_PRECOMPUTES = REGISTRY.counter(
+    'pokerchip_chipset_precomputes_total',
+    'Background distribution table builds for saved chip sets by outcome (built/exists/skipped/error).',
+    ('outcome',))
+CHIPSET_TABLES_REMOVED = REGISTRY.counter(
+    'pokerchip_chipset_tables_removed_total', 'Distribution tables deleted because no saved chip set uses them.')
+
+
+class ChipsetNotFound(KeyError):
+    """Raised when a chip set ID does not exist (or belongs to another owner)."""
+
+
+class ChipsetStoreFull(ValueError):
+    """Raised when a chip set cannot be saved because CHIPSET_MAX_TOTAL sets are stored."""
+
+
+def validate_owner(owner: Any) -> str:
+    """
+    Check an owner ID.
+
+    Raises:
+        ValueError: If it is missing or malformed
+    """
+    if not isinstance(owner, str) or not _OWNER_PATTERN.match(owner):
+        raise ValueError('owner must be 8-128 letters, digits, "-" or "_"')
+    return owner
+
+
+def validate_name(name: Any) -> str:
+    """
+    Check a chip set name.
+
+    Raises:
+        ValueError: If it is empty or too long
+    """
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError('name must be a non-empty string')
+    if len(name) > CHIPSET_NAME_MAX_LENGTH:
+        raise ValueError(f'name must be at most {CHIPSET_NAME_MAX_LENGTH} characters')
+    return name.strip()
+
+
+def _encode_chips(inventory: ChipInventory) -> str:
+    # Exact integer minor units, ascending
+    return json.dumps([list(inventory.units), list(inventory.counts)], separators=(',', ':'))
+
+
+class ChipsetStore:
+    """
+    SQLite-backed chip set storage.
+
+    Connections are opened per thread and per process (forked workers never
+    share one). Every public method is safe to call from request threads.
+    """
+
+    def __init__(self, path: str = CHIPSET_DB,
+                 precompute: Optional[Callable[[ChipInventory], bool]] = None,
+                 collect: Optional[Callable[[], int]] = None):
+        """
+        Args:
+            path: SQLite database file
+            precompute: Called in a background thread with the inventory of every saved set;
+                        returns whether it did any work
+            collect: Called in a background thread after a set's inventory is replaced or a set
+                     is deleted; removes precomputed data no set uses and returns how many items
+        """
+        self.path = path
+        self.precompute = precompute
+        self.collect = collect
+        self._local = threading.local()
+        self._inventories: Dict[str, ChipInventory] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._pending = set()
+        self._collect_pending = False
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _inventory(self, fingerprint: str, chips: str) -> ChipInventory:
+        inventory = self._inventories.get(fingerprint)
+        if inventory is None:
+            units, counts = json.loads(chips)
+            inventory = ChipInventory(units, counts)
+            if len(self._inventories) >= _INVENTORY_CACHE_SIZE:
+                self._inventories.clear()
+            self._inventories[fingerprint] = inventory
+        return inventory
+
+    def _record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'fingerprint': row['fingerprint'],
+            'chip_set': self._inventory(row['fingerprint'], row['chips']),
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at']
+        }
+
+    def create(self, owner: str, name: str, chip_set: Any) -> Dict[str, Any]:
+        """
+        Save a new chip set.
+
+        Args:
+            owner: Owner ID
+            name: Display name
+            chip_set: Mapping of denominations to counts (validated like a request's "chip_set")
+
+        Returns:
+            The stored chip set record (without the owner, like every record)
+
+        Raises:
+            ValueError: If any field is invalid or the owner has too many sets
+            ChipsetStoreFull: If the store already holds CHIPSET_MAX_TOTAL sets
+        """
+        owner = validate_owner(owner)
+        name = validate_name(name)
+        inventory = validate_chip_set(chip_set)
+        fingerprint = chip_set_fingerprint(inventory)
+        now = time.time()
+        chipset_id = uuid.uuid4().hex
+
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            (count,) = conn.execute('SELECT COUNT(*) FROM chipsets WHERE owner = ?', (owner,)).fetchone()
+            if count >= CHIPSET_MAX_PER_OWNER:
+                raise ValueError(f'Too many chip sets! Maximum is {CHIPSET_MAX_PER_OWNER} per owner')
+            (total,) = conn.execute('SELECT COUNT(*) FROM chipsets').fetchone()
+            if total >= CHIPSET_MAX_TOTAL:
+                raise ChipsetStoreFull('The server cannot save more chip sets right now')
+            conn.execute('INSERT INTO chipsets (id, owner, name, fingerprint, chips, created_at, updated_at) '
+                         'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                         (chipset_id, owner, name, fingerprint, _encode_chips(inventory), now, now))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        self.schedule_precompute(inventory, fingerprint)
+        return self.get(chipset_id)
+
+    def get(self, chipset_id: str, owner: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get a chip set record.
+
+        Args:
+            chipset_id: Chip set ID
+            owner: If given, the set must belong to this owner
+
+        Raises:
+            ChipsetNotFound: If there is no such set (for this owner)
+        """
+        row = self._connection().execute('SELECT * FROM chipsets WHERE id = ?', (str(chipset_id),)).fetchone()
+        if row is None or (owner is not None and row['owner'] != owner):
+            raise ChipsetNotFound(chipset_id)
+        return self._record(row)
+
+    def inventory(self, chipset_id: str) -> ChipInventory:
+        """
+        Get just the inventory of a chip set (the calculation endpoints' lookup).
+
+        Raises:
+            ChipsetNotFound: If there is no such set
+        """
+        row = self._connection().execute('SELECT fingerprint, chips FROM chipsets WHERE id = ?',
+                                         (str(chipset_id),)).fetchone()
+        if row is None:
+            raise ChipsetNotFound(chipset_id)
+        return self._inventory(row['fingerprint'], row['chips'])
+
+    def list(self, owner: str) -> List[Dict[str, Any]]:
+        """Get an owner's chip sets, most recently updated first."""
+        owner = validate_owner(owner)
+        rows = self._connection().execute('SELECT * FROM chipsets WHERE owner = ? ORDER BY updated_at DESC',
+                                          (owner,)).fetchall()
+        return [self._record(row) for row in rows]
+
+    def update(self, chipset_id: str, owner: str, name: Optional[str] = None,
+               chip_set: Any = None) -> Dict[str, Any]:
+        """
+        Rename a chip set and/or replace its inventory.
+
+        Raises:
+            ChipsetNotFound: If there is no such set for this owner
+            ValueError: If a field is invalid
+        """
+        owner = validate_owner(owner)
+        fields, values = ['updated_at = ?'], [time.time()]
+        if name is not None:
+            fields.append('name = ?')
+            values.append(validate_name(name))
+        inventory = fingerprint = None
+        if chip_set is not None:
+            inventory = validate_chip_set(chip_set)
+            fingerprint = chip_set_fingerprint(inventory)
+            fields += ['fingerprint = ?', 'chips = ?']
+            values += [fingerprint, _encode_chips(inventory)]
+
+        cursor = self._connection().execute(f'UPDATE chipsets SET {", ".join(fields)} WHERE id = ? AND owner = ?',
+                                            values + [str(chipset_id), owner])
+        if cursor.rowcount == 0:
+            raise ChipsetNotFound(chipset_id)
+        if inventory is not None:
+            self.schedule_precompute(inventory, fingerprint)
+            # The previous inventory's table may now be unused
+            self.schedule_collect()
+        return self.get(chipset_id)
+
+    def delete(self, chipset_id: str, owner: str) -> None:
+        """
+        Delete a chip set (its precomputed table goes too, unless another set uses it).
+
+        Raises:
+            ChipsetNotFound: If there is no such set for this owner
+        """
+        owner = validate_owner(owner)
+        cursor = self._connection().execute('DELETE FROM chipsets WHERE id = ? AND owner = ?',
+                                            (str(chipset_id), owner))
+        if cursor.rowcount == 0:
+            raise ChipsetNotFound(chipset_id)
+        self.schedule_collect()
+
+    def fingerprints(self) -> Set[str]:
+        """Get the inventory fingerprints of every saved set."""
+        rows = self._connection().execute('SELECT DISTINCT fingerprint FROM chipsets').fetchall()
+        return {row['fingerprint'] for row in rows}
+
+    def _submit(self, function: Callable, *args) -> None:
+        # Call with self._lock held. Threads don't survive fork(), so each worker process starts its own
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chipset-precompute')
+            self._executor_pid = os.getpid()
+        self._executor.submit(function, *args)
+
+    def schedule_precompute(self, inventory: ChipInventory, fingerprint: str) -> None:
+        """
+        Run the precompute hook for an inventory in the background (once at a time per inventory).
+
+        Skipped when CHIPSET_PRECOMPUTE_QUEUE_MAX jobs are already waiting or more than
+        CHIPSET_TABLE_MAX distinct inventories are saved.
+        """
+        if self.precompute is None:
+            return
+        (inventories,) = self._connection().execute('SELECT COUNT(DISTINCT fingerprint) FROM chipsets').fetchone()
+        with self._lock:
+            if fingerprint in self._pending:
+                return
+            if len(self._pending) >= CHIPSET_PRECOMPUTE_QUEUE_MAX or inventories > CHIPSET_TABLE_MAX:
+                CHIPSET_PRECOMPUTES.inc(labels=('skipped',))
+                return
+            self._pending.add(fingerprint)
+            self._submit(self._run_precompute, inventory, fingerprint)
+
+    def schedule_collect(self) -> None:
+        """Run the collect hook in the background (after queued precompute jobs, at most one waiting)."""
+        if self.collect is None:
+            return
+        with self._lock:
+            if self._collect_pending:
+                return
+            self._collect_pending = True
+            self._submit(self._run_collect)
+
+    def _run_precompute(self, inventory: ChipInventory, fingerprint: str) -> None:
+        try:
+            outcome = 'built' if self.precompute(inventory) else 'exists'
+        except Exception as e:
+            outcome = 'error'
+            print(f"[WARNING] Could not precompute chip set {fingerprint}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(fingerprint)
+        CHIPSET_PRECOMPUTES.inc(labels=(outcome,))
+
+    def _run_collect(self) -> None:
+        with self._lock:
+            self._collect_pending = False
+        try:
+            CHIPSET_TABLES_REMOVED.inc(self.collect())
+        except Exception as e:
+            print(f"[WARNING] Could not remove unused distribution tables: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Stored chip sets, distinct inventories and queued precompute jobs."""
+        sets, inventories = self._connection().execute(
+            'SELECT COUNT(*), COUNT(DISTINCT fingerprint) FROM chipsets').fetchone()
+        return {'chipsets': sets, 'inventories': inventories, 'precompute_pending': len(self._pending)}
+
+
+def remove_unused_tables() -> int:
+    """
+    Delete distribution tables that no saved chip set, nor the server's chip set file, uses.
+
+    Returns:
+        Number of table files deleted
+    """
+    # List the files before reading the sets: a set is always saved before its table is built
+    candidates = DISTRIBUTION_TABLES.fingerprints()
+    keep = CHIPSET_STORE.fingerprints() | {chip_set_fingerprint(INVENTORY_STORE.get())}
+    return sum(DISTRIBUTION_TABLES.remove(fingerprint) for fingerprint in candidates if fingerprint not in keep)
+
+
+# Process-wide store used by the API
+CHIPSET_STORE = ChipsetStore(precompute=DISTRIBUTION_TABLES.ensure if CHIPSET_PRECOMPUTE else None,
+                             collect=remove_unused_tables if CHIPSET_PRECOMPUTE else None)
@@ -0,0 +1,327 @@
+"""
+Precomputed, memory-mapped Mode 1 distribution tables.
+
+A Mode 1 distribution depends only on (num_players, small_blind, big_blind)
+and the chip inventory - duration and level length just decide the number of
+levels. So for each inventory we precompute calculate_chip_distribution for
+every player count (1-100) and every pair on a blind ladder, and store the
+results in a compact binary file named after the inventory fingerprint.
+
+The server memory-maps these files read-only, so every worker process shares
+the same page-cache pages, and answers on-grid requests with an O(1) index
+lookup. Anything off-grid falls back to live computation.
+
+Build tables offline with:
+    python distribution_tables.py build [--chip-set-file FILE] [--out DIR]
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from allocation_plan import ALLOCATION_WEIGHTS, TOP_UP_STEPS
+from blind_schedule import BLIND_MULTIPLIER, build_blind_schedule
+from chip_inventory import CHIP_SET_FILE, chip_set_fingerprint, read_chip_set_file
+from chip_types import MINOR_UNITS, ChipInventory, Distribution
+from pokerchipcounter import (
+    ENGINE_VERSION, TARGET_END_BB, TARGET_END_LEVEL, calculate_chip_distribution, first_usable_column,
+    validate_tournament_inputs
+)
+
+# Where table files live (one "<fingerprint>.bin" per chip inventory)
+TABLE_DIR = os.environ.get(
+    'DISTRIBUTION_TABLE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables')
+)
+
+# Blind pairs precomputed for every player count
+BLIND_LADDER = (
+    (0.25, 0.5), (0.5, 1), (1, 1), (1, 2), (2, 4), (2, 5), (3, 6), (5, 5), (5, 10),
+    (10, 20), (15, 30), (20, 40), (25, 25), (25, 50), (50, 100), (75, 150), (100, 100),
+    (100, 200), (150, 300), (200, 400), (250, 500), (300, 600), (400, 800), (500, 1000),
+    (1000, 2000)
+)
+
+MAX_PLAYERS = 100
+
+# Stack size Mode 1 uses from the API (tables are only valid for this)
+TABLE_STACK_SIZE = 1
+
+# Bump when the file layout changes
+TABLE_FORMAT_VERSION = 1
+
+_MAGIC = b'PCDT'
+# magic, version, denominations, blind pairs, max players, engine key, inventory fingerprint
+_HEADER = struct.Struct('<4sHHII16s16s')
+
+# Record flags
+_FLAG_STORED = 1          # record holds a valid distribution
+_FLAG_ADJUSTED = 2        # stack_was_adjusted
+
+
+def engine_key() -> bytes:
+    """Identify the engine rules and constants a table was built with; stale tables are ignored."""
+    rules = repr((TABLE_FORMAT_VERSION, ENGINE_VERSION, TABLE_STACK_SIZE, TARGET_END_LEVEL, TARGET_END_BB,
+                  BLIND_MULTIPLIER, MINOR_UNITS, ALLOCATION_WEIGHTS, TOP_UP_STEPS))
+    return hashlib.sha1(rules.encode('ascii')).digest()[:16]
+
+
+def table_path(fingerprint: str, directory: str = TABLE_DIR) -> str:
+    """Get the table file path for an inventory fingerprint."""
+    return os.path.join(directory, f'{fingerprint}.bin')
+
+
+def _record_struct(num_denoms: int) -> struct.Struct:
+    # stack_value, flags, padding, chips per player for each (sorted) denomination
+    return struct.Struct(f'<dII{num_denoms}I')
+
+
+def build_table(chip_set: Mapping[float, int], blinds: Sequence[Tuple[float, float]] = BLIND_LADDER,
+                directory: str = TABLE_DIR) -> str:
+    """
+    Precompute Mode 1 results for every player count and blind pair.
+
+    Args:
+        chip_set: Validated chip inventory
+        blinds: (small_blind, big_blind) pairs to precompute
+        directory: Output directory
+
+    Returns:
+        Path of the written table file
+    """
+    inventory = ChipInventory.from_mapping(chip_set)
+    denoms = inventory.denominations
+    record = _record_struct(len(denoms))
+    fingerprint = chip_set_fingerprint(chip_set)
+
+    parts = [_HEADER.pack(_MAGIC, TABLE_FORMAT_VERSION, len(denoms), len(blinds), MAX_PLAYERS,
+                          engine_key(), fingerprint.encode('ascii'))]
+    parts.append(struct.pack(f'<{len(denoms)}d', *denoms))
+    parts.append(struct.pack(f'<{2 * len(blinds)}d', *(value for pair in blinds for value in pair)))
+
+    for small_blind, big_blind in blinds:
+        for num_players in range(1, MAX_PLAYERS + 1):
+            try:
+                # Duration and level length only affect the level count, so any valid pair works
+                result = calculate_chip_distribution(num_players, float(small_blind), float(big_blind), 4.0, 20,
+                                                     TABLE_STACK_SIZE, chip_set=inventory)
+            except ValueError:
+                result = None
+            if result is None or 'error' in result:
+                parts.append(record.pack(0.0, 0, 0, *([0] * len(denoms))))
+                continue
+            flags = _FLAG_STORED | (_FLAG_ADJUSTED if result['stack_was_adjusted'] else 0)
+            counts = [result['distribution'].get(denom, 0) for denom in denoms]
+            parts.append(record.pack(float(result['stack_value']), flags, 0, *counts))
+
+    os.makedirs(directory, exist_ok=True)
+    path = table_path(fingerprint, directory)
+    temp_path = f'{path}.tmp{os.getpid()}'
+    with open(temp_path, 'wb') as f:
+        f.write(b''.join(parts))
+    # Atomic replace, so servers never map a half-written table
+    os.replace(temp_path, path)
+    return path
+
+
+class DistributionTable:
+    """Read-only, memory-mapped view of one inventory's precomputed table."""
+
+    def __init__(self, path: str, chip_set: Mapping[float, int]):
+        """
+        Args:
+            path: Table file path
+            chip_set: The inventory the table was built for (used to rebuild results)
+
+        Raises:
+            ValueError: If the file is not a table for this inventory and engine version
+        """
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, num_denoms, num_blinds, max_players, key, fingerprint = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != TABLE_FORMAT_VERSION:
+            raise ValueError(f'{path} is not a version {TABLE_FORMAT_VERSION} distribution table')
+        if key != engine_key():
+            raise ValueError(f'{path} was built with different allocation rules')
+        if fingerprint.decode('ascii') != chip_set_fingerprint(chip_set):
+            raise ValueError(f'{path} was built for a different chip set')
+
+        offset = _HEADER.size
+        stored_denoms = struct.unpack_from(f'<{num_denoms}d', self._map, offset)
+        offset += 8 * num_denoms
+        blind_values = struct.unpack_from(f'<{2 * num_blinds}d', self._map, offset)
+        offset += 16 * num_blinds
+
+        self.inventory = ChipInventory.from_mapping(chip_set)
+        self.denominations = self.inventory.denominations
+        if [float(d) for d in self.denominations] != list(stored_denoms):
+            raise ValueError(f'{path} denominations do not match the chip set')
+        self.total_chip_value = self.inventory.value
+        self.max_players = max_players
+        self.blind_index = {(blind_values[2 * i], blind_values[2 * i + 1]): i for i in range(num_blinds)}
+        self._records_offset = offset
+        self._record = _record_struct(num_denoms)
+
+    def lookup(self, num_players: int, small_blind: float, big_blind: float, duration_hours: float,
+               minutes_per_level: int, stack_size: int = TABLE_STACK_SIZE) -> Optional[Dict[str, Any]]:
+        """
+        Answer a Mode 1 request from the table.
+
+        Returns:
+            The same result calculate_chip_distribution would return, or None
+            if the scenario is not in the table (compute it live instead)
+
+        Raises:
+            ValueError: For invalid tournament inputs, exactly like the live calculator
+        """
+        blind = self.blind_index.get((small_blind, big_blind))
+        if blind is None or stack_size != TABLE_STACK_SIZE or not 1 <= num_players <= self.max_players:
+            return None
+        num_levels = validate_tournament_inputs(num_players, small_blind, big_blind,
+                                                duration_hours, minutes_per_level)
+
+        offset = self._records_offset + (blind * self.max_players + num_players - 1) * self._record.size
+        _, flags, _, *counts = self._record.unpack_from(self._map, offset)
+        if not flags & _FLAG_STORED:
+            return None
+
+        # The stored stack value is a double; recompute it exactly from the counts
+        distribution = Distribution.from_columns(self.inventory.units, counts)
+        stack_value = distribution.value
+        # Same usable-denomination rule as calculate_chip_distribution
+        first = first_usable_column(self.denominations, small_blind)
+        return {
+            'distribution': distribution,
+            'stack_value': stack_value,
+            'big_blinds': stack_value / big_blind,
+            'target_level': TARGET_END_LEVEL,
+            'total_levels': num_levels,
+            'minutes_per_level': minutes_per_level,
+            'available_chips': self.inventory,
+            'stack_size': TABLE_STACK_SIZE,
+            'stack_was_adjusted': bool(flags & _FLAG_ADJUSTED),
+            'max_stack_per_player': self.total_chip_value / num_players,
+            'blind_schedule': build_blind_schedule(small_blind, big_blind, num_levels,
+                                                   self.denominations[first:], stack_value)
+        }
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class DistributionTableRegistry:
+    """Opens table files on demand, one per inventory fingerprint."""
+
+    # Seconds before re-checking for a table that was missing
+    MISSING_RECHECK_SECONDS = 60.0
+
+    def __init__(self, directory: str = TABLE_DIR):
+        self.directory = directory
+        self._tables: Dict[str, Tuple[Optional[DistributionTable], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, chip_set: Mapping[float, int], fingerprint: Optional[str] = None) -> Optional[DistributionTable]:
+        """Get the mapped table for an inventory, or None if none has been built."""
+        fingerprint = fingerprint or chip_set_fingerprint(chip_set)
+        entry = self._tables.get(fingerprint)
+        if entry is not None and (entry[0] is not None or time.monotonic() < entry[1]):
+            return entry[0]
+        with self._lock:
+            table = None
+            path = table_path(fingerprint, self.directory)
+            if os.path.exists(path):
+                try:
+                    table = DistributionTable(path, chip_set)
+                except (OSError, ValueError, struct.error) as e:
+                    print(f"[WARNING] Ignoring distribution table {path}: {e}")
+            self._tables[fingerprint] = (table, time.monotonic() + self.MISSING_RECHECK_SECONDS)
+            return table
+
+    def ensure(self, chip_set: Mapping[float, int], fingerprint: Optional[str] = None) -> bool:
+        """
+        Build the table for an inventory unless a current one exists, and map it.
+
+        Returns:
+            True if a table was built (it was missing or built by a different engine)
+        """
+        fingerprint = fingerprint or chip_set_fingerprint(chip_set)
+        self._forget_missing(fingerprint)
+        if self.get(chip_set, fingerprint) is not None:
+            return False
+        build_table(chip_set, directory=self.directory)
+        self._forget_missing(fingerprint)
+        self.get(chip_set, fingerprint)
+        return True
+
+    def _forget_missing(self, fingerprint: str) -> None:
+        # Drop a cached "missing" entry so the next get() checks the file again
+        with self._lock:
+            if self._tables.get(fingerprint, (None,))[0] is None:
+                self._tables.pop(fingerprint, None)
+
+    def fingerprints(self) -> List[str]:
+        """Get the inventory fingerprints that have a table file."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [name[:-len('.bin')] for name in names if name.endswith('.bin')]
+
+    def remove(self, fingerprint: str) -> bool:
+        """
+        Delete the table file of an inventory.
+
+        Tables already mapped (here or in other processes) stay usable until
+        they are dropped; lookups after this fall back to calculating.
+
+        Returns:
+            True if a file was deleted
+        """
+        with self._lock:
+            # Not closed: a request thread may be reading it
+            self._tables.pop(fingerprint, None)
+        try:
+            os.remove(table_path(fingerprint, self.directory))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def lookup(self, chip_set: Mapping[float, int], params: Mapping[str, Any],
+               fingerprint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Look up a Mode 1 request (calculate_chip_distribution keyword arguments)."""
+        table = self.get(chip_set, fingerprint)
+        if table is None:
+            return None
+        return table.lookup(**params)
+
+
+# Process-wide registry used by the API
+DISTRIBUTION_TABLES = DistributionTableRegistry()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Precompute Mode 1 distribution tables')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='Build the table for a chip set file')
+    build.add_argument('--chip-set-file', default=CHIP_SET_FILE, help='Chip set file to precompute')
+    build.add_argument('--out', default=TABLE_DIR, help='Output directory')
+    args = parser.parse_args(argv)
+
+    chip_set = read_chip_set_file(args.chip_set_file)
+    started = time.perf_counter()
+    path = build_table(chip_set, directory=args.out)
+    elapsed = time.perf_counter() - started
+    print(f"[OK] Wrote {path} ({os.path.getsize(path):,} bytes, "
+          f"{len(BLIND_LADDER) * MAX_PLAYERS} scenarios in {elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
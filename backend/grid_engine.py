@@ -0,0 +1,218 @@
+"""
+Vectorized scenario-grid engine for Mode 1 (auto-calculate).
+
+Evaluates calculate_chip_distribution for whole arrays of
+(num_players, small_blind, big_blind, duration_hours, minutes_per_level)
+at once with NumPy, giving the same distributions as the scalar function.
+Stack values are tracked in integer minor units, like the scalar engine.
+Used to build "starting stack vs players / level length" heatmaps.
+"""
+
+import itertools
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from allocation_plan import ALLOCATION_WEIGHTS, WeightTable, compile_allocation_plan
+from blind_schedule import big_blind_at_level
+from chip_types import MINOR_UNITS, ChipInventory
+from pokerchipcounter import TARGET_END_BB, TARGET_END_LEVEL, calculate_chip_distribution
+
+
+def round_to_stack_array(count: np.ndarray, stack_size: int) -> np.ndarray:
+    """Vectorized round_to_stack (see pokerchipcounter.round_to_stack)."""
+    if stack_size < 5:
+        stack_size = 5
+    rounded = np.round(count / stack_size) * stack_size
+    rounded = np.where((count > 0) & (rounded == 0), stack_size, rounded)
+    # Snap to the nearest multiple of 5 (the "nice number" table in
+    # round_to_stack is exactly this for whole chip counts)
+    rounded = np.where(rounded > 0, np.round(rounded / 5) * 5, rounded)
+    return np.where(count == 0, 0, rounded)
+
+
+def round_to_stack_with_limit_array(count: np.ndarray, stack_size: int, max_count: np.ndarray,
+                                    allow_small: bool = False) -> np.ndarray:
+    """Vectorized round_to_stack_with_limit (see pokerchipcounter.round_to_stack_with_limit)."""
+    capped = np.minimum(count, max_count)
+    rounded = round_to_stack_array(capped, stack_size)
+    rounded = np.where(rounded > max_count, (max_count // 5) * 5, rounded)
+    if allow_small:
+        small = np.where(max_count >= 1, np.maximum(1, np.minimum(max_count, capped)), 0)
+    else:
+        small = np.zeros_like(rounded)
+    rounded = np.where(rounded < 5, small, rounded)
+
+    skip = (count <= 0) | (max_count <= 0)
+    if not allow_small:
+        skip |= max_count < 5
+    return np.where(skip, 0, rounded)
+
+
+def evaluate_grid(num_players: Sequence[int], small_blind: Sequence[float], big_blind: Sequence[float],
+                  duration_hours: Sequence[float], minutes_per_level: Sequence[int],
+                  chip_set: Mapping[float, int], stack_size: int = 1,
+                  allocation_weights: WeightTable = ALLOCATION_WEIGHTS) -> Dict[str, Any]:
+    """
+    Evaluate Mode 1 for many scenarios at once.
+
+    Args:
+        num_players, small_blind, big_blind, duration_hours, minutes_per_level:
+            Equal-length (or broadcastable) arrays, one entry per scenario
+        chip_set: Validated chip inventory shared by every scenario
+        stack_size: Size of chip stacks to round to
+        allocation_weights: Anchor weight table for the allocation plan
+
+    Returns:
+        Dictionary of arrays:
+            denominations  sorted chip denominations (columns of counts)
+            counts         chips per player, shape (scenarios, denominations)
+            stack_value, big_blinds, total_levels, stack_was_adjusted, max_stack_per_player
+            errors         error message per scenario (None if valid)
+    """
+    players, sb, bb, hours, minutes = np.broadcast_arrays(
+        np.asarray(num_players, dtype=np.int64), np.asarray(small_blind, dtype=np.float64),
+        np.asarray(big_blind, dtype=np.float64), np.asarray(duration_hours, dtype=np.float64),
+        np.asarray(minutes_per_level, dtype=np.int64))
+    players, sb, bb, hours, minutes = (a.ravel() for a in (players, sb, bb, hours, minutes))
+    size = players.shape[0]
+
+    inventory = ChipInventory.from_mapping(chip_set)
+    denoms = list(inventory.denominations)
+    units = np.frombuffer(inventory.units, dtype=np.int64)
+    available = np.frombuffer(inventory.counts, dtype=np.int64)
+    total_chip_value = inventory.value
+
+    # Validation (mirrors calculate_chip_distribution); messages are filled in below
+    with np.errstate(divide='ignore', invalid='ignore'):
+        num_levels = np.floor(hours * 60 / np.where(minutes > 0, minutes, 1)).astype(np.int64)
+        max_stack = total_chip_value / np.where(players > 0, players, 1)
+    invalid = ((players <= 0) | (players > 100) | (sb <= 0) | (bb <= 0) | (sb > bb) |
+               (hours <= 0) | (hours > 24) | (minutes <= 0) | (minutes > 240) |
+               ~np.isfinite(sb) | ~np.isfinite(bb) | ~np.isfinite(hours) |
+               (num_levels < 3) | (num_levels > 100) |
+               ((players > 1) & (max_stack < bb * 50)))
+
+    # Target stack: big blind at TARGET_END_LEVEL times TARGET_END_BB (see auto_target_stack)
+    target = big_blind_at_level(bb, TARGET_END_LEVEL) * TARGET_END_BB
+    stack_was_adjusted = target > max_stack
+    target = np.where(stack_was_adjusted, np.round(max_stack * 0.9 / 100) * 100, np.round(target / 100) * 100)
+    target = np.where(max_stack > target * 2,
+                      np.round(np.minimum(target * 2.5, max_stack * 0.7) / 100) * 100, target)
+    min_stack = bb * 100
+    target = np.where(target < min_stack, np.round(min_stack / 100) * 100, target)
+
+    counts = np.zeros((size, len(denoms)), dtype=np.int64)
+    remaining = np.rint(target * MINOR_UNITS).astype(np.int64)
+    safe_players = np.where(players > 0, players, 1)
+    max_per_player = available[np.newaxis, :] // safe_players[:, np.newaxis]
+
+    # Scenarios with the same usable denominations share one compiled plan
+    usable = (sb[:, np.newaxis] <= 2) | (np.asarray(denoms)[np.newaxis, :] >= sb[:, np.newaxis])
+    no_usable = ~usable.any(axis=1)
+    group_keys = np.packbits(usable, axis=1, bitorder='little')
+    _, group_ids = np.unique(group_keys, axis=0, return_inverse=True)
+    group_ids = group_ids.ravel()
+
+    for group in np.unique(group_ids):
+        rows = np.nonzero((group_ids == group) & ~invalid & ~no_usable)[0]
+        if rows.size == 0:
+            continue
+        columns = np.nonzero(usable[rows[0]])[0]
+        # Plan step i and top-up columns refer to the i-th usable denomination
+        plan = compile_allocation_plan(tuple(int(units[c]) for c in columns), allocation_weights)
+        rem = remaining[rows]
+        group_sb = sb[rows]
+
+        for step, (denom, weight, min_count, max_small_blind) in enumerate(plan.steps):
+            col = columns[step]
+            mpp = max_per_player[rows, col]
+            active = mpp > 0
+            if max_small_blind is not None:
+                active &= group_sb <= max_small_blind
+            if min_count == 0:
+                active &= rem >= denom
+            chip_count = np.maximum(min_count, np.trunc(rem * weight / denom))
+            chip_count = round_to_stack_with_limit_array(chip_count, stack_size, mpp).astype(np.int64)
+            take = active & (chip_count > 0)
+            counts[rows, col] = np.where(take, chip_count, counts[rows, col])
+            rem = np.where(take, rem - denom * chip_count, rem)
+
+        for step, denom, min_remaining, allow_small in plan.top_ups:
+            col = columns[step]
+            mpp = max_per_player[rows, col]
+            current = counts[rows, col]
+            new_total = round_to_stack_with_limit_array(current + rem // denom, stack_size, mpp,
+                                                        allow_small=allow_small).astype(np.int64)
+            take = (rem >= min_remaining) & (mpp > 0) & (new_total > current)
+            rem = np.where(take, rem - denom * (new_total - current), rem)
+            counts[rows, col] = np.where(take, new_total, current)
+
+        remaining[rows] = rem
+
+    # Allocations are capped per player, so the scalar shortage repair never
+    # changes anything; any cell that would need it is computed exactly below
+    needs_scalar = (counts * players[:, np.newaxis] > available[np.newaxis, :]).any(axis=1) & ~invalid
+
+    stack_value = (counts @ units) / MINOR_UNITS
+    with np.errstate(divide='ignore', invalid='ignore'):
+        big_blinds = np.where(bb > 0, stack_value / bb, 0.0)
+
+    errors: List[Optional[str]] = [None] * size
+    for index in np.nonzero(invalid | no_usable | needs_scalar)[0]:
+        try:
+            result = calculate_chip_distribution(
+                int(players[index]), float(sb[index]), float(bb[index]), float(hours[index]),
+                int(minutes[index]), stack_size, chip_set=inventory, allocation_weights=allocation_weights)
+        except ValueError as e:
+            errors[index] = str(e)
+            counts[index] = 0
+            stack_value[index] = big_blinds[index] = 0
+            continue
+        if 'error' in result:
+            errors[index] = result['error']
+        counts[index] = [result['distribution'].get(d, 0) for d in denoms]
+        stack_value[index] = result['stack_value']
+        big_blinds[index] = result['big_blinds']
+
+    return {
+        'denominations': denoms,
+        'counts': counts,
+        'stack_value': stack_value,
+        'big_blinds': big_blinds,
+        'total_levels': np.maximum(1, num_levels),
+        'stack_was_adjusted': stack_was_adjusted & ~invalid,
+        'max_stack_per_player': max_stack,
+        'errors': errors
+    }
+
+
+def sweep_grid(num_players: Sequence[int], blinds: Sequence[Sequence[float]], duration_hours: Sequence[float],
+               minutes_per_level: Sequence[int], chip_set: Mapping[float, int],
+               stack_size: int = 1) -> Dict[str, Any]:
+    """
+    Evaluate the full cartesian product of the given axes.
+
+    Args:
+        num_players: Player counts to sweep
+        blinds: (small_blind, big_blind) pairs to sweep
+        duration_hours: Tournament durations to sweep
+        minutes_per_level: Level lengths to sweep
+        chip_set: Validated chip inventory
+
+    Returns:
+        evaluate_grid() output plus 'shape' (players, blinds, durations, level lengths);
+        arrays are flattened in that (C) order
+    """
+    cells = list(itertools.product(num_players, blinds, duration_hours, minutes_per_level))
+    grid = evaluate_grid(
+        [cell[0] for cell in cells],
+        [cell[1][0] for cell in cells],
+        [cell[1][1] for cell in cells],
+        [cell[2] for cell in cells],
+        [cell[3] for cell in cells],
+        chip_set,
+        stack_size
+    )
+    grid['shape'] = [len(num_players), len(blinds), len(duration_hours), len(minutes_per_level)]
+    return grid
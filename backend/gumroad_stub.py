@@ -0,0 +1,173 @@
+"""
+Local stand-in for the Gumroad license verification API.
+
+Answers POST /v2/licenses/verify the way Gumroad does, so license checks can
+be developed and exercised without network access or real keys. It can add
+latency and fail requests with 503 (a random share, or the first few, with
+an optional Retry-After) to exercise the retry logic in http_client.py. It
+counts requests, connections and the most requests answered at once, which
+the tests use to check connection reuse and concurrent checks.
+
+Usage:
+    python gumroad_stub.py [--port 8787] [--license KEY[=PRODUCT_ID]] [--latency-ms 50] [--fail-rate 0.2]
+                           [--fail-first 2] [--retry-after 1]
+
+then start the API with GUMROAD_API_BASE=http://127.0.0.1:8787
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+# License keys accepted when none are given (valid for every product)
+DEFAULT_LICENSES = {'STUB-VALID-KEY': None}
+
+
+class GumroadStub(ThreadingHTTPServer):
+    """HTTP server holding the stub's licenses and behaviour settings."""
+
+    daemon_threads = True
+
+    def __init__(self, address, licenses: Dict[str, Optional[str]], latency_ms: float = 0.0,
+                 fail_rate: float = 0.0, fail_first: int = 0, retry_after: Optional[str] = None):
+        """
+        Args:
+            address: (host, port) to listen on (port 0 picks a free one)
+            licenses: Valid license keys -> product ID they belong to (None = any product)
+            latency_ms: Delay added to every answer
+            fail_rate: Share of requests answered with 503 Service Unavailable
+            fail_first: Answer this many requests with 503 before any others
+            retry_after: Retry-After header value sent with every 503
+        """
+        super().__init__(address, _Handler)
+        self.licenses = licenses
+        self.latency_ms = latency_ms
+        self.fail_rate = fail_rate
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.connection_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # time.monotonic() of every request, in arrival order
+        self.request_times: List[float] = []
+        self._count_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'    # keep-alive, like the real API
+
+    def setup(self):
+        super().setup()
+        server: GumroadStub = self.server
+        with server._count_lock:
+            server.connection_count += 1
+
+    def do_POST(self):
+        server: GumroadStub = self.server
+        with server._count_lock:
+            server.request_count += 1
+            server.request_times.append(time.monotonic())
+            fail = server.request_count <= server.fail_first
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            self._answer(server, fail)
+        finally:
+            with server._count_lock:
+                server.in_flight -= 1
+
+    def _answer(self, server: 'GumroadStub', fail: bool) -> None:
+        length = int(self.headers.get('Content-Length', 0))
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+
+        if server.latency_ms:
+            time.sleep(server.latency_ms / 1000)
+        if self.path != '/v2/licenses/verify':
+            return self._send(404, {'success': False, 'message': 'Not found'})
+        if fail or (server.fail_rate and random.random() < server.fail_rate):
+            headers = {'Retry-After': server.retry_after} if server.retry_after else {}
+            return self._send(503, {'success': False, 'message': 'Service unavailable'}, headers)
+
+        license_key = form.get('license_key', '')
+        product_id = form.get('product_id', '')
+        if license_key not in server.licenses or server.licenses[license_key] not in (None, product_id):
+            return self._send(404, {'success': False,
+                                    'message': 'That license does not exist for the provided product.'})
+
+        self._send(200, {
+            'success': True,
+            'uses': 0,
+            'purchase': {
+                'product_id': product_id,
+                'product_name': 'Poker Chip Calculator (stub)',
+                'email': 'buyer@example.com',
+                'created_at': '2026-01-01T00:00:00Z',
+                'license_key': license_key,
+                'refunded': False
+            }
+        })
+
+    def _send(self, status: int, body: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_licenses(values: List[str]) -> Dict[str, Optional[str]]:
+    """Parse KEY or KEY=PRODUCT_ID arguments."""
+    licenses = {}
+    for value in values:
+        key, _, product_id = value.partition('=')
+        licenses[key] = product_id or None
+    return licenses
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Local Gumroad license API stub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--license', action='append', default=[], dest='licenses',
+                        help='Valid license KEY or KEY=PRODUCT_ID (repeatable, default: STUB-VALID-KEY)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay added to every answer')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of requests answered with 503')
+    parser.add_argument('--fail-first', type=int, default=0, help='Answer this many requests with 503 first')
+    parser.add_argument('--retry-after', help='Retry-After header value sent with every 503')
+    args = parser.parse_args(argv)
+
+    licenses = parse_licenses(args.licenses) if args.licenses else dict(DEFAULT_LICENSES)
+    server = GumroadStub((args.host, args.port), licenses, args.latency_ms, args.fail_rate,
+                         args.fail_first, args.retry_after)
+    print(f"[OK] Gumroad stub listening on {server.url}")
+    print(f"   Valid keys: {', '.join(licenses)}")
+    print(f"   Start the API with GUMROAD_API_BASE={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
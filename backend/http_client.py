@@ -0,0 +1,150 @@
+"""
+Shared outbound HTTP client for license verification.
+
+One requests.Session per process keeps TLS connections alive between calls
+(no handshake per verification), with a bounded connection pool, per-host
+connect/read timeouts and jittered retries. Every call made through it must
+be idempotent - retries may repeat a request that already reached the server.
+"""
+
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connections kept per host; callers beyond this wait for a free connection
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '10'))
+
+# Retries after the first attempt (connection errors, 429 and 5xx responses; never read timeouts)
+HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))
+
+# Longest Retry-After wait honoured, in seconds (longer requests are cut to this)
+HTTP_RETRY_AFTER_MAX = float(os.environ.get('HTTP_RETRY_AFTER_MAX', '2'))
+
+# Base for exponential backoff between retries, in seconds (jittered, see JitteredRetry)
+HTTP_BACKOFF = float(os.environ.get('HTTP_BACKOFF', '0.25'))
+
+# (connect, read) timeouts in seconds, per host
+DEFAULT_TIMEOUT = (3.05, 10.0)
+HOST_TIMEOUTS = {
+    'api.gumroad.com': (float(os.environ.get('GUMROAD_CONNECT_TIMEOUT', '3.05')),
+                        float(os.environ.get('GUMROAD_READ_TIMEOUT', '8'))),
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class JitteredRetry(Retry):
+    """
+    Retry with "full jitter" backoff: a random delay up to the exponential backoff.
+
+    Retry-After waits are capped at HTTP_RETRY_AFTER_MAX, so a server can't
+    hold a request thread for longer than that per retry.
+    """
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, HTTP_RETRY_AFTER_MAX)
+
+
+class OutboundClient:
+    """Pooled, retrying HTTP client with per-host timeouts."""
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, retries: int = HTTP_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF,
+                 timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_timeout: Tuple[float, float] = DEFAULT_TIMEOUT):
+        """
+        Args:
+            pool_size: Maximum open connections per host
+            retries: Retries after the first attempt
+            backoff_factor: Exponential backoff base in seconds
+            timeouts: (connect, read) timeouts by host name
+            default_timeout: (connect, read) timeout for other hosts
+        """
+        self.pool_size = pool_size
+        self.timeouts = dict(HOST_TIMEOUTS if timeouts is None else timeouts)
+        self.default_timeout = default_timeout
+
+        retry = JitteredRetry(
+            total=retries,
+            # A read timeout means the server already spent the whole read timeout on
+            # this request; retrying would multiply the wait, so raise it at once (as a Timeout)
+            read=False,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            # Only idempotent calls go through this client, POSTs included
+            allowed_methods=frozenset({'GET', 'HEAD', 'POST'}),
+            respect_retry_after_header=True,
+            # Hand the last response back instead of raising, so callers see the real status
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def timeout_for(self, url: str) -> Tuple[float, float]:
+        """Get the (connect, read) timeout for a URL's host."""
+        return self.timeouts.get(urlsplit(url).hostname or '', self.default_timeout)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST through the pooled session (timeout defaults to the host's)."""
+        kwargs.setdefault('timeout', self.timeout_for(url))
+        return self.session.post(url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the pooled session (timeout defaults to the host's)."""
+        kwargs.setdefault('timeout', self.timeout_for(url))
+        return self.session.get(url, **kwargs)
+
+    def run_concurrently(self, calls: Dict[Hashable, Callable[[], Any]]) -> Dict[Hashable, Any]:
+        """
+        Run several outbound calls at the same time.
+
+        Args:
+            calls: Zero-argument functions by key
+
+        Returns:
+            Each call's return value, or the exception it raised, by key
+        """
+        if len(calls) <= 1:
+            futures = None
+        else:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='outbound')
+            futures = {key: self._executor.submit(call) for key, call in calls.items()}
+
+        results = {}
+        for key, call in calls.items():
+            try:
+                results[key] = futures[key].result() if futures else call()
+            except Exception as e:
+                results[key] = e
+        return results
+
+    def close(self) -> None:
+        """Close pooled connections and stop the worker threads."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.session.close()
+
+
+# Process-wide client for license checks
+OUTBOUND = OutboundClient()
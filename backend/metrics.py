@@ -0,0 +1,323 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Counters and histograms are sharded per thread: each worker thread updates
+its own dictionary without taking a lock, and the (rare) scrape sums the
+shards. A lock is only taken the first time a thread touches a metric, to
+register its shard. Shards of threads that have exited are folded into a
+"retired" shard, so values are kept (counters never go backwards) while
+thread-per-request servers don't accumulate shards.
+
+Values are per process. Batch pool workers (batch.py) send the counter
+increments they make back with each chunk's results (CounterDeltas) and the
+parent adds them to its own counters. Under serve.py every server worker
+keeps its own registry, so a scrape of /api/metrics reports the numbers of
+whichever worker answered it.
+"""
+
+import abc
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+# Fold dead threads' shards once a metric has this many
+_COMPACT_AT = 64
+
+# Latency buckets in seconds (Prometheus "le" upper bounds)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Sharded(abc.ABC):
+    """Base for metrics whose values live in per-thread shards."""
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._lock:
+                if len(self._shards) >= _COMPACT_AT:
+                    self._compact()
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+            return shard
+
+    def _compact(self) -> None:
+        # Caller holds the lock. Threads that have exited can no longer write their shard.
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                for labels, value in shard.items():
+                    self._merge(self._retired, labels, value)
+        self._shards = live
+
+    @abc.abstractmethod
+    def _merge(self, into: dict, labels: Labels, value) -> None:
+        """Add one shard's value for `labels` into `into`."""
+
+    def _merged(self) -> dict:
+        """Sum of every shard (a private copy, safe to read while threads keep updating)."""
+        with self._lock:
+            self._compact()
+            totals: dict = {}
+            for labels, value in self._retired.items():
+                self._merge(totals, labels, value)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            # Copy first so we never iterate a dict its owner thread is growing
+            for labels, value in list(shard.items()):
+                self._merge(totals, labels, value)
+        return totals
+
+    def header(self) -> List[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(_Sharded):
+    """Monotonically increasing count, optionally split by labels."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _merge(self, into: dict, labels: Labels, value: float) -> None:
+        into[labels] = into.get(labels, 0) + value
+
+    def values(self) -> Dict[Labels, float]:
+        return self._merged()
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self.values().items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}')
+        return lines
+
+
+class Histogram(_Sharded):
+    """Distribution of observed values in fixed buckets, optionally split by labels."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # [per-bucket counts (last = +Inf), sum, count]
+            state = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        counts = state[0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+        state[1] += value
+        state[2] += 1
+
+    @contextmanager
+    def time(self, labels: Labels = ()) -> Iterator[None]:
+        """Observe how long the with-block takes (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, labels)
+
+    def _merge(self, into: dict, labels: Labels, value: list) -> None:
+        counts, total, count = value
+        target = into.get(labels)
+        if target is None:
+            into[labels] = [list(counts), total, count]
+            return
+        target[0] = [a + b for a, b in zip(target[0], counts)]
+        target[1] += total
+        target[2] += count
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, (counts, total, count) in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_text} {_format_value(total)}')
+            lines.append(f'{self.name}_count{label_text} {count}')
+        return lines
+
+
+class CallbackMetric:
+    """Value read from elsewhere (e.g. a cache's own counters) at scrape time."""
+
+    def __init__(self, name: str, documentation: str, kind: str,
+                 read: Callable[[], Dict[Labels, float]], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.read = read
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for labels, value in sorted(self.read().items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}')
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric {metric.name} is already registered')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, kind: str, read: Callable[[], Dict[Labels, float]],
+                 labelnames: Sequence[str] = ()) -> CallbackMetric:
+        return self._register(CallbackMetric(name, documentation, kind, read, labelnames))
+
+    def counter_values(self) -> Dict[str, Dict[Labels, float]]:
+        """Current value of every counter, by metric name."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.values() for metric in metrics if isinstance(metric, Counter)}
+
+    def add_counts(self, counts: Dict[str, Dict[Labels, float]]) -> None:
+        """Add counter increments made in another process (see CounterDeltas)."""
+        for name, values in counts.items():
+            metric = self._metrics.get(name)
+            if isinstance(metric, Counter):
+                for labels, amount in values.items():
+                    metric.inc(amount, tuple(labels))
+
+    def get(self, name: str) -> Optional[object]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric (Prometheus text exposition format 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class CounterDeltas:
+    """Counter increments made in this process since the last take(), for a pool worker to send to its parent."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        # Forked workers inherit the parent's values; only report what changes after this
+        self._seen = registry.counter_values()
+
+    def take(self) -> Dict[str, Dict[Labels, float]]:
+        values = self.registry.counter_values()
+        deltas = {}
+        for name, current in values.items():
+            seen = self._seen.get(name, {})
+            changed = {labels: value - seen.get(labels, 0) for labels, value in current.items()
+                       if value != seen.get(labels, 0)}
+            if changed:
+                deltas[name] = changed
+        self._seen = values
+        return deltas
+
+
+# Content type for the text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+REGISTRY = MetricsRegistry()
+
+# HTTP
+HTTP_REQUESTS = REGISTRY.counter(
+    'pokerchip_http_requests_total', 'HTTP requests by route, method and status code.',
+    ('route', 'method', 'status'))
+HTTP_LATENCY = REGISTRY.histogram(
+    'pokerchip_http_request_duration_seconds', 'HTTP request latency by route.', ('route', 'method'))
+
+# Calculation engine
+ENGINE_CALCULATIONS = REGISTRY.counter(
+    'pokerchip_engine_calculations_total', 'Calculator runs by mode (auto/custom).', ('mode',))
+SHORTAGE_REPAIRS = REGISTRY.counter(
+    'pokerchip_engine_shortage_repairs_total',
+    'Calculations whose distribution had to be repaired to fit the chip inventory.', ('mode',))
+SHORTAGE_REPAIRED_DENOMINATIONS = REGISTRY.counter(
+    'pokerchip_engine_shortage_repaired_denominations_total',
+    'Denominations changed by shortage repairs.', ('mode',))
+DISTRIBUTION_TABLE_LOOKUPS = REGISTRY.counter(
+    'pokerchip_distribution_table_lookups_total', 'Mode 1 requests by table lookup outcome (hit/miss).',
+    ('outcome',))
+
+# Outbound calls (license and purchase verification)
+OUTBOUND_LATENCY = REGISTRY.histogram(
+    'pokerchip_outbound_request_duration_seconds', 'Latency of calls to external services.', ('service',))
+OUTBOUND_REQUESTS = REGISTRY.counter(
+    'pokerchip_outbound_requests_total', 'Calls to external services by outcome (ok/error).',
+    ('service', 'outcome'))
+
+
+@contextmanager
+def track_outbound(service: str) -> Iterator[None]:
+    """Time a call to an external service and count its outcome."""
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        OUTBOUND_LATENCY.observe(time.perf_counter() - start, (service,))
+        OUTBOUND_REQUESTS.inc(labels=(service, outcome))
@@ -0,0 +1,148 @@
+"""
+Process-wide Google Play Developer API client.
+
+The service object, its service-account credentials and the parsed discovery
+document are built once and shared by every request. Discovery uses the
+document bundled with google-api-python-client (no network access), and the
+OAuth token is only refreshed when it expires.
+
+httplib2 connections are not thread-safe, so each thread sends its requests
+through its own AuthorizedHttp (sharing the credentials, so the token is
+shared too).
+
+For offline development and testing, swap in a fake:
+    PLAY_CLIENT.override(FakePlayService({'token-123': {'purchaseState': 0}}))
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+PLAY_CREDENTIALS_JSON = os.environ.get('GOOGLE_PLAY_CREDENTIALS', '')
+PLAY_SCOPES = ['https://www.googleapis.com/auth/androidpublisher']
+
+
+def build_play_service(credentials_json: str):
+    """
+    Build the Android Publisher service from service-account JSON.
+
+    Args:
+        credentials_json: Service account key file contents
+
+    Returns:
+        googleapiclient Resource for androidpublisher v3
+    """
+    # Imported here so that using a fake (or never verifying a purchase) skips them
+    import google_auth_httplib2
+    import httplib2
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+    from googleapiclient.http import HttpRequest
+
+    credentials = service_account.Credentials.from_service_account_info(
+        json.loads(credentials_json),
+        scopes=PLAY_SCOPES
+    )
+    local = threading.local()
+
+    def build_request(http, *args, **kwargs):
+        # One authorized connection per thread; credentials (and the token) are shared
+        authorized = getattr(local, 'http', None)
+        if authorized is None:
+            authorized = local.http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http(timeout=10))
+        return HttpRequest(authorized, *args, **kwargs)
+
+    return build('androidpublisher', 'v3', credentials=credentials, requestBuilder=build_request,
+                 static_discovery=True, cache_discovery=False)
+
+
+class PlayClientHolder:
+    """Builds the Play service on first use and hands the same instance to every caller."""
+
+    def __init__(self, credentials_json: str = PLAY_CREDENTIALS_JSON,
+                 factory: Callable[[str], Any] = build_play_service):
+        """
+        Args:
+            credentials_json: Service account key file contents ('' = not configured)
+            factory: Builds a service from credentials_json
+        """
+        self.credentials_json = credentials_json
+        self.factory = factory
+        self._service = None
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return self._service is not None or bool(self.credentials_json)
+
+    def get(self):
+        """Get the shared service, or None if Play verification is not configured."""
+        service = self._service
+        if service is not None:
+            return service
+        if not self.credentials_json:
+            return None
+        with self._lock:
+            if self._service is None:
+                self._service = self.factory(self.credentials_json)
+            return self._service
+
+    def override(self, service) -> None:
+        """Use this service (e.g. a FakePlayService) instead of building one."""
+        with self._lock:
+            self._service = service
+
+    def reset(self) -> None:
+        """Drop the shared service; the next get() builds a new one."""
+        with self._lock:
+            self._service = None
+
+
+class _FakeCall:
+    def __init__(self, result: Callable[[], Dict[str, Any]]):
+        self._result = result
+
+    def execute(self, **kwargs) -> Dict[str, Any]:
+        return self._result()
+
+
+class FakePlayService:
+    """
+    Offline stand-in for the androidpublisher service.
+
+    Supports purchases().products().get(...) and .acknowledge(...), which is
+    all /api/verify-play-purchase uses.
+    """
+
+    def __init__(self, purchases: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            purchases: Purchase resources by purchase token (unknown tokens raise like the real API)
+        """
+        self.purchases_by_token = purchases or {}
+        self.acknowledged = []
+
+    def purchases(self):
+        return self
+
+    def products(self):
+        return self
+
+    def get(self, packageName: str, productId: str, token: str) -> _FakeCall:
+        def result():
+            if token not in self.purchases_by_token:
+                raise ValueError(f'Purchase token not found: {token}')
+            return dict(self.purchases_by_token[token])
+        return _FakeCall(result)
+
+    def acknowledge(self, packageName: str, productId: str, token: str, body: Optional[dict] = None) -> _FakeCall:
+        def result():
+            self.acknowledged.append((productId, token))
+            self.purchases_by_token.setdefault(token, {})['acknowledgementState'] = 1
+            return {}
+        return _FakeCall(result)
+
+
+# Shared client used by the API
+PLAY_CLIENT = PlayClientHolder()
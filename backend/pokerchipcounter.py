@@ -1,7 +1,33 @@
 import math
 import os
 import sys
-from typing import Dict, Any, Union, List, Optional, Tuple
+import time
+from bisect import bisect_left
+from typing import Dict, Any, Union, List, Mapping, Optional, Sequence, Tuple
+
+from chip_inventory import (
+    CHIP_SET_FILE,
+    DEFAULT_CHIP_SET,
+    read_chip_set_file
+)
+from chip_types import MINOR_UNITS, ChipInventory, Distribution, from_minor_units
+from allocation_plan import ALLOCATION_WEIGHTS, AllocationPlan, WeightTable, compile_allocation_plan
+from blind_schedule import big_blind_at_level, build_blind_schedule
+from stack_solver import solve_exact_stack
+from stage_timer import NULL_TIMER
+from metrics import ENGINE_CALCULATIONS, SHORTAGE_REPAIRED_DENOMINATIONS, SHORTAGE_REPAIRS
+
+# Mode 1 sizes the starting stack so the average stack is TARGET_END_BB big
+# blinds at level TARGET_END_LEVEL (balances duration with the chip inventory)
+TARGET_END_LEVEL = 14
+TARGET_END_BB = 12
+
+# Bump when Mode 1 allocation rules change in a way no constant captures
+# (usable denominations, shortage repair, ...); invalidates distribution tables
+ENGINE_VERSION = 1
+
+# Allocation strategies for custom stacks (see calculate_chip_distribution_custom)
+SOLVERS = ('greedy', 'exact')
 
 def validate_input(prompt: str, input_type: type, min_value: Optional[Union[int, float]] = None, 
                   max_value: Optional[Union[int, float]] = None, default: Optional[Any] = None) -> Any:
@@ -183,63 +209,170 @@ def round_to_stack_with_limit(count: int, stack_size: int, max_count: int, allow
     
     return rounded
 
-def load_chip_set() -> Dict[float, int]:
+def allocate_by_plan(plan: AllocationPlan, remaining_value: int, small_blind: float,
+                     max_per_player: Sequence[int], stack_size: int,
+                     distribution: List[int]) -> int:
+    """
+    Hand out chips from smallest to largest denomination following an allocation plan.
+    
+    Args:
+        plan: Compiled allocation plan for the usable denominations
+        remaining_value: Stack value still to distribute, in minor units
+        small_blind: Starting small blind value
+        max_per_player: Maximum chips per player for each usable denomination (inventory limit)
+        stack_size: Size of chip stacks to round to
+        distribution: Chips per player for each usable denomination, updated in place
+        
+    Returns:
+        Stack value left undistributed, in minor units
+    """
+    for column, (denom, weight, min_count, max_small_blind) in enumerate(plan.steps):
+        if max_small_blind is not None and small_blind > max_small_blind:
+            continue
+        limit = max_per_player[column]
+        if limit <= 0:
+            continue
+        if min_count == 0 and remaining_value < denom:
+            continue
+        chip_count = int(remaining_value * weight / denom)
+        chip_count = max(min_count, chip_count)
+        chip_count = round_to_stack_with_limit(chip_count, stack_size, limit)
+        if chip_count > 0:
+            distribution[column] = chip_count
+            remaining_value -= denom * chip_count
+    return remaining_value
+
+def apply_top_ups(plan: AllocationPlan, remaining_value: int, max_per_player: Sequence[int],
+                  stack_size: int, distribution: List[int]) -> int:
+    """
+    Spread leftover stack value into the plan's top-up denominations.
+    
+    Rounds the TOTAL count for each denomination (not just the additional
+    chips) so counts stay in neat stacks.
+    
+    Args:
+        plan: Compiled allocation plan for the usable denominations
+        remaining_value: Stack value still to distribute, in minor units
+        max_per_player: Maximum chips per player for each usable denomination (inventory limit)
+        stack_size: Size of chip stacks to round to
+        distribution: Chips per player for each usable denomination, updated in place
+        
+    Returns:
+        Stack value left undistributed, in minor units
+    """
+    for column, denom, min_remaining, allow_small in plan.top_ups:
+        limit = max_per_player[column]
+        if remaining_value < min_remaining or limit <= 0:
+            continue
+        current = distribution[column]
+        additional = remaining_value // denom
+        new_total = round_to_stack_with_limit(current + additional, stack_size, limit, allow_small=allow_small)
+        if new_total > current:
+            distribution[column] = new_total
+            remaining_value -= denom * (new_total - current)
+    return remaining_value
+
+def repair_shortages(distribution: List[int], denominations: Sequence[int], available_chips: Sequence[int],
+                     num_players: int, stack_size: int = 5, allow_partial: bool = False,
+                     compensate: bool = True) -> Dict[int, int]:
+    """
+    Make a distribution fit the chip inventory in a single pass.
+
+    Every over-limit denomination is cut to the largest whole number of stacks
+    the inventory allows per player. With compensate=True the value cut is
+    then handed to smaller denominations that are already in use (smallest
+    first, whole stacks of 5, only into their spare inventory), never more
+    than was cut from above them. The columns are already sorted, so this runs
+    in O(D) for D denominations.
+
+    Args:
+        distribution: Chips per player for each denomination, updated in place
+        denominations: Denominations in minor units, ascending
+        available_chips: Chip inventory for each denomination
+        num_players: Number of players sharing the inventory
+        stack_size: Over-limit counts are cut to a multiple of this
+        allow_partial: Keep a partial stack when no full stack fits
+        compensate: Move the lost value into smaller denominations
+
+    Returns:
+        Value change (minor units) per column for every count that changed:
+        positive = value lost, negative = value added as compensation
+    """
+    value_lost = {}
+    limits = [count // num_players for count in available_chips]
+
+    # Cut every over-limit denomination down to what the inventory allows
+    for column, count in enumerate(distribution):
+        if count * num_players <= available_chips[column]:
+            continue
+        new_count = (limits[column] // stack_size) * stack_size
+        if new_count == 0 and allow_partial:
+            new_count = limits[column]
+        distribution[column] = new_count
+        value_lost[column] = denominations[column] * (count - new_count)
+
+    if not compensate or not value_lost:
+        return value_lost
+
+    # Value cut from denominations above each position (suffix sums)
+    lost_above = [0] * len(distribution)
+    running = 0
+    for column in range(len(distribution) - 1, -1, -1):
+        lost_above[column] = running
+        running += value_lost.get(column, 0)
+
+    # Refill smallest first; compensation already paid out is subtracted from
+    # every later pool, so the total refilled never exceeds the total cut
+    refilled = 0
+    for column, denom in enumerate(denominations):
+        if distribution[column] == 0 and column not in value_lost:
+            # Not part of the distribution
+            continue
+        pool = lost_above[column] - refilled
+        if pool < denom * 5:
+            continue
+        spare = ((limits[column] - distribution[column]) // 5) * 5
+        additional = min((pool // denom // 5) * 5, spare)
+        if additional > 0:
+            distribution[column] += additional
+            refilled += denom * additional
+            value_lost[column] = value_lost.get(column, 0) - denom * additional
+
+    return value_lost
+
+def first_usable_column(denominations: Sequence[float], small_blind: float) -> int:
+    """
+    Get the index of the smallest denomination the blinds can use.
+    
+    Very small blinds (2 or less) can use every denomination; otherwise play
+    starts at the first denomination that is at least the small blind.
+    
+    Args:
+        denominations: Chip denominations, ascending
+        small_blind: Starting small blind value
+        
+    Returns:
+        Index of the first usable denomination (len(denominations) if none is usable)
+    """
+    if small_blind <= 2:
+        return 0
+    return bisect_left(denominations, small_blind)
+
+def load_chip_set() -> ChipInventory:
     """
     Load chip set from file or prompt user for input.
     
     Returns:
-        Dictionary mapping chip denominations to quantities
+        ChipInventory mapping chip denominations to quantities
     """
-    chip_file_path = "poker chip set counts.txt"
+    chip_file_path = CHIP_SET_FILE
     
     # Try to load from file first
     if os.path.exists(chip_file_path):
         try:
-            chip_set = {}
-            line_num = 0
-            with open(chip_file_path, "r") as f:
-                for line in f:
-                    line_num += 1
-                    line = line.strip()
-                    
-                    # Skip empty lines and comments
-                    if not line or line.startswith("#"):
-                        continue
-                    
-                    parts = line.strip().split()
-                    if len(parts) >= 2:
-                        # Validate count is positive integer
-                        count = int(parts[0])
-                        if count <= 0:
-                            raise ValueError(f"Line {line_num}: Chip count must be positive (got {count})")
-                        if count > 100000:
-                            raise ValueError(f"Line {line_num}: Chip count too large (got {count}, max 100,000)")
-                        
-                        # Handle denomination with or without $ sign
-                        denom_str = parts[1]
-                        if denom_str.startswith("$"):
-                            denom_str = denom_str[1:]
-                        denom = float(denom_str)
-                        
-                        # Validate denomination
-                        if denom <= 0:
-                            raise ValueError(f"Line {line_num}: Denomination must be positive (got {denom})")
-                        if denom > 1000000:
-                            raise ValueError(f"Line {line_num}: Denomination too large (got {denom}, max 1,000,000)")
-                        if math.isnan(denom) or math.isinf(denom):
-                            raise ValueError(f"Line {line_num}: Invalid denomination value")
-                        
-                        chip_set[denom] = count
-            
-            if chip_set:
-                # Validate chip set has reasonable denominations
-                if len(chip_set) < 2:
-                    print(f"Warning: Chip set file has only {len(chip_set)} denomination(s).")
-                    print("You need at least 2 different denominations for a good tournament.")
-                    print("Let's set up your chip set manually.\n")
-                else:
-                    print(f"Loaded chip set from {chip_file_path}")
-                    return chip_set
+            chip_set = read_chip_set_file(chip_file_path)
+            print(f"Loaded chip set from {chip_file_path}")
+            return chip_set
         except ValueError as e:
             print(f"Error in chip set file: {e}")
             print("Let's set up your chip set manually.\n")
@@ -320,7 +453,7 @@ def load_chip_set() -> Dict[float, int]:
     if len(chip_set) < 2:
         print("\nWarning: You need at least 2 different chip denominations for a good tournament.")
         print("Using default chip set instead.\n")
-        return {1: 300, 5: 200, 25: 200, 100: 200, 500: 50, 1000: 50}
+        return DEFAULT_CHIP_SET
     
     # Display summary and confirm
     while True:
@@ -369,22 +502,38 @@ def load_chip_set() -> Dict[float, int]:
             print(f"Warning: Could not save chip set to file: {e}")
     
     print()
-    return chip_set
+    return ChipInventory.from_mapping(chip_set)
 
 def calculate_chip_distribution_custom(num_players: int, small_blind: float, big_blind: float, 
-                                      target_stack: float, stack_size: int = 5) -> Dict[str, Any]:
+                                      target_stack: float, stack_size: int = 5,
+                                      chip_set: Optional[Mapping[float, int]] = None,
+                                      solver: str = 'greedy',
+                                      time_budget_ms: float = 50,
+                                      allocation_weights: WeightTable = ALLOCATION_WEIGHTS,
+                                      timer=NULL_TIMER) -> Dict[str, Any]:
     """
     Calculate optimal chip distribution for a custom stack size.
     
+    Pure function: no printing, prompting or file access, so it is safe to
+    call from thread pools, process pools and caches.
+    
     Args:
         num_players: Number of players in the tournament
         small_blind: Starting small blind value
         big_blind: Starting big blind value
         target_stack: Desired stack value per player
         stack_size: Size of chip stacks to round to (e.g., 5 or 10)
+        chip_set: Validated chip inventory to allocate from - a ChipInventory, or a mapping
+                  that is converted to one (defaults to DEFAULT_CHIP_SET)
+        solver: "greedy" for the percentage-based allocation, or "exact" to search for
+                the whole-stack distribution closest to target_stack
+        time_budget_ms: Time allowed for the exact solver; when it runs out, the best stack found
+                        so far is used (greedy if none was found)
+        allocation_weights: Anchor weight table for the allocation plan (see allocation_plan.py)
+        timer: StageTimer that records how long each stage takes (see stage_timer.py)
         
     Returns:
-        Dictionary with chip distribution per player and total stack value
+        Dictionary with the chip Distribution per player and total stack value
     """
     # Input validation
     if num_players <= 0:
@@ -397,10 +546,13 @@ def calculate_chip_distribution_custom(num_players: int, small_blind: float, big
         raise ValueError("Big blind must be at least 1")
     if small_blind > big_blind:
         raise ValueError("Small blind can't be bigger than big blind (that wouldn't make sense)")
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver}'. Must be one of: {', '.join(SOLVERS)}")
     
     # Validate numeric values aren't infinity or NaN
     for val, name in [(num_players, "players"), (small_blind, "small blind"), 
-                       (big_blind, "big blind"), (target_stack, "target stack")]:
+                       (big_blind, "big blind"), (target_stack, "target stack"),
+                       (time_budget_ms, "time budget")]:
         if math.isnan(val) or math.isinf(val):
             raise ValueError(f"Invalid {name} value - must be a normal number")
     
@@ -408,12 +560,13 @@ def calculate_chip_distribution_custom(num_players: int, small_blind: float, big
         raise ValueError("Stack size should be at least 100 big blinds")
     if target_stack > 10000000:
         raise ValueError("Stack size too large - must be under 10,000,000")
+    timer.mark('validate')
     
-    # Available chip set
-    available_chips = load_chip_set()
+    # Available chip set (supplied by the caller - the engine never reads files)
+    inventory = ChipInventory.from_mapping(chip_set) if chip_set is not None else DEFAULT_CHIP_SET
     
     # Validate chip inventory can support the players
-    total_chip_value = sum(denom * count for denom, count in available_chips.items())
+    total_chip_value = inventory.value
     max_stack_per_player = total_chip_value / num_players
     
     if target_stack > max_stack_per_player * 1.2:
@@ -427,92 +580,44 @@ def calculate_chip_distribution_custom(num_players: int, small_blind: float, big
     
     # Round target stack to nearest 100 for practical distribution
     target_stack = round(target_stack / 100) * 100
+    target_units = target_stack * MINOR_UNITS
+    timer.mark('target')
     
     # Now design chip distribution
-    # Get all available denominations
-    all_denoms = sorted(available_chips.keys())
-    
-    # Determine starting denomination
-    if small_blind <= 2:
-        # For very small blinds, we can use all denominations
-        usable_denoms = all_denoms
-    else:
-        # Find the closest denomination that's at least the small blind
-        usable_denoms = [d for d in all_denoms if d >= small_blind]
+    # For very small blinds (2 or less) every denomination is usable,
+    # otherwise start at the first denomination that's at least the small blind
+    first = first_usable_column(inventory.denominations, small_blind)
     
-    if len(usable_denoms) == 0:
-        return {'distribution': {}, 'stack_value': 0, 'big_blinds': 0, 
+    if first == len(inventory):
+        return {'distribution': Distribution((), ()), 'stack_value': 0, 'big_blinds': 0, 
                 'error': "No usable chip denominations found for the given blinds"}
     
+    # Work in integer minor units on columns aligned with the usable denominations
+    usable_units = tuple(inventory.units[first:])
+    usable_available = inventory.counts[first:]
+    
     # Calculate maximum chips per player for each denomination based on available inventory
-    max_per_player = {}
-    for denom in usable_denoms:
-        max_available = available_chips[denom] // num_players
-        max_per_player[denom] = max_available
+    max_per_player = [count // num_players for count in usable_available]
     
-    desired_distribution = {}
-    remaining_value = target_stack
+    desired_distribution = [0] * len(usable_units)
+    remaining_value = target_units
     
     # Dynamic distribution strategy that scales with target_stack
-    # Distribute chips from smallest to largest, using percentages
-    
-    # Step 1: Small denomination ($1) - 2% of stack, only for small blind ≤ 2
-    if 1 in usable_denoms and small_blind <= 2 and max_per_player.get(1, 0) > 0:
-        chip_count = int(remaining_value * 0.02 / 1)  # 2% of target stack
-        chip_count = max(10, chip_count)  # At least 10 chips
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[1])
-        if chip_count > 0:
-            desired_distribution[1] = chip_count
-            remaining_value -= 1 * chip_count
-    
-    # Step 2: $5 chips - 10% of remaining value
-    if 5 in usable_denoms and remaining_value >= 5 and max_per_player.get(5, 0) > 0:
-        chip_count = int(remaining_value * 0.10 / 5)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[5])
-        if chip_count > 0:
-            desired_distribution[5] = chip_count
-            remaining_value -= 5 * chip_count
-    
-    # Step 3: $25 chips - 15% of remaining value
-    if 25 in usable_denoms and remaining_value >= 25 and max_per_player.get(25, 0) > 0:
-        chip_count = int(remaining_value * 0.15 / 25)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[25])
-        if chip_count > 0:
-            desired_distribution[25] = chip_count
-            remaining_value -= 25 * chip_count
-    
-    # Step 4: $100 chips - 25% of remaining value
-    if 100 in usable_denoms and remaining_value >= 100 and max_per_player.get(100, 0) > 0:
-        chip_count = int(remaining_value * 0.25 / 100)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[100])
-        if chip_count > 0:
-            desired_distribution[100] = chip_count
-            remaining_value -= 100 * chip_count
-    
-    # Step 5: $500 chips - 20% of remaining value
-    if 500 in usable_denoms and remaining_value >= 500 and max_per_player.get(500, 0) > 0:
-        chip_count = int(remaining_value * 0.20 / 500)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[500])
-        if chip_count > 0:
-            desired_distribution[500] = chip_count
-            remaining_value -= 500 * chip_count
-    
-    # Step 6: $1000 chips - Use remaining value, trying to reach target
-    if 1000 in usable_denoms and remaining_value >= 1000 and max_per_player.get(1000, 0) > 0:
-        chip_count = int(remaining_value / 1000)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[1000])
-        if chip_count > 0:
-            desired_distribution[1000] = chip_count
-            remaining_value -= 1000 * chip_count
+    # Distribute chips from smallest to largest, using the shared percentage plan
+    plan = compile_allocation_plan(usable_units, allocation_weights)
+    remaining_value = allocate_by_plan(plan, remaining_value, small_blind, max_per_player,
+                                       stack_size, desired_distribution)
+    timer.mark('allocate')
     
     # Step 7: Fill remaining gap with highest denomination available
     # Try to get as close as possible to target stack
     if remaining_value > 0:
-        for denom in reversed(sorted(usable_denoms)):
-            if remaining_value >= denom and max_per_player.get(denom, 0) > 0:
-                current_count = desired_distribution.get(denom, 0)
-                additional = int(remaining_value / denom)
-                max_additional = max_per_player[denom] - current_count
+        for column in range(len(usable_units) - 1, -1, -1):
+            denom = usable_units[column]
+            if remaining_value >= denom and max_per_player[column] > 0:
+                current_count = desired_distribution[column]
+                additional = remaining_value // denom
+                max_additional = max_per_player[column] - current_count
                 additional = min(additional, max_additional)
                 
                 if additional > 0:
@@ -520,59 +625,80 @@ def calculate_chip_distribution_custom(num_players: int, small_blind: float, big
                     new_count = current_count + additional
                     rounded_count = round_to_stack(new_count, stack_size)
                     if rounded_count > current_count:
-                        desired_distribution[denom] = rounded_count
+                        desired_distribution[column] = rounded_count
                         remaining_value -= denom * (rounded_count - current_count)
                         break
     
-    # Calculate final stack value
-    actual_stack_value = sum(denom * count for denom, count in desired_distribution.items())
+    timer.mark('fill')
     
-    # Check if we have all chips available and ADJUST if needed
-    chips_available = True
-    shortage_info = []
+    # Check if we have all chips available and ADJUST if needed: reduce each
+    # over-limit denomination to the maximum available chips per player
     adjusted_distribution = desired_distribution.copy()
+    value_lost = repair_shortages(adjusted_distribution, usable_units, usable_available, num_players, stack_size,
+                                  allow_partial=True, compensate=False)
+    chips_available = not value_lost
+    shortage_info = [f"Reduced ${inventory.denominations[first + column]} chips from "
+                     f"{desired_distribution[column]} to {adjusted_distribution[column]} "
+                     f"per player (inventory limit)" for column in sorted(value_lost)]
+    timer.mark('repair')
+    
+    # Actual stack value with the adjusted distribution (exact, in minor units)
+    actual_stack_units = sum(denom * count for denom, count in zip(usable_units, adjusted_distribution))
+    
+    # Exact solver: search whole-stack allocations for the stack closest to the
+    # target, preferring the greedy mix. If out of time, the best stack found so
+    # far is used (solver_timed_out); with none found it falls back to greedy.
+    solver_timed_out = False
+    if solver == 'exact':
+        deadline = time.monotonic() + max(0.0, time_budget_ms) / 1000
+        solution = solve_exact_stack(target_units, usable_units, max_per_player, stack_size,
+                                     preferred=adjusted_distribution, deadline=deadline)
+        if solution is None or not solution.complete:
+            solver_timed_out = True
+        if solution is None:
+            solver = 'greedy'
+        else:
+            exact_distribution = solution.counts
+            exact_stack_units = sum(denom * count for denom, count in zip(usable_units, exact_distribution))
+            if abs(target_units - exact_stack_units) <= abs(target_units - actual_stack_units):
+                adjusted_distribution = exact_distribution
+                actual_stack_units = exact_stack_units
+                # Every count is within the per-player inventory limit
+                chips_available = True
+            else:
+                # Greedy's partial stacks got closer than whole stacks can
+                solver = 'greedy'
     
-    for denom in adjusted_distribution:
-        needed = adjusted_distribution[denom] * num_players
-        available = available_chips[denom]
-        
-        if needed > available:
-            chips_available = False
-            shortage = needed - available
-            # ACTUALLY ADJUST: reduce to maximum available chips per player
-            max_per_player_actual = available // num_players
-            old_count = adjusted_distribution[denom]
-            
-            # Try to round down to nearest stack size, but allow ANY amount if rounding gives 0
-            adjusted_count = (max_per_player_actual // stack_size) * stack_size
-            if adjusted_count == 0 and max_per_player_actual > 0:
-                # Use whatever we can fit (even if not a full stack)
-                adjusted_count = max_per_player_actual
-            
-            adjusted_distribution[denom] = adjusted_count
-            shortage_info.append(f"Reduced ${denom} chips from {old_count} to {adjusted_count} per player (inventory limit)")
-    
-    # Recalculate actual stack value with adjusted distribution
-    actual_stack_value = sum(denom * count for denom, count in adjusted_distribution.items())
+    timer.mark('solver')
     
+    actual_stack_value = from_minor_units(actual_stack_units)
     result = {
-        'distribution': adjusted_distribution,
+        'distribution': Distribution.from_columns(usable_units, adjusted_distribution),
         'stack_value': actual_stack_value,
         'big_blinds': actual_stack_value / big_blind,
-        'available_chips': available_chips
+        'available_chips': inventory,
+        'solver': solver
     }
     
+    if solver_timed_out:
+        result['solver_timed_out'] = True
+    
     if not chips_available:
         result['warning'] = "Adjusted distribution to fit available chip inventory"
         result['shortage_info'] = shortage_info
+        result['value_lost'] = {inventory.denominations[first + column]: from_minor_units(lost)
+                                for column, lost in sorted(value_lost.items())}
+    if value_lost:
+        SHORTAGE_REPAIRS.inc(labels=('custom',))
+        SHORTAGE_REPAIRED_DENOMINATIONS.inc(len(value_lost), labels=('custom',))
+    ENGINE_CALCULATIONS.inc(labels=('custom',))
     
     return result
 
-def calculate_chip_distribution(num_players: int, small_blind: float, big_blind: float, 
-                               duration_hours: float, minutes_per_level: int, 
-                               stack_size: int = 1) -> Dict[str, Any]:
+def validate_tournament_inputs(num_players: int, small_blind: float, big_blind: float,
+                               duration_hours: float, minutes_per_level: int) -> int:
     """
-    Calculate optimal poker chip distribution for tournament play.
+    Validate Mode 1 tournament inputs.
     
     Args:
         num_players: Number of players in the tournament
@@ -580,10 +706,12 @@ def calculate_chip_distribution(num_players: int, small_blind: float, big_blind:
         big_blind: Starting big blind value
         duration_hours: Expected tournament duration in hours
         minutes_per_level: Minutes between blind level increases
-        stack_size: Size of chip stacks to round to (e.g., 5 or 10)
         
     Returns:
-        Dictionary with chip distribution per player and total stack value
+        Number of blind levels in the tournament
+        
+    Raises:
+        ValueError: If any input is out of range
     """
     # Input validation
     if num_players <= 0:
@@ -622,38 +750,151 @@ def calculate_chip_distribution(num_players: int, small_blind: float, big_blind:
         raise ValueError(f"Too many blind levels! With {duration_hours} hours and {minutes_per_level} min/level, "
                         f"you get {num_levels} levels. Try longer blind intervals or shorter duration")
     
-    # Available chip set
-    available_chips = load_chip_set()
+    return num_levels
+
+def calculate_chip_distribution(num_players: int, small_blind: float, big_blind: float, 
+                               duration_hours: float, minutes_per_level: int, 
+                               stack_size: int = 1,
+                               chip_set: Optional[Mapping[float, int]] = None,
+                               allocation_weights: WeightTable = ALLOCATION_WEIGHTS,
+                               timer=NULL_TIMER) -> Dict[str, Any]:
+    """
+    Calculate optimal poker chip distribution for tournament play.
+    
+    Pure function: no printing, prompting or file access, so it is safe to
+    call from thread pools, process pools and caches.
+    
+    Args:
+        num_players: Number of players in the tournament
+        small_blind: Starting small blind value
+        big_blind: Starting big blind value
+        duration_hours: Expected tournament duration in hours
+        minutes_per_level: Minutes between blind level increases
+        stack_size: Size of chip stacks to round to (e.g., 5 or 10)
+        chip_set: Validated chip inventory to allocate from - a ChipInventory, or a mapping
+                  that is converted to one (defaults to DEFAULT_CHIP_SET)
+        allocation_weights: Anchor weight table for the allocation plan (see allocation_plan.py)
+        timer: StageTimer that records how long each stage takes (see stage_timer.py)
+        
+    Returns:
+        Dictionary with the chip Distribution per player and total stack value
+    """
+    # Input validation
+    num_levels = validate_tournament_inputs(num_players, small_blind, big_blind,
+                                            duration_hours, minutes_per_level)
+    timer.mark('validate')
+    
+    # Available chip set (supplied by the caller - the engine never reads files)
+    inventory = ChipInventory.from_mapping(chip_set) if chip_set is not None else DEFAULT_CHIP_SET
     
     # Validate chip inventory can support the players
-    total_chip_value = sum(denom * count for denom, count in available_chips.items())
-    max_stack_per_player = total_chip_value / num_players
+    max_stack_per_player = inventory.value / num_players
+    check_chip_depth(num_players, big_blind, max_stack_per_player)
     
-    if num_players > 1 and total_chip_value / num_players < big_blind * 50:
+    target_stack, stack_was_adjusted = auto_target_stack(big_blind, max_stack_per_player)
+    timer.mark('target')
+    
+    # Now design chip distribution
+    # Priority: Focus on middle denominations ($5, $25, $100)
+    # Reduce $1 chips (don't last long) and limit high-value chips (come into play too late)
+    
+    # Find which denominations are usable
+    # Modified rule: Prefer starting with $5 chips when possible
+    # Only use $1 chips if small blind is $1 or $2
+    # For higher blinds, start with the denomination closest to the small blind
+    
+    first = first_usable_column(inventory.denominations, small_blind)
+    
+    if first == len(inventory):
+        return {'distribution': Distribution((), ()), 'stack_value': 0, 'big_blinds': 0, 
+                'target_level': 0, 'total_levels': num_levels,
+                'minutes_per_level': minutes_per_level,
+                'error': "No usable chip denominations found for the given blinds"}
+    
+    # Work in integer minor units on columns aligned with the usable denominations
+    usable_units = tuple(inventory.units[first:])
+    usable_available = inventory.counts[first:]
+    
+    # Calculate maximum chips per player for each denomination based on available inventory
+    # This prevents us from allocating more than we have
+    # Note: We DON'T round here - we'll round when actually allocating chips
+    max_per_player = [count // num_players for count in usable_available]
+    
+    # Dynamic distribution strategy that scales with target_stack
+    # Distribute chips from smallest to largest, using the shared percentage plan
+    plan = compile_allocation_plan(usable_units, allocation_weights)
+    desired_distribution, value_lost = allocate_stack(plan, usable_units, target_stack, small_blind,
+                                                      usable_available, max_per_player, num_players,
+                                                      stack_size, timer)
+    
+    final_distribution = Distribution.from_columns(usable_units, desired_distribution)
+    
+    # Calculate actual starting stack
+    actual_stack = final_distribution.value
+    
+    # Calculate big blinds
+    starting_big_blinds = actual_stack / big_blind if big_blind > 0 else 0
+    
+    result = {
+        'distribution': final_distribution,
+        'stack_value': actual_stack,
+        'big_blinds': starting_big_blinds,
+        'target_level': TARGET_END_LEVEL,
+        'total_levels': num_levels,
+        'minutes_per_level': minutes_per_level,
+        'available_chips': inventory,
+        'stack_size': stack_size,
+        'stack_was_adjusted': stack_was_adjusted,
+        'max_stack_per_player': max_stack_per_player,
+        'blind_schedule': build_blind_schedule(small_blind, big_blind, num_levels,
+                                               inventory.denominations[first:], actual_stack)
+    }
+    
+    # Note: We've enforced chip availability, so warning/shortage_info are for informational purposes only
+    # The actual distribution will always fit within available inventory
+    if value_lost:
+        result.update(describe_shortages(value_lost, inventory.denominations[first:]))
+        SHORTAGE_REPAIRS.inc(labels=('auto',))
+        SHORTAGE_REPAIRED_DENOMINATIONS.inc(len(value_lost), labels=('auto',))
+    ENGINE_CALCULATIONS.inc(labels=('auto',))
+    timer.mark('schedule')
+    
+    return result
+
+
+def check_chip_depth(num_players: int, big_blind: float, max_stack_per_player: float) -> None:
+    """
+    Check that the chip set can give every player a playable stack.
+    
+    Raises:
+        ValueError: If each player would get less than 50 big blinds
+    """
+    if num_players > 1 and max_stack_per_player < big_blind * 50:
         raise ValueError(f"Not enough chips in your set for {num_players} players! "
                         f"Each player would get less than 50 big blinds")
+
+
+def auto_target_stack(big_blind: float, max_stack_per_player: float) -> Tuple[float, bool]:
+    """
+    Pick the Mode 1 starting stack.
     
-    # Calculate number of blind levels based on tournament duration
-    total_minutes = duration_hours * 60
-    num_levels = max(1, int(total_minutes / minutes_per_level))
-    
+    Args:
+        big_blind: Starting big blind value
+        max_stack_per_player: Total chip set value divided by the number of players
+        
+    Returns:
+        (target_stack, stack_was_adjusted) - adjusted means the stack was capped by the chip set
+    """
     # Calculate blind structure progression
     # Use consistent 1.5x multiplier for all levels
     # This provides steady, predictable blind increases
     
-    # Target finish: Level 14 with average stack of 12 BB
-    # This balances tournament duration with available chip inventory
-    target_end_level = 14
-    target_end_bb = 12
-    
     # Calculate what the big blind will be at the target end level
-    current_bb = big_blind
-    for level in range(1, target_end_level):
-        # Multiply by 1.5 every level
-        current_bb *= 1.5
+    # (closed form: the big blind multiplies by 1.5 every level)
+    current_bb = big_blind_at_level(big_blind, TARGET_END_LEVEL)
     
-    # Calculate starting stack needed to have target_end_bb at the end level
-    target_stack = current_bb * target_end_bb
+    # Calculate starting stack needed to have TARGET_END_BB at the end level
+    target_stack = current_bb * TARGET_END_BB
     
     # AUTO-ADJUSTMENT: If calculated stack exceeds available chips, adjust to maximum
     # This makes Mode 1 "dummy proof" - it always gives the best possible result
@@ -683,278 +924,69 @@ def calculate_chip_distribution(num_players: int, small_blind: float, big_blind:
     if target_stack < min_stack:
         target_stack = round(min_stack / 100) * 100
     
-    # Now design chip distribution
-    # Priority: Focus on middle denominations ($5, $25, $100)
-    # Reduce $1 chips (don't last long) and limit high-value chips (come into play too late)
-    
-    # Find which denominations are usable
-    # Modified rule: Prefer starting with $5 chips when possible
-    # Only use $1 chips if small blind is $1 or $2
-    # For higher blinds, start with the denomination closest to the small blind
-    
-    # Get all available denominations
-    all_denoms = sorted(available_chips.keys())
-    
-    # Determine starting denomination
-    if small_blind <= 2:
-        # For very small blinds, we can use all denominations
-        usable_denoms = all_denoms
-    else:
-        # Find the closest denomination that's at least the small blind
-        usable_denoms = [d for d in all_denoms if d >= small_blind]
-    
-    if len(usable_denoms) == 0:
-        return {'distribution': {}, 'stack_value': 0, 'big_blinds': 0, 
-                'target_level': 0, 'total_levels': num_levels,
-                'minutes_per_level': minutes_per_level,
-                'error': "No usable chip denominations found for the given blinds"}
-    
-    # Calculate maximum chips per player for each denomination based on available inventory
-    # This prevents us from allocating more than we have
-    # Note: We DON'T round here - we'll round when actually allocating chips
-    max_per_player = {}
-    for denom in usable_denoms:
-        max_available = available_chips[denom] // num_players
-        max_per_player[denom] = max_available
-    
-    desired_distribution = {}
-    remaining_value = target_stack
-    
-    # Dynamic distribution strategy that scales with target_stack
-    # Distribute chips from smallest to largest, using percentages
-    
-    # Step 1: Small denomination ($1) - 2% of stack, only for small blind ≤ 2
-    if 1 in usable_denoms and small_blind <= 2 and max_per_player.get(1, 0) > 0:
-        chip_count = int(remaining_value * 0.02 / 1)  # 2% of target stack
-        chip_count = max(10, chip_count)  # At least 10 chips
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[1])
-        if chip_count > 0:
-            desired_distribution[1] = chip_count
-            remaining_value -= 1 * chip_count
-    
-    # Step 2: $5 chips - 10% of remaining value
-    if 5 in usable_denoms and remaining_value >= 5 and max_per_player.get(5, 0) > 0:
-        chip_count = int(remaining_value * 0.10 / 5)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[5])
-        if chip_count > 0:
-            desired_distribution[5] = chip_count
-            remaining_value -= 5 * chip_count
-    
-    # Step 3: $25 chips - 15% of remaining value
-    if 25 in usable_denoms and remaining_value >= 25 and max_per_player.get(25, 0) > 0:
-        chip_count = int(remaining_value * 0.15 / 25)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[25])
-        if chip_count > 0:
-            desired_distribution[25] = chip_count
-            remaining_value -= 25 * chip_count
-    
-    # Step 4: $100 chips - 25% of remaining value
-    if 100 in usable_denoms and remaining_value >= 100 and max_per_player.get(100, 0) > 0:
-        chip_count = int(remaining_value * 0.25 / 100)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[100])
-        if chip_count > 0:
-            desired_distribution[100] = chip_count
-            remaining_value -= 100 * chip_count
-    
-    # Step 5: $500 chips - 20% of remaining value
-    if 500 in usable_denoms and remaining_value >= 500 and max_per_player.get(500, 0) > 0:
-        chip_count = int(remaining_value * 0.20 / 500)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[500])
-        if chip_count > 0:
-            desired_distribution[500] = chip_count
-            remaining_value -= 500 * chip_count
-    
-    # Step 6: $1000 chips - Use ALL remaining value
-    if 1000 in usable_denoms and remaining_value >= 1000 and max_per_player.get(1000, 0) > 0:
-        chip_count = int(remaining_value / 1000)
-        chip_count = round_to_stack_with_limit(chip_count, stack_size, max_per_player[1000])
-        if chip_count > 0:
-            desired_distribution[1000] = chip_count
-            remaining_value -= 1000 * chip_count
-    
-    # Step 7: If we still have significant value left, distribute it to middle denominations
-    # CRITICAL FIX: Round the TOTAL count, not just the additional amount!
-    if remaining_value >= 500 and 100 in usable_denoms and max_per_player.get(100, 0) > 0:
-        # Add more $100 chips with remaining value
-        current = desired_distribution.get(100, 0)
-        additional = int(remaining_value / 100)
-        # Calculate the new total and round it properly
-        new_total = current + additional
-        max_allowed = max_per_player[100]
-        # Round the TOTAL to maintain multiples of 5
-        new_total = round_to_stack_with_limit(new_total, stack_size, max_allowed)
-        if new_total > current:
-            actual_additional = new_total - current
-            desired_distribution[100] = new_total
-            remaining_value -= 100 * actual_additional
-    
-    if remaining_value >= 100 and 25 in usable_denoms and max_per_player.get(25, 0) > 0:
-        # Add more $25 chips with remaining value
-        current = desired_distribution.get(25, 0)
-        additional = int(remaining_value / 25)
-        # Calculate the new total and round it properly
-        new_total = current + additional
-        max_allowed = max_per_player[25]
-        # Round the TOTAL to maintain multiples of 5
-        new_total = round_to_stack_with_limit(new_total, stack_size, max_allowed)
-        if new_total > current:
-            actual_additional = new_total - current
-            desired_distribution[25] = new_total
-            remaining_value -= 25 * actual_additional
+    return target_stack, stack_was_adjusted
+
+
+def allocate_stack(plan: AllocationPlan, denominations: Sequence[int], target_stack: float, small_blind: float,
+                   available_chips: Sequence[int], max_per_player: Sequence[int], num_players: int,
+                   stack_size: int, timer=NULL_TIMER) -> Tuple[List[int], Dict[int, int]]:
+    """
+    Turn a target stack into chips per player: plan allocation, top-ups, then shortage repair.
     
-    # Step 8: If still have remaining value, prioritize WORKHORSES over storage chips
-    # Priority order: $100 (best), $25 (good), $5 (okay), then higher denoms if needed
-    # CRITICAL FIX: Round the TOTAL count, not just the additional amount!
-    if remaining_value > 0:
-        # Try $100 first (the main workhorse)
-        if 100 in usable_denoms and remaining_value >= 100 and max_per_player.get(100, 0) > 0:
-            current = desired_distribution.get(100, 0)
-            additional = int(remaining_value / 100)
-            new_total = current + additional
-            max_allowed = max_per_player[100]
-            # Round the TOTAL to maintain multiples of 5
-            new_total = round_to_stack_with_limit(new_total, stack_size, max_allowed)
-            if new_total > current:
-                actual_additional = new_total - current
-                desired_distribution[100] = new_total
-                remaining_value -= 100 * actual_additional
-        
-        # If still remaining, try $500/$1000 as last resort (allow small amounts to avoid waste)
-        # Use allow_small=True to permit 1-4 chip allocations when it prevents waste
-        if remaining_value >= 500:
-            if 500 in usable_denoms and max_per_player.get(500, 0) > 0:
-                current = desired_distribution.get(500, 0)
-                max_allowed = max_per_player[500]
-                additional = int(remaining_value / 500)
-                if additional > 0:
-                    # Allow small allocations (1-4 chips) when redistributing to avoid waste
-                    new_total = round_to_stack_with_limit(current + additional, stack_size, max_allowed, allow_small=True)
-                    if new_total > current:
-                        actual_additional = new_total - current
-                        desired_distribution[500] = new_total
-                        remaining_value -= 500 * actual_additional
+    Args:
+        plan: Compiled allocation plan for the usable denominations
+        denominations: Usable denominations in minor units, ascending
+        target_stack: Stack value to hand out
+        small_blind: Starting small blind value
+        available_chips: Chip inventory for each usable denomination
+        max_per_player: available_chips // num_players for each usable denomination
+        num_players: Number of players sharing the inventory
+        stack_size: Size of chip stacks to round to
+        timer: StageTimer for the allocate/top_up/repair stages
         
-        if remaining_value >= 1000:
-            if 1000 in usable_denoms and max_per_player.get(1000, 0) > 0:
-                current = desired_distribution.get(1000, 0)
-                max_allowed = max_per_player[1000]
-                additional = int(remaining_value / 1000)
-                if additional > 0:
-                    # Allow small allocations (1-4 chips) when redistributing to avoid waste
-                    new_total = round_to_stack_with_limit(current + additional, stack_size, max_allowed, allow_small=True)
-                    if new_total > current:
-                        actual_additional = new_total - current
-                        desired_distribution[1000] = new_total
-                        remaining_value -= 1000 * actual_additional
+    Returns:
+        (chips per player for each usable denomination, value lost per column - see repair_shortages)
+    """
+    distribution = [0] * len(denominations)
+    remaining_value = target_stack * MINOR_UNITS
+    remaining_value = allocate_by_plan(plan, remaining_value, small_blind, max_per_player,
+                                       stack_size, distribution)
+    timer.mark('allocate')
+    
+    # Steps 7-8: If we still have significant value left, distribute it to the
+    # middle "workhorse" denominations, then larger chips as a last resort
+    remaining_value = apply_top_ups(plan, remaining_value, max_per_player, stack_size, distribution)
+    timer.mark('top_up')
     
     # Note: Stack value may not be exactly at target since we prioritize
     # easy-to-count chip stacks (multiples of 5) over precise values
     
-    # Step 5: Check if we have enough chips in the set
-    final_distribution = {}
-    chips_available = True
-    shortage_info = []
-    
-    for denom, count_per_player in desired_distribution.items():
-        total_needed = count_per_player * num_players
-        if total_needed > available_chips[denom]:
-            chips_available = False
-            shortage_info.append(f"${format_denomination(denom)} chips: need {total_needed}, have {available_chips[denom]}")
+    # Step 5: Make sure the distribution fits the chip set (single repair pass)
+    value_lost = repair_shortages(distribution, denominations, available_chips, num_players)
+    timer.mark('repair')
+    return distribution, value_lost
+
+
+def describe_shortages(value_lost: Mapping[int, int], denominations: Sequence[float]) -> Dict[str, Any]:
+    """
+    Build the Mode 1 warning fields for a shortage repair.
     
-    # If not enough chips, adjust the distribution
-    if not chips_available:
-        # Reduce chip counts to fit available inventory
-        attempts = 0
-        max_attempts = 20
+    Args:
+        value_lost: Value change per column from repair_shortages
+        denominations: The usable denominations the columns refer to
         
-        while not chips_available and attempts < max_attempts:
-            attempts += 1
-            
-            # Find which denomination is over limit
-            for denom in sorted(desired_distribution.keys(), reverse=True):  # Start with highest denominations
-                total_needed = desired_distribution[denom] * num_players
-                if total_needed > available_chips[denom]:
-                    # Calculate max chips per player that fits inventory
-                    max_per_player = available_chips[denom] // num_players
-                    
-                    # Round DOWN to nearest stack of 5, ensuring we don't exceed available chips
-                    max_per_player = (max_per_player // 5) * 5
-                    
-                    # Double-check this doesn't exceed available inventory
-                    while max_per_player > 0 and (max_per_player * num_players) > available_chips[denom]:
-                        max_per_player -= 5
-                    
-                    # Make sure we don't go negative
-                    max_per_player = max(0, max_per_player)
-                    
-                    # Calculate value lost by reducing this denomination
-                    value_lost = denom * (desired_distribution[denom] - max_per_player)
-                    desired_distribution[denom] = max_per_player
-                    
-                    # Try to compensate with lower denominations if value was lost
-                    if value_lost > 0:
-                        for lower_denom in sorted([d for d in desired_distribution.keys() if d < denom]):
-                            if lower_denom in available_chips:
-                                # How many chips of this lower denom would replace the value?
-                                additional_chips = int(value_lost / lower_denom)
-                                additional_chips = (additional_chips // 5) * 5  # Keep stacks of 5
-                                
-                                # Check if we have room for these additional chips
-                                current_total = (desired_distribution.get(lower_denom, 0) + additional_chips) * num_players
-                                if current_total <= available_chips[lower_denom]:
-                                    desired_distribution[lower_denom] = desired_distribution.get(lower_denom, 0) + additional_chips
-                                    value_lost -= lower_denom * additional_chips
-                                    if value_lost <= 0:
-                                        break
-            
-            # Check if all denominations now fit
-            chips_available = True
-            shortage_info = []
-            for denom, count_per_player in desired_distribution.items():
-                total_needed = count_per_player * num_players
-                if total_needed > available_chips[denom]:
-                    chips_available = False
-                    shortage_info.append(f"${format_denomination(denom)} chips: need {total_needed}, have {available_chips[denom]}")
-    
-    # FINAL ENFORCEMENT: If still short after all attempts, force fit to inventory
-    if not chips_available:
-        for denom in desired_distribution:
-            total_needed = desired_distribution[denom] * num_players
-            if total_needed > available_chips[denom]:
-                # Force reduction to maximum available
-                max_per_player = available_chips[denom] // num_players
-                # Try to round down to nearest multiple of 5, but allow any amount if rounding gives 0
-                rounded = (max_per_player // 5) * 5
-                if rounded == 0 and max_per_player > 0:
-                    # Use whatever we can fit (even if not a full stack of 5)
-                    rounded = max_per_player
-                desired_distribution[denom] = max(0, rounded)
-    
-    final_distribution = desired_distribution
-    
-    # Calculate actual starting stack
-    actual_stack = sum(denom * count for denom, count in final_distribution.items())
-    
-    # Calculate big blinds
-    starting_big_blinds = actual_stack / big_blind if big_blind > 0 else 0
-    
-    result = {
-        'distribution': final_distribution,
-        'stack_value': actual_stack,
-        'big_blinds': starting_big_blinds,
-        'target_level': target_end_level,
-        'total_levels': num_levels,
-        'minutes_per_level': minutes_per_level,
-        'available_chips': available_chips,
-        'stack_size': stack_size,
-        'stack_was_adjusted': stack_was_adjusted,
-        'max_stack_per_player': max_stack_per_player
+    Returns:
+        'warning', 'shortage_info' and 'value_lost' result fields
+    """
+    value_lost = {denominations[column]: from_minor_units(lost) for column, lost in sorted(value_lost.items())}
+    return {
+        'warning': "Adjusted distribution to fit available chip inventory",
+        'shortage_info': [
+            f"${format_denomination(denom)} chips: {'lost' if lost > 0 else 'added'} ${abs(lost):,.2f} per player"
+            for denom, lost in value_lost.items()
+        ],
+        'value_lost': value_lost
     }
-    
-    # Note: We've enforced chip availability, so warning/shortage_info are for informational purposes only
-    # The actual distribution will always fit within available inventory
-    
-    return result
 
 
 def clear_screen():
@@ -965,6 +997,9 @@ def clear_screen():
 def main():
     """Main program function."""
     try:
+        # Load (or interactively set up) the chip set once for this session
+        chip_set = load_chip_set()
+        
         while True:
             clear_screen()
             print("=" * 50)
@@ -1015,7 +1050,8 @@ def main():
                     print("\nCalculating the perfect chip distribution...")
                     
                     # Calculate distribution
-                    result = calculate_chip_distribution(num_players, small_blind, big_blind, duration, blind_interval, stack_size)
+                    result = calculate_chip_distribution(num_players, small_blind, big_blind, duration, blind_interval, stack_size,
+                                                         chip_set=chip_set)
                 else:
                     # Custom stack mode
                     custom_stack = validate_input("What stack size do you want per player? (e.g., 8500)", float, big_blind * 100, 100000)
@@ -1023,7 +1059,8 @@ def main():
                     print("\nCalculating chip distribution for your custom stack...")
                     
                     # Calculate distribution with custom stack
-                    result = calculate_chip_distribution_custom(num_players, small_blind, big_blind, custom_stack, stack_size)
+                    result = calculate_chip_distribution_custom(num_players, small_blind, big_blind, custom_stack, stack_size,
+                                                                chip_set=chip_set)
                 
                 # Check for errors
                 if 'error' in result:
@@ -1076,6 +1113,14 @@ def main():
                             print("\n📊 AUTO-ADJUSTED:")
                             print(f"   Stack size optimized to fit your chip set for {num_players} players")
                             print(f"   (Maximum available: ${result.get('max_stack_per_player', 0):,.0f} per player)")
+                        
+                        print("\n" + "=" * 50)
+                        print("BLIND STRUCTURE")
+                        print("=" * 50)
+                        for level in result['blind_schedule']:
+                            print(f"Level {level['level']:3d}: ${format_denomination(level['small_blind'])}"
+                                  f"/${format_denomination(level['big_blind'])}"
+                                  f"  ({level['stack_big_blinds']} BB)")
                     
                     # Show total chips needed from set
                     print("\n" + "=" * 50)
@@ -0,0 +1,195 @@
+"""
+Response shaping and encoding for the calculation endpoints.
+
+- fields=a,b,c keeps only the named top-level fields of a result ("error" is always kept)
+- schema=2 returns the compact schema: denomination-keyed maps become arrays
+  aligned with a "denominations" list, and the blind schedule becomes columns
+- Accept: application/msgpack returns MessagePack instead of JSON (if msgpack is installed)
+- Larger API responses are gzip-compressed for clients that accept it
+
+JSON is encoded with orjson when it is installed (pip install -r requirements-optional.txt);
+otherwise Flask's standard encoder is used. Either way, ChipInventory and
+Distribution values are encoded as {denomination: count} objects.
+"""
+
+import gzip
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask.json.provider import DefaultJSONProvider
+
+from chip_types import ChipInventory, Distribution
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Responses smaller than this are sent uncompressed (gzip overhead outweighs the savings)
+GZIP_MIN_BYTES = int(os.environ.get('GZIP_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', '6'))
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/msgpack', 'text/')
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+# Result fields keyed by denomination (become arrays in the compact schema)
+DENOMINATION_FIELDS = ('distribution', 'available_chips', 'value_lost')
+
+# Fields kept by a fields= projection even when not asked for
+ALWAYS_KEPT_FIELDS = ('error', 'schema', 'denominations', '_timings')
+
+SCHEMA_VERSIONS = (1, 2)
+
+
+def encode_default(obj: Any) -> Any:
+    """JSON fallback for objects the encoder doesn't know (chip types become plain objects)."""
+    if isinstance(obj, ChipInventory):
+        # Inventories ("available_chips", "chip_set") have always been sent with
+        # float keys ("25.0", "0.25"); clients look them up that way
+        return {float(denom): count for denom, count in obj.items()}
+    if isinstance(obj, Distribution):
+        return obj.to_dict()
+    return DefaultJSONProvider.default(obj)
+
+
+class ChipJSONProvider(DefaultJSONProvider):
+    """Flask's standard JSON provider, also encoding ChipInventory and Distribution."""
+
+    default = staticmethod(encode_default)
+
+
+class FastJSONProvider(ChipJSONProvider):
+    """
+    Flask JSON provider encoding with orjson.
+
+    Keys keep their insertion order instead of being sorted (denomination
+    maps are built in ascending order, which a string sort would break).
+    Objects orjson doesn't know go through encode_default.
+    """
+
+    _options = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options).decode('utf-8')
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """Parse a fields= query value ("distribution,stack_value") - None means all fields."""
+    if not value:
+        return None
+    return [field.strip() for field in value.split(',') if field.strip()]
+
+
+def parse_schema(value: Optional[str]) -> int:
+    """
+    Parse a schema= query value.
+
+    Raises:
+        ValueError: If the version is not supported
+    """
+    if not value:
+        return 1
+    try:
+        schema = int(value)
+    except ValueError:
+        schema = 0
+    if schema not in SCHEMA_VERSIONS:
+        raise ValueError(f'Invalid schema: {value}. Must be 1 or 2')
+    return schema
+
+
+def compact_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a calculation result to the compact (schema 2) layout.
+
+    {"distribution": {"25.0": 15, "100.0": 15}, "available_chips": {...}} becomes
+    {"schema": 2, "denominations": [1.0, 5.0, 25.0, 100.0], "distribution": [0, 0, 15, 15], ...}
+    and the blind schedule becomes {"level": [...], "small_blind": [...], ...}.
+    """
+    denominations = set()
+    for field in DENOMINATION_FIELDS:
+        if isinstance(result.get(field), Mapping):
+            denominations.update(result[field])
+    denominations = sorted(denominations)
+
+    compact = {'schema': 2, 'denominations': denominations}
+    for field, value in result.items():
+        if field in DENOMINATION_FIELDS and isinstance(value, Mapping):
+            compact[field] = [value.get(denom, 0) for denom in denominations]
+        elif field == 'blind_schedule' and value:
+            compact[field] = {column: [row[column] for row in value] for column in value[0]}
+        else:
+            compact[field] = value
+    return compact
+
+
+def select_fields(result: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Keep only the requested top-level fields (plus ALWAYS_KEPT_FIELDS); unknown names are ignored."""
+    if fields is None:
+        return result
+    wanted = set(fields).union(ALWAYS_KEPT_FIELDS)
+    return {field: value for field, value in result.items() if field in wanted}
+
+
+def shape_result(result: Dict[str, Any], fields: Optional[Iterable[str]] = None, schema: int = 1) -> Dict[str, Any]:
+    """
+    Apply the schema and field selection to a result (never modifies it - results may be cached).
+    """
+    if schema == 2:
+        result = compact_result(result)
+    return select_fields(result, fields)
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def _string_keys(obj: Any) -> Any:
+    # MessagePack readers commonly require string map keys; match the JSON output
+    if isinstance(obj, ChipInventory):
+        obj = encode_default(obj)
+    if isinstance(obj, Mapping):
+        return {key if isinstance(key, str) else (repr(key) if isinstance(key, float) else str(key)):
+                _string_keys(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_string_keys(value) for value in obj]
+    return obj
+
+
+def encode_msgpack(obj: Any) -> bytes:
+    """Encode a response body as MessagePack (map keys as strings, like JSON)."""
+    return msgpack.packb(_string_keys(obj), use_bin_type=True)
+
+
+def should_compress(response, accepts_gzip: bool) -> bool:
+    """Whether a finished response should be gzip-compressed."""
+    if not accepts_gzip or response.direct_passthrough or response.is_streamed:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 304) or 'Content-Encoding' in response.headers:
+        return False
+    if not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES):
+        return False
+    return response.content_length is not None and response.content_length >= GZIP_MIN_BYTES
+
+
+def compress_response(response) -> None:
+    """gzip the response body in place and set the matching headers."""
+    response.set_data(gzip.compress(response.get_data(), compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
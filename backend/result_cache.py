@@ -0,0 +1,177 @@
+"""
+In-process result cache for the Poker Chip Calculator API.
+
+A bounded LRU cache with per-entry expiry and single-flight coalescing:
+concurrent requests for the same key wait for one computation instead of
+each running the calculator.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+# An entry lifetime in seconds, or a function picking one from the value
+TTL = Union[float, Callable[[Any], float]]
+
+
+class _Flight:
+    """A computation in progress that other callers can wait on."""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class ResultCache:
+    """
+    Bounded LRU + TTL cache with single-flight coalescing.
+
+    Cached values are shared between callers and must be treated as read-only.
+    Exceptions raised by the compute function are passed to every waiting
+    caller but are never cached.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0):
+        """
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid after it is stored (0 disables expiry)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], ttl: Optional[TTL] = None) -> Any:
+        """
+        Return the cached value for key, computing (once) and storing it on a miss.
+
+        Args:
+            key: Hashable cache key built from normalized inputs
+            compute: Zero-argument function producing the value
+            ttl: Lifetime for this entry (seconds, or a function of the value); defaults to the cache's ttl
+
+        Returns:
+            The cached or freshly computed value
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self._store(key, flight.result, ttl)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+        return flight.result
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key without computing it on a miss."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[TTL] = None) -> None:
+        """Store a value computed elsewhere (e.g. by a batch worker)."""
+        self._store(key, value, ttl)
+
+    def _lookup(self, key: Hashable) -> Optional[tuple]:
+        # Caller holds the lock. Returns the live (value, expires_at) entry or None.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and time.monotonic() >= entry[1]:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[TTL] = None) -> None:
+        if ttl is None:
+            ttl = self.ttl
+        elif callable(ttl):
+            ttl = ttl(value)
+        if ttl < 0:
+            # Negative lifetime: don't cache this value at all
+            return
+        expires_at = time.monotonic() + ttl if ttl > 0 else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: Hashable) -> bool:
+        """Drop one entry; returns whether it was cached."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop all cached entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': (self.hits + self.coalesced) / lookups if lookups else 0.0
+            }
+
+
+# Shared cache for /api/calculate and /api/calculate-custom results
+RESULT_CACHE = ResultCache(
+    max_size=int(os.environ.get('RESULT_CACHE_SIZE', '2048')),
+    ttl=float(os.environ.get('RESULT_CACHE_TTL', '3600'))
+)
@@ -0,0 +1,289 @@
+"""
+Production server for the Poker Chip Calculator API (POSIX).
+
+A prefork server on top of Werkzeug. The parent process loads everything a
+request needs:
+- the app and the chip inventory
+- compiled allocation plans and blind schedules
+- the memory-mapped distribution table
+
+It then freezes the garbage collector (gc.freeze) and forks WEB_WORKERS
+worker processes. The workers share those pages copy-on-write: frozen
+objects are never touched by the collector, so its scans don't un-share
+them. Each worker serves the shared listening socket with a bounded pool of
+WEB_THREADS threads.
+
+Reloads are graceful. When the chip set file changes, or the parent gets
+SIGHUP, it reloads its state and forks a new set of workers. The old
+workers stop accepting connections, finish their in-flight requests and
+exit. Workers that die are replaced.
+
+Usage:
+    python serve.py [--workers 4] [--threads 8] [--port 5000]
+
+Metrics and caches are per worker (each worker answers /api/metrics with its own numbers).
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from werkzeug.serving import BaseWSGIServer
+
+# Worker processes (default: one per CPU)
+WEB_WORKERS = int(os.environ.get('WEB_WORKERS', str(os.cpu_count() or 1)))
+
+# Request threads per worker; further connections wait in the listen backlog
+WEB_THREADS = int(os.environ.get('WEB_THREADS', '8'))
+
+# Seconds between checks of the chip set file for changes
+RELOAD_CHECK_INTERVAL = float(os.environ.get('RELOAD_CHECK_INTERVAL', '2.0'))
+
+# Seconds a stopping worker may spend finishing in-flight requests
+GRACEFUL_TIMEOUT = float(os.environ.get('GRACEFUL_TIMEOUT', '30'))
+
+LISTEN_BACKLOG = 1024
+
+# Scenarios calculated in the parent to compile allocation plans and blind schedules
+WARMUP_PLAYERS = (2, 6, 10, 25, 50, 100)
+WARMUP_BLINDS = ((1, 2), (5, 10), (25, 50), (100, 200))
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug server handling requests on a fixed-size thread pool."""
+
+    multithread = True
+
+    def __init__(self, host: str, port: int, app, threads: int, fd: Optional[int] = None):
+        super().__init__(host, port, app, fd=fd)
+        self.threads = threads
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='request')
+        # Stop accepting while every thread is busy, so excess connections stay in the backlog
+        self._slots = threading.BoundedSemaphore(threads)
+
+    def process_request(self, request, client_address):
+        self._slots.acquire()
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def drain(self, timeout: float) -> None:
+        """Wait (up to timeout seconds) for in-flight requests after serve_forever returned."""
+        deadline = time.monotonic() + timeout
+        acquired = 0
+        while acquired < self.threads and time.monotonic() < deadline:
+            if self._slots.acquire(timeout=0.1):
+                acquired += 1
+        self._pool.shutdown(wait=False)
+
+
+def preload() -> Dict[str, object]:
+    """
+    Load and warm up everything requests use, so forked workers share it.
+
+    Returns:
+        Summary of what was loaded
+    """
+    import app  # noqa: F401 - builds the Flask app, loads the inventory and maps the table
+    from chip_inventory import INVENTORY_STORE
+    from distribution_tables import DISTRIBUTION_TABLES
+    from pokerchipcounter import calculate_chip_distribution, calculate_chip_distribution_custom
+
+    chip_set = INVENTORY_STORE.get()
+    table = DISTRIBUTION_TABLES.get(chip_set)
+    warmed = 0
+    for num_players in WARMUP_PLAYERS:
+        for small_blind, big_blind in WARMUP_BLINDS:
+            for calculate, args in ((calculate_chip_distribution, (4.0, 20)),
+                                    (calculate_chip_distribution_custom, (big_blind * 100,))):
+                try:
+                    calculate(num_players, small_blind, big_blind, *args, chip_set=chip_set)
+                    warmed += 1
+                except ValueError:
+                    # Scenario doesn't fit this inventory; the others still warm up
+                    pass
+    return {'denominations': len(chip_set), 'table': table is not None, 'warmup': warmed}
+
+
+def listen(host: str, port: int) -> socket.socket:
+    """Create the listening socket shared by every worker."""
+    sock = socket.create_server((host, port), backlog=LISTEN_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, threads: int) -> None:
+    """Serve requests in a forked worker until SIGTERM, then finish in-flight requests and exit."""
+    import batch
+    from app import app
+
+    # Reloads and Ctrl+C are handled by the parent, which stops workers with SIGTERM
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    host, port = sock.getsockname()[:2]
+    server = PooledWSGIServer(host, port, app, threads, fd=sock.fileno())
+    # Batch pool processes forked from this worker must not keep the listening socket open
+    # (the server holds its own duplicate of it)
+    batch.close_in_workers(sock.fileno())
+    batch.close_in_workers(server.socket.fileno())
+
+    def stop(signum, frame):
+        # shutdown() waits for serve_forever to return, so it can't run on this (the serving) thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    finally:
+        server.drain(GRACEFUL_TIMEOUT)
+        # os._exit skips the pool's own shutdown, which would leave its processes running
+        batch.shutdown_pool(wait=True)
+        os._exit(0)
+
+
+def chip_set_mtime() -> Optional[float]:
+    """Modification time of the chip set file (None if it is missing)."""
+    from chip_inventory import INVENTORY_STORE
+    try:
+        return os.stat(INVENTORY_STORE.path).st_mtime
+    except OSError:
+        return None
+
+
+class Arbiter:
+    """Parent process: preloads state, forks workers, replaces them and reloads them gracefully."""
+
+    def __init__(self, sock: socket.socket, workers: int, threads: int):
+        self.sock = sock
+        self.workers = workers
+        self.threads = threads
+        self.pids: List[int] = []
+        self.reload_requested = False
+        self.stopping = False
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(self.sock, self.threads)
+            finally:
+                os._exit(1)
+        return pid
+
+    def spawn_generation(self) -> List[int]:
+        """Fork a full set of workers from the current (frozen) state."""
+        gc.collect()
+        gc.freeze()
+        # Don't let workers inherit (and print again) buffered output
+        sys.stdout.flush()
+        sys.stderr.flush()
+        return [self.spawn() for _ in range(self.workers)]
+
+    def stop_workers(self, pids: List[int]) -> None:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def reload(self, reason: str) -> None:
+        """Reload state in the parent, start new workers, then retire the old ones."""
+        from chip_inventory import INVENTORY_STORE
+
+        print(f"[OK] Reloading workers ({reason})")
+        # The frozen objects may include state that is being replaced
+        gc.unfreeze()
+        INVENTORY_STORE.get(force=True)
+        summary = preload()
+        old = self.pids
+        self.pids = self.spawn_generation()
+        self.stop_workers(old)
+        print(f"[OK] {len(self.pids)} workers started ({summary['denominations']} denominations, "
+              f"table {'mapped' if summary['table'] else 'not built'})")
+
+    def reap(self) -> None:
+        """Collect exited workers and replace any that died unexpectedly."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self.pids:
+                self.pids.remove(pid)
+                if not self.stopping:
+                    print(f"[WARNING] Worker {pid} exited (status {status}) - starting a replacement")
+                    self.pids.append(self.spawn())
+
+    def run(self) -> None:
+        signal.signal(signal.SIGHUP, lambda signum, frame: setattr(self, 'reload_requested', True))
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, 'stopping', True))
+        signal.signal(signal.SIGINT, lambda signum, frame: setattr(self, 'stopping', True))
+
+        self.pids = self.spawn_generation()
+        watched_mtime = chip_set_mtime()
+        next_check = time.monotonic() + RELOAD_CHECK_INTERVAL
+        try:
+            while not self.stopping:
+                time.sleep(0.2)
+                self.reap()
+                if self.reload_requested:
+                    self.reload_requested = False
+                    watched_mtime = chip_set_mtime()
+                    self.reload('SIGHUP')
+                elif time.monotonic() >= next_check:
+                    next_check = time.monotonic() + RELOAD_CHECK_INTERVAL
+                    mtime = chip_set_mtime()
+                    if mtime != watched_mtime:
+                        watched_mtime = mtime
+                        self.reload('chip set file changed')
+        finally:
+            self.stopping = True
+            self.stop_workers(self.pids)
+            deadline = time.monotonic() + GRACEFUL_TIMEOUT
+            while self.pids and time.monotonic() < deadline:
+                self.reap()
+                time.sleep(0.1)
+            for pid in self.pids:
+                os.kill(pid, signal.SIGKILL)
+            print("[OK] Server stopped")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run the Poker Chip Calculator API with multiple workers')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=WEB_WORKERS, help='Worker processes (default: CPUs)')
+    parser.add_argument('--threads', type=int, default=WEB_THREADS, help='Request threads per worker')
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, 'fork'):
+        print("[WARNING] serve.py needs fork() (Linux/macOS) - use 'python app.py' on this platform")
+        return 1
+
+    summary = preload()
+    sock = listen(args.host, args.port)
+    print(f"[OK] Preloaded {summary['denominations']} denominations, "
+          f"table {'mapped' if summary['table'] else 'not built'}, {summary['warmup']} warm-up calculations")
+    print(f"[SERVER] http://{args.host}:{args.port} - {args.workers} workers x {args.threads} threads")
+    Arbiter(sock, args.workers, args.threads).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
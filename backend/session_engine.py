@@ -0,0 +1,181 @@
+"""
+Incremental Mode 1 recalculation for interactive sessions.
+
+A slider UI changes one input at a time. A CalculationSession keeps the
+intermediate results of calculate_chip_distribution and, on each change,
+reruns only the stages whose inputs changed:
+
+    levels      <- players, blinds, duration, level length (validation, level count)
+    caps        <- chip set, players (value per player, available // players)
+    target      <- big blind, caps (starting stack)
+    columns     <- chip set, small blind (usable denominations, allocation plan)
+    allocation  <- target, columns, caps, small blind (allocation, top-ups, repair)
+    schedule    <- blinds, levels, columns, stack value (blind schedule)
+
+So a new level length only rebuilds the blind schedule, while a new player
+count redoes the caps, target and allocation. Each update returns just the
+result fields that changed. Results are identical to calculate_chip_distribution.
+
+Sessions are held in memory by the worker process that created them and
+expire after SESSION_TTL seconds without updates.
+"""
+
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional
+
+from allocation_plan import ALLOCATION_WEIGHTS, compile_allocation_plan
+from blind_schedule import build_blind_schedule
+from chip_types import ChipInventory, Distribution
+from metrics import REGISTRY
+from pokerchipcounter import (
+    TARGET_END_LEVEL, allocate_stack, auto_target_stack, calculate_chip_distribution, check_chip_depth,
+    describe_shortages, first_usable_column, validate_tournament_inputs
+)
+from result_cache import ResultCache
+
+# Mode 1 inputs a session update may change
+SESSION_FIELDS = ('num_players', 'small_blind', 'big_blind', 'duration_hours', 'minutes_per_level')
+
+SESSION_STAGE_RUNS = REGISTRY.counter(
+    'pokerchip_session_stage_runs_total', 'Session stages recomputed after an input change, by stage.',
+    ('stage',))
+
+
+class CalculationSession:
+    """
+    Mode 1 inputs and the stage results derived from them.
+
+    Every stage result is stored with the inputs it was computed from; a
+    stage reruns only when those inputs differ.
+    """
+
+    def __init__(self, params: Mapping[str, Any], chip_set: ChipInventory, stack_size: int = 1,
+                 session_id: Optional[str] = None):
+        """
+        Args:
+            params: Mode 1 inputs (SESSION_FIELDS)
+            chip_set: Validated chip inventory
+            stack_size: Stack size to round to (the API uses 1, like /api/calculate)
+            session_id: ID to use (a new random one by default)
+
+        Raises:
+            ValueError: If the inputs are invalid or give no usable result
+        """
+        self.id = session_id or uuid.uuid4().hex
+        self.stack_size = stack_size
+        self.version = 0
+        self.lock = threading.Lock()
+        self._stages: Dict[str, tuple] = {}
+        self.params: Dict[str, Any] = {}
+        self.chip_set = chip_set
+        self.result: Dict[str, Any] = {}
+        self.update(params, chip_set)
+
+    def _stage(self, name: str, key: Hashable, compute: Callable[[], Any], ran: List[str]) -> Any:
+        cached = self._stages.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        value = compute()
+        self._stages[name] = (key, value)
+        ran.append(name)
+        SESSION_STAGE_RUNS.inc(labels=(name,))
+        return value
+
+    def _calculate(self, params: Mapping[str, Any], inventory: ChipInventory, ran: List[str]) -> Dict[str, Any]:
+        num_players = params['num_players']
+        small_blind = params['small_blind']
+        big_blind = params['big_blind']
+        minutes_per_level = params['minutes_per_level']
+
+        num_levels = self._stage(
+            'levels', tuple(params[field] for field in SESSION_FIELDS),
+            lambda: validate_tournament_inputs(num_players, small_blind, big_blind,
+                                               params['duration_hours'], minutes_per_level), ran)
+        max_stack_per_player, max_per_player = self._stage(
+            'caps', (inventory, num_players),
+            lambda: (inventory.value / num_players, [count // num_players for count in inventory.counts]), ran)
+        check_chip_depth(num_players, big_blind, max_stack_per_player)
+        target_stack, stack_was_adjusted = self._stage(
+            'target', (big_blind, max_stack_per_player),
+            lambda: auto_target_stack(big_blind, max_stack_per_player), ran)
+
+        def columns():
+            first = first_usable_column(inventory.denominations, small_blind)
+            units = tuple(inventory.units[first:])
+            return first, units, compile_allocation_plan(units, ALLOCATION_WEIGHTS) if units else None
+        first, usable_units, plan = self._stage('columns', (inventory, small_blind), columns, ran)
+        if plan is None:
+            # No usable denominations: the calculator's error result
+            return calculate_chip_distribution(**params, stack_size=self.stack_size, chip_set=inventory)
+
+        def allocation():
+            counts, value_lost = allocate_stack(plan, usable_units, target_stack, small_blind,
+                                                inventory.counts[first:], max_per_player[first:],
+                                                num_players, self.stack_size)
+            distribution = Distribution.from_columns(usable_units, counts)
+            return distribution, describe_shortages(value_lost, inventory.denominations[first:]) if value_lost else {}
+        distribution, shortages = self._stage(
+            'allocation', (inventory, small_blind, num_players, target_stack), allocation, ran)
+
+        stack_value = distribution.value
+        schedule = self._stage(
+            'schedule', (inventory, small_blind, big_blind, num_levels, stack_value),
+            lambda: build_blind_schedule(small_blind, big_blind, num_levels,
+                                         inventory.denominations[first:], stack_value), ran)
+
+        result = {
+            'distribution': distribution,
+            'stack_value': stack_value,
+            'big_blinds': stack_value / big_blind if big_blind > 0 else 0,
+            'target_level': TARGET_END_LEVEL,
+            'total_levels': num_levels,
+            'minutes_per_level': minutes_per_level,
+            'available_chips': inventory,
+            'stack_size': self.stack_size,
+            'stack_was_adjusted': stack_was_adjusted,
+            'max_stack_per_player': max_stack_per_player,
+            'blind_schedule': schedule
+        }
+        result.update(shortages)
+        return result
+
+    def update(self, changes: Mapping[str, Any], chip_set: Optional[ChipInventory] = None) -> Dict[str, Any]:
+        """
+        Apply changed inputs and recalculate what they affect.
+
+        Args:
+            changes: New values for any of SESSION_FIELDS
+            chip_set: New chip inventory (None keeps the current one)
+
+        Returns:
+            {'version', 'changed': {field: value}, 'removed': [field, ...], 'recomputed': [stage, ...]}
+            relative to the previous result
+
+        Raises:
+            ValueError: If the new inputs are invalid; the session is left unchanged
+        """
+        with self.lock:
+            params = dict(self.params, **changes)
+            inventory = chip_set if chip_set is not None else self.chip_set
+            ran: List[str] = []
+            result = self._calculate(params, inventory, ran)
+            if 'error' in result:
+                raise ValueError(result['error'])
+
+            previous = self.result
+            # Stages that didn't rerun hand back the same objects, so most fields compare by identity
+            changed = {field: value for field, value in result.items()
+                       if field not in previous or (previous[field] is not value and previous[field] != value)}
+            removed = [field for field in previous if field not in result]
+            self.params, self.chip_set, self.result = params, inventory, result
+            self.version += 1
+            return {'version': self.version, 'changed': changed, 'removed': removed, 'recomputed': ran}
+
+
+# Live sessions of this process by ID
+SESSIONS = ResultCache(
+    max_size=int(os.environ.get('SESSION_MAX', '10000')),
+    ttl=float(os.environ.get('SESSION_TTL', '1800'))
+)
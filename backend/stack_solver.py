@@ -0,0 +1,150 @@
+"""
+Exact stack solver for custom (Mode 2) chip distributions.
+
+Treats the per-player distribution as a bounded integer allocation: every
+denomination is handed out in whole stacks (multiples of stack_size), capped
+by what the inventory allows per player. A depth-first branch-and-bound
+search finds the stack value closest to the target, breaking ties by how
+closely the denomination mix matches a preferred (greedy) distribution.
+Values are integer minor units (see chip_types.py), so every sum is exact.
+
+If the search runs out of time, the best distribution found so far is
+returned, marked as not proven optimal.
+"""
+
+import math
+import time
+from typing import List, NamedTuple, Optional, Sequence
+
+# How many search nodes to expand between deadline checks
+_DEADLINE_CHECK_EVERY = 512
+
+
+class SolverTimeout(Exception):
+    """Raised internally when the search runs past its deadline."""
+
+
+class ExactSolution(NamedTuple):
+    """Result of solve_exact_stack."""
+
+    # Chips per player for each denomination (in the given order)
+    counts: List[int]
+    # False if the deadline cut the search short (counts are the best found, not proven best)
+    complete: bool
+
+
+def _outward(lo: int, hi: int, center: float):
+    """Yield lo..hi ordered by distance from center."""
+    below = min(max(int(math.floor(center)), lo - 1), hi)
+    above = below + 1
+    while below >= lo or above <= hi:
+        if above > hi or (below >= lo and center - below <= above - center):
+            yield below
+            below -= 1
+        else:
+            yield above
+            above += 1
+
+
+def solve_exact_stack(target_stack: int, denominations: Sequence[int], max_per_player: Sequence[int],
+                      stack_size: int = 5, preferred: Optional[Sequence[int]] = None,
+                      deadline: Optional[float] = None) -> Optional[ExactSolution]:
+    """
+    Find the feasible distribution whose value is closest to target_stack.
+
+    Args:
+        target_stack: Desired stack value per player, in minor units
+        denominations: Usable chip denominations, in minor units
+        max_per_player: Maximum chips of each denomination per player (inventory limit)
+        stack_size: Chips are allocated in multiples of this size
+        preferred: Preferred chips per denomination, used to break ties between equally close stacks
+        deadline: time.monotonic() value after which the search gives up
+
+    Returns:
+        The best distribution found, or None if the deadline passed before any was found
+    """
+    stack_size = max(1, int(stack_size))
+    preferred = preferred or [0] * len(denominations)
+
+    # Largest denominations first: they make the biggest jumps, so good
+    # incumbents (and tight bounds) are found early
+    order = sorted(range(len(denominations)), key=lambda column: denominations[column], reverse=True)
+    steps = [denominations[column] * stack_size for column in order]
+    max_stacks = [max_per_player[column] // stack_size for column in order]
+    preferred_stacks = [preferred[column] / stack_size for column in order]
+    preferred_values = [preferred[column] * denominations[column] for column in order]
+    target = target_stack
+    count = len(order)
+
+    # Value reachable by denominations i.. and the granularity of their sums
+    suffix_max = [0] * (count + 1)
+    suffix_gcd = [0] * (count + 1)
+    for i in range(count - 1, -1, -1):
+        suffix_max[i] = suffix_max[i + 1] + steps[i] * max_stacks[i]
+        suffix_gcd[i] = math.gcd(suffix_gcd[i + 1], steps[i]) if max_stacks[i] > 0 else suffix_gcd[i + 1]
+
+    def gap_bound(i: int, remaining: int) -> int:
+        # Lower bound on |remaining - value of denominations i..|
+        if remaining <= 0:
+            return -remaining
+        if remaining >= suffix_max[i]:
+            return remaining - suffix_max[i]
+        g = suffix_gcd[i]
+        if g == 0:
+            return remaining
+        r = remaining % g
+        return min(r, g - r)
+
+    best_gap: Optional[int] = None
+    best_mix = 0
+    best_stacks: List[int] = [0] * count
+    chosen = [0] * count
+    nodes = 0
+
+    def search(i: int, remaining: int, mix: int) -> None:
+        nonlocal best_gap, best_mix, best_stacks, nodes
+        nodes += 1
+        if deadline is not None and nodes % _DEADLINE_CHECK_EVERY == 0 and time.monotonic() > deadline:
+            raise SolverTimeout()
+
+        if i == count:
+            gap = abs(remaining)
+            if best_gap is None or (gap, mix) < (best_gap, best_mix):
+                best_gap, best_mix, best_stacks = gap, mix, chosen[:]
+            return
+
+        step = steps[i]
+        rest_max = suffix_max[i + 1]
+        # Stack counts outside [lo, hi] are provably worse than one inside:
+        # below lo the stack falls short by more than one step even with every
+        # smaller chip maxed out, above hi it overshoots by more than one step
+        lo = max(0, -(-(remaining - rest_max) // step) - 1)
+        hi = min(max_stacks[i], remaining // step + 1) if remaining > 0 else 0
+        lo = min(lo, hi)
+
+        # Try counts closest to the preferred mix first; the mix penalty only
+        # grows from there, so once a perfect stack is known we can stop early
+        for k in _outward(lo, hi, preferred_stacks[i]):
+            left = remaining - k * step
+            child_mix = mix + abs(k * step - preferred_values[i])
+            if best_gap is not None:
+                if best_gap == 0 and child_mix >= best_mix:
+                    break
+                if (gap_bound(i + 1, left), child_mix) >= (best_gap, best_mix):
+                    continue
+            chosen[i] = k
+            search(i + 1, left, child_mix)
+        chosen[i] = 0
+
+    complete = True
+    try:
+        search(0, target, 0)
+    except SolverTimeout:
+        if best_gap is None:
+            return None
+        complete = False
+
+    counts = [0] * count
+    for i, column in enumerate(order):
+        counts[column] = best_stacks[i] * stack_size
+    return ExactSolution(counts, complete)
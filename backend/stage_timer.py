@@ -0,0 +1,76 @@
+"""
+Lightweight per-stage timing for the calculators.
+
+A StageTimer records how long each named stage of a calculation took:
+call mark(stage) at the end of every stage. NULL_TIMER has the same
+interface and does nothing, so instrumented code costs one no-op method
+call per stage when timing is switched off.
+"""
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Set STAGE_TIMING=0 to switch request timing off (calculators then get NULL_TIMER)
+STAGE_TIMING = os.environ.get('STAGE_TIMING', '1') != '0'
+
+
+class StageTimer:
+    """Records the duration of consecutive named stages."""
+
+    __slots__ = ('stages', '_started', '_last')
+
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+        self._started = self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """End a stage: record the time since the previous mark (or since the timer was created)."""
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def total(self) -> float:
+        """Seconds since the timer was created."""
+        return time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations in milliseconds (repeated stages are summed), plus the total."""
+        timings: Dict[str, float] = {}
+        for stage, seconds in self.stages:
+            timings[stage] = timings.get(stage, 0.0) + seconds * 1000
+        timings['total'] = self.total() * 1000
+        return {stage: round(ms, 3) for stage, ms in timings.items()}
+
+    def server_timing(self, timings: Optional[Dict[str, float]] = None) -> str:
+        """Format the stages (or an as_dict() result) as a Server-Timing header value."""
+        timings = timings if timings is not None else self.as_dict()
+        return ', '.join(f'{stage};dur={ms}' for stage, ms in timings.items())
+
+
+class NullTimer:
+    """Stand-in for StageTimer that records nothing."""
+
+    __slots__ = ()
+
+    stages: Tuple = ()
+
+    def mark(self, stage: str) -> None:
+        pass
+
+    def total(self) -> float:
+        return 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {}
+
+    def server_timing(self, timings: Optional[Dict[str, float]] = None) -> str:
+        return ''
+
+
+NULL_TIMER = NullTimer()
+
+
+def new_timer():
+    """Get a StageTimer, or NULL_TIMER when timing is switched off."""
+    return StageTimer() if STAGE_TIMING else NULL_TIMER
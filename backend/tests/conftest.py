@@ -0,0 +1,30 @@
+"""
+Shared test fixtures.
+
+The backend modules import each other as top-level modules, so the backend
+directory goes on the import path (run the tests with: cd backend && python -m pytest).
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gumroad_stub import GumroadStub  # noqa: E402
+
+VALID_KEY = 'TEST-VALID-KEY'
+
+
+@pytest.fixture
+def gumroad():
+    """A local Gumroad stub accepting VALID_KEY for every product."""
+    server = GumroadStub(('127.0.0.1', 0), {VALID_KEY: None})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
@@ -0,0 +1,72 @@
+"""License checks against the Gumroad stub: concurrent tier checks and the license cache TTLs."""
+
+import time
+
+import pytest
+import requests
+
+import billing
+from http_client import OutboundClient
+
+from conftest import VALID_KEY
+
+
+@pytest.fixture
+def license_api(gumroad, monkeypatch):
+    """Point billing at the stub with its own client and an empty license cache."""
+    client = OutboundClient(retries=2, backoff_factor=0, default_timeout=(1.0, 2.0))
+    monkeypatch.setattr(billing, 'GUMROAD_API_BASE', gumroad.url)
+    monkeypatch.setattr(billing, 'OUTBOUND', client)
+    billing.LICENSE_CACHE.clear()
+    yield gumroad
+    billing.LICENSE_CACHE.clear()
+    client.close()
+
+
+def test_check_license(license_api):
+    result = billing.check_license(VALID_KEY, 'premium')
+    assert result['valid'] and result['product_tier'] == 'premium'
+    rejected = billing.check_license('NOT-A-KEY', 'premium')
+    assert rejected['success'] and not rejected['valid']
+
+
+def test_tiers_are_checked_at_the_same_time(license_api):
+    license_api.latency_ms = 300
+    outcome = billing.check_license_tiers(VALID_KEY, ['entry', 'premium'])
+    assert outcome['product_tier'] == 'premium'
+    assert set(outcome['results']) == {'entry', 'premium'}
+    assert license_api.request_count == 2
+    assert license_api.max_in_flight == 2
+
+
+def test_license_cache_ttls(license_api, monkeypatch):
+    monkeypatch.setattr(billing, 'LICENSE_CACHE_TTL', 1.0)
+    monkeypatch.setattr(billing, 'LICENSE_NEGATIVE_CACHE_TTL', 0.2)
+
+    assert billing.check_license(VALID_KEY, 'entry')['valid']
+    assert not billing.check_license('NOT-A-KEY', 'entry')['valid']
+    assert license_api.request_count == 2
+
+    # Both answers are cached
+    billing.check_license(VALID_KEY, 'entry')
+    billing.check_license('NOT-A-KEY', 'entry')
+    assert license_api.request_count == 2
+
+    # The rejection expires after the negative TTL; the valid license is still cached
+    time.sleep(0.4)
+    billing.check_license(VALID_KEY, 'entry')
+    billing.check_license('NOT-A-KEY', 'entry')
+    assert license_api.request_count == 3
+
+    # The valid license expires after the positive TTL
+    time.sleep(0.8)
+    billing.check_license(VALID_KEY, 'entry')
+    assert license_api.request_count == 4
+
+
+def test_server_errors_are_not_cached(license_api):
+    license_api.fail_first = 3
+    with pytest.raises(requests.exceptions.HTTPError):
+        billing.check_license(VALID_KEY, 'entry')
+    assert billing.check_license(VALID_KEY, 'entry')['valid']
+    assert license_api.request_count == 4
@@ -0,0 +1,80 @@
+"""OutboundClient retries, Retry-After handling, timeouts and connection reuse against the Gumroad stub."""
+
+import pytest
+import requests
+
+import http_client
+from http_client import OutboundClient
+
+from conftest import VALID_KEY
+
+
+def verify(client, gumroad, key=VALID_KEY):
+    return client.post(f'{gumroad.url}/v2/licenses/verify', data={'license_key': key, 'product_id': 'p'})
+
+
+@pytest.fixture
+def client():
+    # No backoff, so retry timing comes only from Retry-After
+    client = OutboundClient(retries=2, backoff_factor=0, default_timeout=(1.0, 1.0))
+    yield client
+    client.close()
+
+
+def test_retries_503_until_success(client, gumroad):
+    gumroad.fail_first = 2
+    response = verify(client, gumroad)
+    assert response.status_code == 200
+    assert response.json()['success']
+    assert gumroad.request_count == 3
+
+
+def test_gives_up_after_retries_with_last_response(client, gumroad):
+    gumroad.fail_first = 10
+    response = verify(client, gumroad)
+    assert response.status_code == 503
+    assert gumroad.request_count == 3
+
+
+def test_respects_retry_after(client, gumroad):
+    gumroad.fail_first = 1
+    gumroad.retry_after = '1'
+    assert verify(client, gumroad).status_code == 200
+    first, second = gumroad.request_times
+    assert second - first >= 0.9
+
+
+def test_caps_retry_after(client, gumroad, monkeypatch):
+    monkeypatch.setattr(http_client, 'HTTP_RETRY_AFTER_MAX', 0.2)
+    gumroad.fail_first = 1
+    gumroad.retry_after = '30'
+    assert verify(client, gumroad).status_code == 200
+    first, second = gumroad.request_times
+    assert 0.15 <= second - first < 5
+
+
+def test_read_timeout_is_not_retried(gumroad):
+    gumroad.latency_ms = 500
+    client = OutboundClient(retries=2, backoff_factor=0, default_timeout=(1.0, 0.2))
+    try:
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            verify(client, gumroad)
+    finally:
+        client.close()
+    assert gumroad.request_count == 1
+
+
+def test_reuses_connections(client, gumroad):
+    for _ in range(5):
+        assert verify(client, gumroad).status_code == 200
+    assert gumroad.request_count == 5
+    assert gumroad.connection_count == 1
+
+
+def test_run_concurrently_returns_exceptions_by_key(client):
+    def fail():
+        raise ValueError('boom')
+
+    results = client.run_concurrently({'ok': lambda: 1, 'fail': fail})
+    assert results['ok'] == 1
+    assert isinstance(results['fail'], ValueError)
@@ -0,0 +1,251 @@
+"""
+Monte Carlo tournament simulator.
+
+Mode 1 sizes the starting stack so the average stack is 12 big blinds at
+level 14, assuming the tournament is about over by then. This simulator
+checks that assumption for a concrete structure: it plays thousands of
+simulated tournaments under the generated blind schedule and reports the
+spread of finish times (p10/p50/p90), so organizers get a range instead of
+a single guess.
+
+The model is deliberately simple, with equal-skill players and one hand per
+table per step:
+- Every hand, each table posts the blinds. The cost is shared by the players
+  at the table and goes to the winner of the table's hand.
+- At each table two random players contest a pot. With at most
+  SHOVE_BIG_BLINDS effective big blinds they are all in. Deeper stacks get
+  all in with probability ALL_IN_RATE, and otherwise play a pot of about
+  POT_BIG_BLINDS big blinds. Either player wins with probability 1/2.
+- Players with no chips left are out; the tournament ends when one player
+  holds every chip.
+
+Tournaments are simulated with NumPy, one row per tournament, in chunks
+spread over the batch worker pool (see batch.py). Chunk i always draws from
+child i of one SeedSequence, so a seed and a simulation count give the same
+result whatever the number of workers.
+"""
+
+import math
+import os
+import secrets
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from batch import get_pool, shutdown_pool
+from blind_schedule import BLIND_MULTIPLIER, level_blinds
+
+# Simulated tournaments per request (default and maximum)
+SIMULATION_DEFAULT_RUNS = int(os.environ.get('SIMULATION_DEFAULT_RUNS', '2000'))
+SIMULATION_MAX_RUNS = int(os.environ.get('SIMULATION_MAX_RUNS', '20000'))
+
+# Tournaments per pool task
+SIMULATION_CHUNK_SIZE = int(os.environ.get('SIMULATION_CHUNK_SIZE', '500'))
+
+# Time budget per request in milliseconds (default and maximum)
+SIMULATION_DEFAULT_BUDGET_MS = float(os.environ.get('SIMULATION_DEFAULT_BUDGET_MS', '1000'))
+SIMULATION_MAX_BUDGET_MS = float(os.environ.get('SIMULATION_MAX_BUDGET_MS', '5000'))
+
+# Model defaults: a live game deals about 30 hands an hour at a full 9-handed table
+HANDS_PER_HOUR = 30
+TABLE_SIZE = 9
+
+# Pot model (in big blinds)
+SHOVE_BIG_BLINDS = 10
+ALL_IN_RATE = 0.04
+POT_BIG_BLINDS = 3.0
+
+# Simulations stop at this multiple of the planned duration (reported as unfinished)
+MAX_DURATION_FACTOR = 3
+
+# Steps between deadline checks inside a chunk
+_DEADLINE_CHECK_STEPS = 16
+
+
+def simulate_chunk(num_players: int, stack_value: float, step_blinds: np.ndarray, step_big_blinds: np.ndarray,
+                   runs: int, table_size: int, seed: np.random.SeedSequence,
+                   deadline: Optional[float] = None) -> Optional[np.ndarray]:
+    """
+    Simulate a batch of tournaments.
+
+    Args:
+        num_players: Players per tournament
+        stack_value: Starting stack per player
+        step_blinds: Small plus big blind at every step (one hand per table)
+        step_big_blinds: Big blind at every step
+        runs: Number of tournaments
+        table_size: Players per full table
+        seed: Seed of this chunk
+        deadline: time.time() after which the chunk is abandoned
+
+    Returns:
+        Steps each tournament took (len(step_blinds) if it did not finish),
+        or None if the deadline passed first
+    """
+    rng = np.random.default_rng(seed)
+    max_steps = len(step_big_blinds)
+    finished = np.full(runs, max_steps, dtype=np.int32)
+    stacks = np.full((runs, num_players), float(stack_value))
+    rows = np.arange(runs)
+
+    for step in range(max_steps):
+        if deadline is not None and step % _DEADLINE_CHECK_STEPS == 0 and time.time() > deadline:
+            return None
+
+        alive = stacks > 0
+        players = alive.sum(axis=1)
+        done = players <= 1
+        if done.any():
+            finished[rows[done]] = step
+            running = ~done
+            stacks, alive, players, rows = stacks[running], alive[running], players[running], rows[running]
+            if not len(rows):
+                break
+
+        # Once most seats are empty, move live players to the front and drop the rest
+        width = int(players.max())
+        if width <= stacks.shape[1] // 2:
+            order = np.argsort(~alive, axis=1, kind='stable')[:, :width]
+            stacks = np.take_along_axis(stacks, order, axis=1)
+            alive = np.take_along_axis(alive, order, axis=1)
+
+        tables = -(-players // table_size)
+        hands = np.minimum(tables, players // 2)
+
+        # Seat live players in random order; seats (0, 1), (2, 3), ... play the hands
+        keys = rng.random(stacks.shape, dtype=np.float32)
+        keys[~alive] = 2.0
+        seats = np.argsort(keys, axis=1)[:, :2 * int(hands.max())]
+        first, second = seats[:, 0::2], seats[:, 1::2]
+        playing = np.arange(first.shape[1]) < hands[:, None]
+        index = np.arange(len(rows))[:, None]
+
+        big_blind = step_big_blinds[step]
+        effective = np.minimum(stacks[index, first], stacks[index, second])
+        all_in = (effective <= SHOVE_BIG_BLINDS * big_blind) | (rng.random(effective.shape) < ALL_IN_RATE)
+        pot = np.where(all_in, effective,
+                       np.minimum(effective, rng.exponential(POT_BIG_BLINDS * big_blind, effective.shape)))
+        first_wins = rng.random(effective.shape) < 0.5
+        won = np.where(playing, np.where(first_wins, pot, -pot), 0.0)
+        stacks[index, first] += won
+        stacks[index, second] -= won
+
+        # Everyone pays their share of the blinds; each hand's winner collects an equal part
+        paid = np.minimum(stacks, (step_blinds[step] * tables / players)[:, None])
+        stacks -= paid
+        winners = np.where(first_wins, first, second)
+        stacks[index, winners] += np.where(playing, (paid.sum(axis=1) / hands)[:, None], 0.0)
+
+    return finished
+
+
+def _run_chunks(jobs: List[tuple], deadline: float) -> List[np.ndarray]:
+    # The first chunk always runs to completion; later ones stop at the deadline.
+    # Only the unbroken run of completed chunks is used, keeping results reproducible.
+    pool = get_pool() if len(jobs) > 1 else None
+    results = []
+    if pool is not None:
+        futures = [pool.submit(simulate_chunk, *job, deadline=None if i == 0 else deadline)
+                   for i, job in enumerate(jobs)]
+        try:
+            for future in futures:
+                steps = future.result()
+                if steps is None:
+                    break
+                results.append(steps)
+            return results
+        except BrokenProcessPool:
+            # A worker died - start a fresh pool next time and carry on in-process
+            shutdown_pool()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    for i, job in enumerate(jobs[len(results):], start=len(results)):
+        steps = simulate_chunk(*job, deadline=None if i == 0 else deadline)
+        if steps is None:
+            break
+        results.append(steps)
+    return results
+
+
+def _percentiles(values: np.ndarray, digits: int = 1) -> Dict[str, float]:
+    p10, p50, p90 = np.percentile(values, (10, 50, 90))
+    return {'p10': round(float(p10), digits), 'p50': round(float(p50), digits), 'p90': round(float(p90), digits)}
+
+
+def simulate_tournament(num_players: int, stack_value: float, small_blind: float, big_blind: float,
+                        duration_hours: float, minutes_per_level: int, denominations: Sequence[float],
+                        simulations: int = SIMULATION_DEFAULT_RUNS, seed: Optional[int] = None,
+                        time_budget_ms: float = SIMULATION_DEFAULT_BUDGET_MS,
+                        hands_per_hour: float = HANDS_PER_HOUR, table_size: int = TABLE_SIZE) -> Dict[str, Any]:
+    """
+    Estimate when a tournament will finish.
+
+    Args:
+        num_players: Number of players
+        stack_value: Starting stack per player (e.g. Mode 1's stack_value)
+        small_blind: Starting small blind
+        big_blind: Starting big blind
+        duration_hours: Planned duration
+        minutes_per_level: Minutes between blind level increases
+        denominations: Usable chip denominations (blinds are rounded like the blind schedule)
+        simulations: Number of tournaments to simulate
+        seed: Random seed (a fresh one is drawn and returned if omitted)
+        time_budget_ms: Stop early after this long (at least one chunk is always completed)
+        hands_per_hour: Hands dealt per table per hour
+        table_size: Players per full table
+
+    Returns:
+        Finish time, hour and level percentiles, the share of tournaments
+        finished within the planned duration, and the run parameters
+
+    Raises:
+        ValueError: If a simulation setting is out of range
+    """
+    if not 1 <= simulations <= SIMULATION_MAX_RUNS:
+        raise ValueError(f"Simulations must be between 1 and {SIMULATION_MAX_RUNS}")
+    if seed is None:
+        seed = secrets.randbits(32)
+    if not 0 <= seed < 2 ** 63:
+        raise ValueError("Seed must be a non-negative integer below 2^63")
+    if not 1 <= hands_per_hour <= 200:
+        raise ValueError("Hands per hour must be between 1 and 200")
+    if not 2 <= table_size <= 10:
+        raise ValueError("Table size must be between 2 and 10 players")
+    time_budget_ms = min(max(time_budget_ms, 0.0), SIMULATION_MAX_BUDGET_MS)
+    started = time.time()
+
+    # Per-step blinds, continuing the schedule past the planned duration
+    planned_minutes = duration_hours * 60
+    minutes_per_hand = 60 / hands_per_hour
+    max_steps = max(1, math.ceil(MAX_DURATION_FACTOR * planned_minutes / minutes_per_hand))
+    step_levels = (np.arange(max_steps) * minutes_per_hand // minutes_per_level).astype(np.int64)
+    blinds = np.array(level_blinds(float(small_blind), float(big_blind), BLIND_MULTIPLIER,
+                                   int(step_levels[-1]) + 1, tuple(sorted(float(d) for d in denominations))))
+    step_blinds = blinds[step_levels].sum(axis=1)
+    step_big_blinds = blinds[step_levels, 1]
+
+    chunk_seeds = np.random.SeedSequence(seed).spawn(math.ceil(simulations / SIMULATION_CHUNK_SIZE))
+    jobs = [(num_players, stack_value, step_blinds, step_big_blinds,
+             min(SIMULATION_CHUNK_SIZE, simulations - i * SIMULATION_CHUNK_SIZE), table_size, chunk_seed)
+            for i, chunk_seed in enumerate(chunk_seeds)]
+    steps = np.concatenate(_run_chunks(jobs, started + time_budget_ms / 1000))
+
+    minutes = steps * minutes_per_hand
+    return {
+        'simulations': len(steps),
+        'requested_simulations': simulations,
+        'seed': seed,
+        'finish_minutes': _percentiles(minutes),
+        'finish_hours': _percentiles(minutes / 60, 2),
+        'finish_level': _percentiles(minutes // minutes_per_level + 1, 0),
+        'planned_hours': duration_hours,
+        'finished_on_time': round(float(np.mean(minutes <= planned_minutes)), 4),
+        'unfinished': round(float(np.mean(steps >= max_steps)), 4),
+        'hands_per_hour': hands_per_hour,
+        'table_size': table_size,
+        'elapsed_ms': round((time.time() - started) * 1000, 1)
+    }
@@ -342,6 +342,17 @@ function saveChipsets(chipsets) {
     localStorage.setItem('chipsets', JSON.stringify(chipsets));
 }
 
+// Chips of a chipset as sent to the API (denominations with no chips left out)
+function chipsForApi(chips) {
+    const result = {};
+    for (const [denom, count] of Object.entries(chips)) {
+        if (count > 0) {
+            result[denom] = count;
+        }
+    }
+    return result;
+}
+
 // Get chipset by ID
 function getChipsetById(id) {
     const chipsets = getChipsets();
@@ -702,7 +713,8 @@ async function calculateCustom(formData) {
             num_players: parseInt(formData.players),
             small_blind: parseFloat(formData.small_blind),
             big_blind: parseFloat(formData.big_blind),
-            target_stack: parseFloat(formData.target_stack)
+            target_stack: parseFloat(formData.target_stack),
+            chip_set: formData.chip_set
         })
     });
 
@@ -772,7 +784,7 @@ document.getElementById('custom-form')?.addEventListener('submit', async (e) =>
     if (currentChipsetId) {
         const chipset = getChipsetById(currentChipsetId);
         if (chipset) {
-            formData.chip_set = chipset.chips;
+            formData.chip_set = chipsForApi(chipset.chips);
         }
     }
 
@@ -828,12 +840,22 @@ document.getElementById('chipset-form')?.addEventListener('submit', (e) => {
             return;
         }
 
-        if (count < 0) {
+        if (isNaN(count) || count < 0) {
             alert('Chip quantities cannot be negative');
             return;
         }
 
-        if (chips[denom]) {
+        if (count > 100000) {
+            alert('Chip quantities can be at most 100,000 per denomination');
+            return;
+        }
+
+        if (denom > 1000000) {
+            alert('Denominations can be at most $1,000,000');
+            return;
+        }
+
+        if (denom in chips) {
             alert(`Duplicate denomination: $${denom}. Each denomination can only appear once.`);
             return;
         }
@@ -841,8 +863,8 @@ document.getElementById('chipset-form')?.addEventListener('submit', (e) => {
         chips[denom] = count;
     }
 
-    if (Object.keys(chips).length === 0) {
-        alert('Please add at least one chip denomination');
+    if (Object.keys(chipsForApi(chips)).length < 2) {
+        alert('Please add at least 2 denominations with chips (a tournament needs more than one chip value)');
         return;
     }
 
@@ -947,6 +969,25 @@ function displayResults(result) {
         <td class="chip-value">$${totalValue.toLocaleString()}</td>
     `;
     table.appendChild(totalRow);
+
+    // Blind structure (only Mode 1 results include one)
+    const structure = document.getElementById('blind-structure');
+    const schedule = document.getElementById('blind-schedule');
+    schedule.innerHTML = '';
+    if (result.blind_schedule && result.blind_schedule.length) {
+        result.blind_schedule.forEach(level => {
+            const row = document.createElement('tr');
+            row.innerHTML = `
+                <td class="chip-denom">Level ${level.level}</td>
+                <td class="chip-count">$${formatDenom(level.small_blind)} / $${formatDenom(level.big_blind)}</td>
+                <td class="chip-value">${level.stack_big_blinds} BB</td>
+            `;
+            schedule.appendChild(row);
+        });
+        structure.style.display = 'block';
+    } else {
+        structure.style.display = 'none';
+    }
 }
 
 function formatDenom(denom) {
@@ -3,7 +3,9 @@
  * Enables offline functionality and fast loading
  */
 
-const CACHE_NAME = 'poker-calc-v2.17';
+// CACHE_NAME and urlsToCache are regenerated by backend/build_frontend.py
+// (hashed asset URLs); the values here are used when serving unbuilt sources
+const CACHE_NAME = 'poker-calc-v2.18';
 const urlsToCache = [
   '/',
   '/index.html',